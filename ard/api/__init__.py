@@ -1 +1,6 @@
-from .interface import set_up_ard_model, replace_key_value, set_up_system_recursive
+from .interface import (
+    set_up_ard_model,
+    replace_key_value,
+    set_up_system_recursive,
+    validate_windIO,
+)
@@ -3,8 +3,16 @@ import openmdao.api as om
 from openmdao.drivers.doe_driver import DOEGenerator
 from wisdem.optimization_drivers.nsga2_driver import NSGA2Driver
 from openmdao.utils.file_utils import clean_outputs
-from ard.utils.io import load_yaml, replace_key_value
+from ard.utils.io import (
+    load_yaml,
+    replace_key_value,
+    shorten_arrays,
+    check_arrays_finite,
+)
+from ard.utils.caching import hash_configuration
+from ard.api.parallel_fd import use_parallel_finite_difference
 from ard.utils.logging import prepend_tabs_to_stdio
+from ard.utils.aggregation import ConstraintAggregation
 from ard.cost.wisdem_wrap import (
     LandBOSSE_setup_latents,
     ORBIT_setup_latents,
@@ -14,6 +22,64 @@ import windIO
 from ard import ASSET_DIR
 from typing import Union
 
+# windIO validation outcomes, by schema type and a hash of the validated data
+_windIO_validation_cache = {}
+
+
+def validate_windIO(
+    windIO_dict: dict,
+    schema_type: str = "plant/wind_energy_system",
+    full_arrays: bool = False,
+):
+    """
+    Validate a windIO dictionary, re-using the outcome for identical inputs.
+
+    As a deliberate relaxation for long data series, any arrays loaded from
+    data files (e.g. with the `!array` YAML tag) are by default shortened to
+    their first value before the schema validation (see
+    `ard.utils.io.shorten_arrays`): the schema checks the type of the first
+    value, which, an array having a single dtype, is the type of all of its
+    values, but not the values past the first, e.g. NaNs in a time series.
+    With `full_arrays`, the arrays are validated in full and must also be
+    finite. The outcome, a pass or the validation error, is cached on a hash
+    of the validated data, so a batch of cases that share their windIO inputs
+    is only validated once.
+
+    Parameters
+    ----------
+    windIO_dict : dict
+        the windIO dictionary to validate
+    schema_type : str, optional
+        the windIO schema to validate against, by default
+        "plant/wind_energy_system"
+    full_arrays : bool, optional
+        whether to validate every value of the arrays loaded from data files,
+        by default False
+
+    Raises
+    ------
+    jsonschema.exceptions.ValidationError
+        if the windIO dictionary does not meet the schema
+    ValueError
+        if an array loaded from a data file has values that are not finite,
+        with `full_arrays`
+    """
+
+    if full_arrays:
+        check_arrays_finite(windIO_dict)
+    windIO_shortened = shorten_arrays(windIO_dict, N_keep=None if full_arrays else 1)
+    key = (schema_type, hash_configuration(windIO_shortened))
+
+    if key not in _windIO_validation_cache:
+        try:
+            windIO.validate(windIO_shortened, schema_type=schema_type)
+            _windIO_validation_cache[key] = None
+        except Exception as error:
+            _windIO_validation_cache[key] = error
+
+    if _windIO_validation_cache[key] is not None:
+        raise _windIO_validation_cache[key].with_traceback(None)
+
 
 def set_up_ard_model(input_dict: Union[str, dict], root_data_path: str = None):
     """
@@ -101,7 +167,11 @@ def set_up_ard_model(input_dict: Union[str, dict], root_data_path: str = None):
 
     # validate windIO dictionary
     windIO_dict = input_dict["modeling_options"]["windIO_plant"]
-    windIO.validate(windIO_dict, schema_type="plant/wind_energy_system")
+    validate_windIO(
+        windIO_dict,
+        schema_type="plant/wind_energy_system",
+        full_arrays=input_dict["modeling_options"].get("validate_full_arrays", False),
+    )
 
     # set up the openmdao problem
     prob = set_up_system_recursive(
@@ -133,6 +203,10 @@ def set_up_system_recursive(
 
     Returns:
         om.Problem: The OpenMDAO problem with the defined system hierarchy.
+
+    A group with `approx_totals` using "fd" can also set `parallel_fd` (e.g.
+    `{N_workers: 8}`) to evaluate its finite difference points concurrently on
+    a local process pool (see `ard.api.parallel_fd`).
     """
 
     # grab the case name if it's supplied in the system yaml
@@ -190,6 +264,19 @@ def set_up_system_recursive(
         if "approx_totals" in input_dict:
             print(f"\tActivating approximate totals on {system_name}")
             group.approx_totals(**input_dict["approx_totals"])
+            if "parallel_fd" in input_dict:
+                print(f"\tActivating parallel finite differences on {system_name}")
+                use_parallel_finite_difference(
+                    group,
+                    # the worker copies of the group are evaluated serially
+                    {
+                        key: value
+                        for key, value in input_dict.items()
+                        if key != "parallel_fd"
+                    },
+                    system_name,
+                    **input_dict["parallel_fd"],
+                )
 
     else:
         subsystem_data = input_dict
@@ -286,6 +373,10 @@ def set_up_system_recursive(
                 for constraint_name, constraint_data in analysis_options[
                     "constraints"
                 ].items():
+                    if "aggregate" in constraint_data:
+                        constraint_name, constraint_data = add_constraint_aggregation(
+                            prob.model, constraint_name, constraint_data
+                        )
                     prob.model.add_constraint(constraint_name, **constraint_data)
 
             # set objective
@@ -323,3 +414,56 @@ def set_up_system_recursive(
         prob.setup()
 
     return prob
+
+
+def add_constraint_aggregation(
+    model: om.Group,
+    constraint_name: str,
+    constraint_data: dict,
+):
+    """
+    Add a component to aggregate a vector constraint into a single scalar.
+
+    The `aggregate` entry of a constraint in the analysis options specifies the
+    aggregation `method` ("KS" or "induced_exponential") and the aggregation
+    parameter `rho`. The aggregate is of the minimum of the constraint vector
+    for lower-bounded constraints and of the maximum for upper-bounded ones.
+
+    Args:
+        model (om.Group): the top-level model to add the aggregation component to.
+        constraint_name (str): the name of the vector constraint to aggregate.
+        constraint_data (dict): the constraint options from the analysis options,
+            including the `aggregate` entry.
+
+    Returns:
+        str: the name of the aggregated constraint to add to the model.
+        dict: the constraint options for the aggregated constraint.
+
+    Raises:
+        ValueError: if the constraint is not bounded on exactly one side.
+    """
+
+    constraint_data = dict(constraint_data)
+    aggregate_options = dict(constraint_data.pop("aggregate") or {})
+
+    if "equals" in constraint_data or (
+        ("lower" in constraint_data) == ("upper" in constraint_data)
+    ):
+        raise ValueError(
+            f"Aggregated constraint '{constraint_name}' must have exactly one "
+            "of a 'lower' or 'upper' bound."
+        )
+
+    name_aggregation = f"aggregate_{constraint_name.replace('.', '_')}"
+    print(f"\tAggregating constraint {constraint_name} with {name_aggregation}")
+    model.add_subsystem(
+        name_aggregation,
+        ConstraintAggregation(
+            aggregate_min="lower" in constraint_data,
+            units=constraint_data.get("units"),
+            **aggregate_options,
+        ),
+    )
+    model.connect(constraint_name, f"{name_aggregation}.constraint_values")
+
+    return f"{name_aggregation}.constraint_aggregate", constraint_data
@@ -0,0 +1,274 @@
+import os
+import re
+import tempfile
+import warnings
+
+import numpy as np
+import openmdao
+import openmdao.api as om
+from openmdao.approximation_schemes.finite_difference import FiniteDifference
+
+import ard.utils.caching as ard_caching
+import ard.utils.parallel as ard_parallel
+
+# the approximation scheme hooks into private OpenMDAO internals, so it is
+# only enabled for the (minimum, maximum exclusive) versions it is tested on
+_openmdao_versions_supported = ((3, 45), (3, 46))
+_openmdao_version = tuple(int(v) for v in re.findall(r"\d+", openmdao.__version__)[:2])
+openmdao_supported = (
+    _openmdao_versions_supported[0]
+    <= _openmdao_version
+    < _openmdao_versions_supported[1]
+)
+if not openmdao_supported:
+    warnings.warn(
+        f"OpenMDAO {openmdao.__version__} is outside of the versions supported "
+        "by parallel finite differences "
+        f"({'.'.join(map(str, _openmdao_versions_supported[0]))} up to "
+        f"{'.'.join(map(str, _openmdao_versions_supported[1]))}), so they are "
+        "disabled."
+    )
+
+# the system specs sent to each worker at start-up, by spec hash
+_worker_specs = {}
+# warm copies of the approximated groups held by each worker, by spec hash
+_worker_groups = {}
+
+
+def get_vector_signature(system) -> tuple:
+    """
+    Get a signature of the layout of the input and output vectors of a system.
+
+    Args:
+        system (om.System): a set up OpenMDAO system
+
+    Returns:
+        tuple: the relative variable names and the sizes of the vectors
+    """
+    return (
+        tuple(system._inputs.keys()),
+        tuple(system._outputs.keys()),
+        system._inputs.asarray().size,
+        system._outputs.asarray().size,
+    )
+
+
+def _initialize_worker(spec_key, spec):
+    """keep the system spec in a worker, sent once as the worker starts"""
+    _worker_specs[spec_key] = spec
+
+
+def _get_worker_group(spec_key, system_name):
+    """get (or build and set up) the worker copy of an approximated group"""
+
+    if spec_key not in _worker_groups:
+        spec = _worker_specs[spec_key]
+
+        # lazy import, `ard.api.interface` uses this module
+        from ard.api.interface import set_up_system_recursive
+
+        # run each worker copy in its own scratch directory so it can't clean
+        # or overwrite the outputs of the parent problem
+        prob = om.Problem(
+            name=f"parallel_fd_{system_name}_{os.getpid()}",
+            work_dir=tempfile.mkdtemp(prefix="ard_parallel_fd_"),
+            reports=False,
+        )
+        set_up_system_recursive(
+            spec,
+            system_name=system_name,
+            parent_group=prob.model,
+            modeling_options={},
+            _depth=1,
+        )
+        prob.setup()
+        prob.final_setup()
+        _worker_groups[spec_key] = prob.model._get_subsystem(system_name)
+
+    return _worker_groups[spec_key]
+
+
+def run_perturbed_points(
+    spec_key,
+    system_name,
+    signature,
+    inputs_base,
+    outputs_base,
+    perturbations,
+):
+    """
+    Run a batch of finite difference points on a worker copy of a group.
+
+    The group is built on the first call in each worker from the Ard system
+    spec the worker was started with (see `_initialize_worker`), and kept
+    warm afterwards (e.g. with its FLORIS models set up), so repeated
+    gradients only pay for the perturbed evaluations.
+
+    Args:
+        spec_key (str): a hash of the Ard system spec of the group
+        system_name (str): the name of the group
+        signature (tuple): the vector signature of the group in the parent
+            problem, see `get_vector_signature`
+        inputs_base (np.ndarray): the unperturbed input vector of the group
+        outputs_base (np.ndarray): the unperturbed output vector of the group
+        perturbations (list): for each point, a list of the
+            (vector kind, indices, delta) perturbations to apply
+
+    Returns:
+        list: the output vector of the group at each point
+    """
+
+    group = _get_worker_group(spec_key, system_name)
+    if get_vector_signature(group) != signature:
+        raise RuntimeError(
+            f"The worker copy of {system_name} does not match the vector layout "
+            "of the parent problem, so it can't be used for finite differences."
+        )
+
+    results = []
+    group._set_finite_difference_mode(True)
+    try:
+        for perturbation in perturbations:
+            group._inputs.set_val(inputs_base)
+            group._outputs.set_val(outputs_base)
+            for kind, idxs, delta in perturbation:
+                vector = group._inputs if kind == "input" else group._outputs
+                vector.iadd(delta, idxs)
+            group.run_solve_nonlinear()
+            results.append(group._outputs.asarray(copy=True))
+    finally:
+        group._set_finite_difference_mode(False)
+
+    return results
+
+
+class ParallelFiniteDifference(FiniteDifference):
+    """
+    Finite differences on a group with the points evaluated on a process pool.
+
+    The approximation runs in two passes over the OpenMDAO column iteration:
+    the first records the perturbation of every finite difference point
+    without running the group, the points are then evaluated concurrently on a
+    persistent local process pool (each worker holding a warm copy of the
+    group, rebuilt from its Ard system spec, which is sent to each worker only
+    once as the pool starts), and the second pass replays the gathered
+    outputs in order. No MPI is required, and the resulting Jacobian is the
+    same as the serial one.
+
+    The scheme relies on private OpenMDAO internals, so it is only available
+    for the OpenMDAO versions it is tested on (see `openmdao_supported`).
+
+    Component partials (and complex step) are not batched and run serially.
+    """
+
+    def __init__(self, spec, system_name, N_workers=None, N_chunks=None):
+        """
+        Args:
+            spec (dict): the Ard system spec of the approximated group
+            system_name (str): the name of the approximated group
+            N_workers (int, optional): the number of worker processes.
+                Defaults to None, which uses the number of CPUs available.
+            N_chunks (int, optional): the number of batches the points are
+                split into. Defaults to None, which uses `N_workers`.
+        """
+        super().__init__()
+        self._spec = spec
+        self._spec_key = ard_caching.hash_configuration(spec)
+        self._system_name = system_name
+        self._N_workers = N_workers or os.cpu_count() or 1
+        self._N_chunks = N_chunks or self._N_workers
+        self._mode = None
+        self._perturbations = None
+        self._results_points = None
+
+    def _compute_approx_col_iter(self, system, under_cs):
+        if under_cs or not isinstance(system, om.Group):
+            yield from super()._compute_approx_col_iter(system, under_cs)
+            return
+
+        # record the perturbations of all the points, without running them
+        self._mode = "record"
+        self._perturbations = []
+        try:
+            for _ in super()._compute_approx_col_iter(system, under_cs):
+                pass
+        finally:
+            self._mode = None
+
+        # evaluate the points concurrently, on workers started with the spec
+        pool = ard_parallel.get_process_pool(
+            self._N_workers,
+            name=f"parallel_fd_{self._spec_key}",
+            initializer=_initialize_worker,
+            initargs=(self._spec_key, self._spec),
+        )
+        signature = get_vector_signature(system)
+        idx_chunks = ard_parallel.split_indices(
+            len(self._perturbations), self._N_chunks
+        )
+        futures = [
+            pool.submit(
+                run_perturbed_points,
+                self._spec_key,
+                self._system_name,
+                signature,
+                self._starting_ins,
+                self._starting_outs,
+                [self._perturbations[idx] for idx in idx_chunk],
+            )
+            for idx_chunk in idx_chunks
+        ]
+        self._results_points = iter(
+            result for future in futures for result in future.result()
+        )
+
+        # replay the column iteration with the gathered outputs
+        self._mode = "replay"
+        try:
+            yield from super()._compute_approx_col_iter(system, under_cs)
+        finally:
+            self._mode = None
+            self._perturbations = None
+            self._results_points = None
+
+    def _run_sub_point(self, system, idx_info, delta, total):
+        if self._mode == "record":
+            perturbation = []
+            for vec, idxs in idx_info:
+                if vec is not None and idxs is not None:
+                    kind = "input" if vec is system._inputs else "output"
+                    perturbation.append((kind, np.array(idxs), np.array(delta)))
+            self._perturbations.append(perturbation)
+            self._results_tmp[:] = 0.0  # placeholder, discarded
+            return self._results_tmp
+        elif self._mode == "replay":
+            self._results_tmp[:] = next(self._results_points)
+            return self._results_tmp
+        else:
+            return super()._run_sub_point(system, idx_info, delta, total)
+
+
+def use_parallel_finite_difference(group, spec, system_name, **kwargs):
+    """
+    Evaluate the approximated totals of a group with parallel finite differences.
+
+    Must be called after `approx_totals(method="fd")` on the group.
+
+    Args:
+        group (om.Group): the group with approximated totals
+        spec (dict): the Ard system spec of the group
+        system_name (str): the name of the group
+        **kwargs: `N_workers` and `N_chunks`, see `ParallelFiniteDifference`
+    """
+
+    if not openmdao_supported:
+        raise RuntimeError(
+            f"Parallel finite differences on {system_name} are not supported "
+            f"with OpenMDAO {openmdao.__version__}."
+        )
+    if "fd" not in group._approx_schemes:
+        raise ValueError(
+            f"Parallel finite differences on {system_name} need "
+            "`approx_totals` with method 'fd'."
+        )
+    group._approx_schemes["fd"] = ParallelFiniteDifference(spec, system_name, **kwargs)
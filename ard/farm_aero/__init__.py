@@ -1,3 +1,5 @@
 from . import floris
+from . import gaussian
 from . import placeholder
+from . import scenarios
 from . import templates
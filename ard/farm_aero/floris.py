@@ -1,14 +1,28 @@
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import copy
+import os
 
 import numpy as np
+import scipy.sparse.csgraph
+import yaml
 
 import floris
 import floris.turbine_library.turbine_utilities
 
+import ard.utils.caching as ard_caching
 import ard.utils.logging as ard_logging
+import ard.utils.parallel as ard_parallel
 import ard.farm_aero.templates as templates
 
+# warm FLORIS models held by each parallel worker, by configuration hash
+_worker_models = {}
+_N_worker_models_max = 4
+
+# background thread for writing FLORIS reproducibility snapshots, in order
+_snapshot_writer = ThreadPoolExecutor(max_workers=1)
+_snapshot_policies = ["always", "every", "best", "final", "never"]
+
 
 def create_FLORIS_turbine_from_windIO(
     windIOplant: dict,
@@ -166,6 +180,406 @@ def create_FLORIS_turbine_from_windIO(
     return copy.deepcopy(turbine_FLORIS)
 
 
+def write_FLORIS_configuration(configuration, path):
+    """
+    write a FLORIS configuration dictionary to an input-ready YAML file
+
+    Mirrors `floris.core.Core.to_file`, for configurations that have been
+    taken from a FLORIS model ahead of time, e.g. to be written on a
+    background thread.
+
+    Parameters
+    ----------
+    configuration : dict
+        a FLORIS configuration dictionary, from `FlorisModel.core.as_dict`
+    path : str or pathlib.Path
+        the full path and filename of the YAML file to write
+    """
+
+    with open(path, "w+") as f_yaml:
+        yaml.dump(configuration, f_yaml, sort_keys=False, default_flow_style=False)
+
+
+def write_FLORIS_snapshot(core, layout_x, layout_y, path):
+    """
+    write the inputs of a FLORIS core at a given layout to an input-ready YAML file
+
+    The configuration is only assembled here, so that a snapshot can be taken
+    on the evaluation path by holding a reference to the core: `FlorisModel.set`
+    replaces the core rather than changing its inputs in place.
+
+    Parameters
+    ----------
+    core : floris.core.Core
+        the FLORIS core holding the inputs to write, other than the layout
+    layout_x : list
+        the x-coordinates of the turbines to write (in m)
+    layout_y : list
+        the y-coordinates of the turbines to write (in m)
+    path : str or pathlib.Path
+        the full path and filename of the YAML file to write
+    """
+
+    configuration = core.as_dict()
+    configuration["farm"]["layout_x"] = layout_x
+    configuration["farm"]["layout_y"] = layout_y
+    write_FLORIS_configuration(configuration, path)
+
+
+def get_thrust_turbines_FLORIS(fmodel):
+    """
+    get the turbine thrusts of a FLORIS model that has been run
+
+    Parameters
+    ----------
+    fmodel : floris.FlorisModel
+        a FLORIS model that has been run
+
+    Returns
+    -------
+    np.ndarray
+        the turbine thrusts at each condition (`n_findex`, `N_turbines`)
+    """
+
+    # FLORIS computes the thrust precursors, compute and return thrust
+    # use pure FLORIS to get these values for consistency
+
+    # prepare to unpack thrust data that is not pre-computed in FLORIS
+    CT_turbines = fmodel.get_turbine_thrust_coefficients()
+    V_turbines = fmodel.turbine_average_velocities
+    rho_floris = fmodel.core.flow_field.air_density
+    A_floris = np.pi * fmodel.core.farm.rotor_diameters**2 / 4
+
+    # unpacking procedure
+    # from FLORIS's floris_model.py:564 at a6fc5d35aa32614edc450dc399c42af60a816887
+    return CT_turbines * (0.5 * rho_floris * A_floris * V_turbines**2)
+
+
+def expand_turbine_values(
+    directions,
+    speeds,
+    values,
+    values_free,
+    directions_target,
+    speeds_target,
+    values_free_target,
+):
+    """
+    expand per-turbine values on a set of wind conditions onto other conditions
+
+    In each direction, the ratio of the turbine values (e.g. powers) to their
+    free-stream value, i.e. the wake and yaw losses, is interpolated linearly
+    in wind speed between the conditions, and applied to the free-stream value
+    at the target conditions; a target direction without any conditions takes
+    the ratios of the nearest direction. E.g. to expand the outputs of a
+    compressed wind rose back onto the full wind rose.
+
+    Parameters
+    ----------
+    directions : np.ndarray
+        the wind directions of the conditions, in degrees (`N_conditions`,)
+    speeds : np.ndarray
+        the wind speeds of the conditions (`N_conditions`,)
+    values : np.ndarray
+        the turbine values at each condition (`N_conditions`, `N_turbines`)
+    values_free : np.ndarray
+        the free-stream value of a turbine at each condition (`N_conditions`,);
+        conditions with no free-stream value don't give a ratio
+    directions_target : np.ndarray
+        the wind directions of the target conditions, in degrees
+        (`N_conditions_target`,)
+    speeds_target : np.ndarray
+        the wind speeds of the target conditions (`N_conditions_target`,)
+    values_free_target : np.ndarray
+        the free-stream value of a turbine at each target condition
+        (`N_conditions_target`,)
+
+    Returns
+    -------
+    np.ndarray
+        the turbine values at each target condition
+        (`N_conditions_target`, `N_turbines`)
+    """
+
+    directions_target = np.asarray(directions_target)
+    speeds_target = np.asarray(speeds_target)
+    values_target = np.ones((len(directions_target), np.shape(values)[1]))
+
+    mask_valid = np.asarray(values_free) > 0.0
+    if np.any(mask_valid):
+        directions_valid = np.asarray(directions)[mask_valid]
+        speeds_valid = np.asarray(speeds)[mask_valid]
+        ratios_valid = (
+            np.asarray(values)[mask_valid]
+            / np.asarray(values_free)[mask_valid, np.newaxis]
+        )
+        for direction in np.unique(directions_target):
+            distance = np.abs((directions_valid - direction + 180.0) % 360.0 - 180.0)
+            mask_source = np.isclose(
+                directions_valid, directions_valid[np.argmin(distance)]
+            )
+            idx_sorted = np.argsort(speeds_valid[mask_source])
+            mask_target = directions_target == direction
+            for idx_turbine in range(values_target.shape[1]):
+                values_target[mask_target, idx_turbine] = np.interp(
+                    speeds_target[mask_target],
+                    speeds_valid[mask_source][idx_sorted],
+                    ratios_valid[mask_source, idx_turbine][idx_sorted],
+                )
+
+    return values_target * np.asarray(values_free_target)[:, np.newaxis]
+
+
+def run_FLORIS_conditions(
+    configuration_key,
+    configuration,
+    operation_model,
+    layout_x,
+    layout_y,
+    wind_directions,
+    wind_speeds,
+    turbulence_intensities,
+    yaw_angles,
+    reference_wind_height,
+):
+    """
+    run a FLORIS configuration on a set of wind conditions, e.g. in a worker
+
+    The FLORIS model built from `configuration` is kept warm in the calling
+    process, keyed on `configuration_key`, so that repeated calls only update
+    the layout, the wind conditions, and the yaw angles.
+
+    Parameters
+    ----------
+    configuration_key : str
+        a hash of `configuration`
+    configuration : dict
+        a FLORIS configuration dictionary, e.g. from `FlorisModel.core.as_dict`
+    operation_model : str
+        the FLORIS turbine operation model
+    layout_x : np.ndarray
+        the x-dimension locations of the turbines
+    layout_y : np.ndarray
+        the y-dimension locations of the turbines
+    wind_directions : np.ndarray
+        the wind directions of the conditions, in degrees
+    wind_speeds : np.ndarray
+        the wind speeds of the conditions
+    turbulence_intensities : np.ndarray
+        the turbulence intensities of the conditions
+    yaw_angles : np.ndarray
+        the yaw angles of the turbines at each condition
+    reference_wind_height : float
+        the reference height of the wind conditions
+
+    Returns
+    -------
+    np.ndarray
+        the turbine powers at each condition (`n_conditions`, `N_turbines`)
+    np.ndarray
+        the turbine thrusts at each condition (`n_conditions`, `N_turbines`)
+    """
+
+    fmodel = _worker_models.get(configuration_key)
+    if fmodel is None:
+        fmodel = floris.FlorisModel(configuration)
+        if len(_worker_models) >= _N_worker_models_max:
+            _worker_models.pop(next(iter(_worker_models)))
+        _worker_models[configuration_key] = fmodel
+
+    fmodel.set(
+        layout_x=layout_x,
+        layout_y=layout_y,
+        wind_data=floris.TimeSeries(
+            wind_directions=wind_directions,
+            wind_speeds=wind_speeds,
+            turbulence_intensities=turbulence_intensities,
+        ),
+        yaw_angles=yaw_angles,
+        reference_wind_height=reference_wind_height,
+    )
+    fmodel.set_operation_model(operation_model)
+    fmodel.run()
+
+    return fmodel.get_turbine_powers(), get_thrust_turbines_FLORIS(fmodel)
+
+
+def get_wake_adjacency(
+    x_turbines, y_turbines, wind_direction, cone_width, cone_expansion
+):
+    """
+    get which turbines are inside the wake cone of each turbine for a wind direction
+
+    Parameters
+    ----------
+    x_turbines : np.ndarray
+        the x-dimension locations of the turbines, in rotor diameters
+    y_turbines : np.ndarray
+        the y-dimension locations of the turbines, in rotor diameters
+    wind_direction : float
+        the wind direction, in degrees
+    cone_width : float
+        the half-width of the wake cone at the rotor, in rotor diameters
+    cone_expansion : float
+        the growth of the half-width of the wake cone per rotor diameter
+        downstream
+
+    Returns
+    -------
+    np.ndarray
+        a boolean matrix, True where turbine `j` is in the wake of turbine `i`
+        (`N_turbines`, `N_turbines`)
+    """
+
+    # the flow direction, as in FLORIS wind from 270 deg flows in +x
+    angle_flow = np.radians(270.0 - wind_direction)
+    dx = x_turbines[None, :] - x_turbines[:, None]
+    dy = y_turbines[None, :] - y_turbines[:, None]
+    x_stream = dx * np.cos(angle_flow) + dy * np.sin(angle_flow)
+    y_stream = -dx * np.sin(angle_flow) + dy * np.cos(angle_flow)
+    return (x_stream > 0.0) & (
+        np.abs(y_stream) < cone_width + cone_expansion * x_stream
+    )
+
+
+def get_wake_affected_turbines(
+    x_before,
+    y_before,
+    x_after,
+    y_after,
+    wind_direction,
+    rotor_diameter,
+    cone_width=2.0,
+    cone_expansion=0.1,
+):
+    """
+    find the turbines whose power changes when some turbines move, for a wind direction
+
+    A turbine is taken to wake another if the other is downstream of it and
+    inside its wake cone, with a half-width of `cone_width` rotor diameters at
+    the rotor growing by `cone_expansion` diameters per diameter downstream.
+    The affected turbines are the moved turbines, the turbines that were in
+    their wakes before the move, and everything (transitively) downstream of
+    these after the move. The turbines needed to re-evaluate them are the
+    affected turbines and everything (transitively) upstream of them; every
+    other turbine is outside all of their wake cones.
+
+    Parameters
+    ----------
+    x_before : np.ndarray
+        the x-dimension locations of the turbines before the move
+    y_before : np.ndarray
+        the y-dimension locations of the turbines before the move
+    x_after : np.ndarray
+        the x-dimension locations of the turbines after the move
+    y_after : np.ndarray
+        the y-dimension locations of the turbines after the move
+    wind_direction : float
+        the wind direction, in degrees
+    rotor_diameter : float
+        the rotor diameter of the turbines
+    cone_width : float, optional
+        the half-width of the wake cone at the rotor, in rotor diameters, by
+        default 2.0
+    cone_expansion : float, optional
+        the growth of the half-width of the wake cone per rotor diameter
+        downstream, by default 0.1
+
+    Returns
+    -------
+    np.ndarray
+        the sorted indices of the affected turbines
+    np.ndarray
+        the sorted indices of the turbines needed to re-evaluate them
+    """
+
+    mask_moved = (x_before != x_after) | (y_before != y_after)
+    if not np.any(mask_moved):
+        return np.array([], dtype=int), np.array([], dtype=int)
+
+    wake_before = get_wake_adjacency(
+        x_before / rotor_diameter,
+        y_before / rotor_diameter,
+        wind_direction,
+        cone_width,
+        cone_expansion,
+    )
+    wake_after = get_wake_adjacency(
+        x_after / rotor_diameter,
+        y_after / rotor_diameter,
+        wind_direction,
+        cone_width,
+        cone_expansion,
+    )
+
+    def close(mask, adjacency):
+        """extend a set of turbines along the wake adjacency until it stops growing"""
+        while True:
+            mask_next = mask | np.any(adjacency[mask], axis=0)
+            if np.array_equal(mask_next, mask):
+                return mask
+            mask = mask_next
+
+    mask_affected = close(
+        mask_moved | np.any(wake_before[mask_moved], axis=0), wake_after
+    )
+    mask_needed = close(mask_affected, wake_after.T)
+
+    return np.flatnonzero(mask_affected), np.flatnonzero(mask_needed)
+
+
+def get_wake_clusters(
+    x_turbines,
+    y_turbines,
+    wind_direction,
+    rotor_diameter,
+    cone_width=2.0,
+    cone_expansion=0.1,
+):
+    """
+    split a farm into clusters of turbines that never wake each other, for a wind direction
+
+    The turbines are connected by the wake cones of `get_wake_adjacency`, and
+    the clusters are the (weakly) connected components of the resulting
+    graph, so that no turbine is in the wake cone of a turbine in another
+    cluster and each cluster can be simulated separately.
+
+    Parameters
+    ----------
+    x_turbines : np.ndarray
+        the x-dimension locations of the turbines
+    y_turbines : np.ndarray
+        the y-dimension locations of the turbines
+    wind_direction : float
+        the wind direction, in degrees
+    rotor_diameter : float
+        the rotor diameter of the turbines
+    cone_width : float, optional
+        the half-width of the wake cone at the rotor, in rotor diameters, by
+        default 2.0
+    cone_expansion : float, optional
+        the growth of the half-width of the wake cone per rotor diameter
+        downstream, by default 0.1
+
+    Returns
+    -------
+    list
+        the sorted turbine indices of each cluster
+    """
+
+    adjacency = get_wake_adjacency(
+        np.asarray(x_turbines) / rotor_diameter,
+        np.asarray(y_turbines) / rotor_diameter,
+        wind_direction,
+        cone_width,
+        cone_expansion,
+    )
+    N_clusters, labels = scipy.sparse.csgraph.connected_components(
+        adjacency, directed=True, connection="weak"
+    )
+    return [np.flatnonzero(labels == label) for label in range(N_clusters)]
+
+
 class FLORISFarmComponent:
     """
     Secondary-inherit component for managing FLORIS for farm simulations.
@@ -181,6 +595,49 @@ class FLORISFarmComponent:
     OpenMDAO components, and will not work unless the calling object is a
     specialized class that _also_ specializes `openmdao.api.Component`.
 
+    Results can be memoized in a bounded least-recently-used cache, keyed on a
+    hash of the turbine layout, yaw, and wind data, by setting `cache_size` in
+    the `floris` block of the modeling options; setting `cache_path` as well
+    persists the cache to disk between runs, written at cleanup (or at a
+    re-setup), and after every `cache_flush_interval` new results if set.
+
+    The wind conditions can be evaluated in parallel by setting `parallel` in
+    the `floris` block of the modeling options, e.g. `{backend: processes,
+    N_workers: 16}`. The conditions are split into `N_chunks` (by default
+    `N_workers`) contiguous chunks that are run on a persistent local process
+    pool with warm FLORIS models, or, with `backend: mpi` under MPI, split
+    across the ranks of the component communicator; the partial turbine
+    powers and thrusts are gathered and reduced into the outputs. Requesting
+    the MPI backend without MPI available is an error at setup, and with a
+    single rank it warns and uses the process pool.
+
+    With `incremental` in the `floris` block of the modeling options (`true`,
+    or a dictionary setting `cone_width` and `cone_expansion`, by default 2.0
+    and 0.1, see `get_wake_affected_turbines`), the turbine powers and
+    thrusts of the previous evaluation are kept, and when only some turbines
+    move (at the same yaw) only the turbines affected by the move are re-run,
+    for each wind direction on a reduced farm of the affected turbines and
+    the turbines upstream of them. The incremental results are approximate:
+    wake effects outside the cone are ignored, and the values of the turbines
+    outside it are carried forward from earlier evaluations, so they can be
+    stale and depend on the order of the evaluations.
+
+    With `decomposition` in the `floris` block of the modeling options
+    (`true`, or a dictionary setting `cone_width` and `cone_expansion`), the
+    farm is split for each wind direction into clusters of turbines that do
+    not wake each other (see `get_wake_clusters`), which are simulated
+    separately, and in parallel if configured, and then re-assembled; the
+    conditions of the directions that share a cluster are run together.
+
+    The FLORIS inputs are snapshotted to `batch.yaml` for reproducibility
+    according to `snapshot_policy` in the `floris` block of the modeling
+    options: "always" (the default) after every evaluation, "every" after
+    every `snapshot_interval` evaluations, "best" when the AEP improves on
+    the best so far, "final" for the last evaluation only (written at
+    `cleanup`), or "never"; evaluations under finite differences or complex
+    steps are not snapshotted. The YAML files are assembled and written on a
+    background thread, off the evaluation path.
+
     Options
     -------
     case_title : str
@@ -217,6 +674,118 @@ class FLORISFarmComponent:
             self, "inputs", get_iter=True, clean=True
         )
 
+        # set up the parallel evaluation of the wind conditions
+        options_floris = self.modeling_options.get("floris", {})
+        options_parallel = options_floris.get("parallel")
+        if options_parallel:
+            if options_parallel.get("backend", "processes") not in [
+                "processes",
+                "mpi",
+            ]:
+                raise ValueError(
+                    f"Unknown parallel backend: {options_parallel['backend']}. "
+                    "Must be one of ['processes', 'mpi']."
+                )
+            N_workers = options_parallel.get("N_workers", os.cpu_count() or 1)
+            self.parallel_options = {
+                "backend": options_parallel.get("backend", "processes"),
+                "N_workers": N_workers,
+                "N_chunks": options_parallel.get("N_chunks", N_workers),
+            }
+            # check that MPI can actually be used before any evaluation
+            if self.parallel_options["backend"] == "mpi":
+                ard_parallel.get_MPI_communicator(
+                    getattr(self, "comm", None), required=True
+                )
+        else:
+            self.parallel_options = None
+        self._results_precomputed = None
+
+        # set up the incremental re-evaluation of moved turbines
+        options_incremental = options_floris.get("incremental")
+        if options_incremental:
+            if options_incremental is True:
+                options_incremental = {}
+            self.incremental_options = {
+                "cone_width": options_incremental.get("cone_width", 2.0),
+                "cone_expansion": options_incremental.get("cone_expansion", 0.1),
+            }
+        else:
+            self.incremental_options = None
+        self._incremental_state = None
+        self.fraction_incremental = None
+
+        # set up the decomposition of the farm into independent clusters
+        options_decomposition = options_floris.get("decomposition")
+        if options_decomposition:
+            if options_decomposition is True:
+                options_decomposition = {}
+            self.decomposition_options = {
+                "cone_width": options_decomposition.get("cone_width", 2.0),
+                "cone_expansion": options_decomposition.get("cone_expansion", 0.1),
+            }
+        else:
+            self.decomposition_options = None
+        self.N_runs_decomposition = None
+
+        # set up the reproducibility snapshots
+        self.snapshot_policy = options_floris.get("snapshot_policy", "always")
+        if self.snapshot_policy not in _snapshot_policies:
+            raise ValueError(
+                f"Unknown snapshot policy: {self.snapshot_policy}. "
+                f"Must be one of {_snapshot_policies}."
+            )
+        self.snapshot_interval = options_floris.get("snapshot_interval", 1)
+        self._N_snapshot_evaluations = 0
+        self._AEP_snapshot_best = -np.inf
+        self._snapshot_final = None
+        self._snapshot_futures = []
+
+        # set up the result cache, persisting the results of a previous setup
+        if getattr(self, "result_cache", None) is not None:
+            self.result_cache.flush()
+        self.result_cache = ard_caching.LRUResultCache(
+            options_floris.get("cache_size", 0),
+            path=options_floris.get("cache_path"),
+            flush_interval=options_floris.get("cache_flush_interval"),
+        )
+        # the wind data and the FLORIS configuration are fixed after setup
+        self._cache_context = ard_caching.hash_arrays(
+            self.directions_wind,
+            self.speeds_wind,
+            self.TIs_wind,
+            getattr(self, "pmf_wind", []),
+            context=ard_caching.hash_configuration(
+                {
+                    "class": type(self).__name__,
+                    "turbine": self.windIO["wind_farm"]["turbine"],
+                    "wind_resource": {
+                        key: value
+                        for key, value in self.windIO["site"]["energy_resource"][
+                            "wind_resource"
+                        ].items()
+                        if key in ["shear", "reference_height"]
+                    },
+                    "floris": {
+                        key: value
+                        for key, value in options_floris.items()
+                        if key
+                        not in [
+                            "cache_size",
+                            "cache_path",
+                            "cache_flush_interval",
+                            "parallel",
+                            "snapshot_policy",
+                            "snapshot_interval",
+                        ]
+                    },
+                    "return_turbine_output": self.modeling_options.get("aero", {}).get(
+                        "return_turbine_output"
+                    ),
+                }
+            ),
+        )
+
     def compute(self, inputs):
         """
         Compute-time FLORIS management.
@@ -227,37 +796,398 @@ class FLORISFarmComponent:
 
         raise NotImplementedError("compute must be specialized,")
 
+    def get_cache_key(self, inputs):
+        """Get the result cache key for the layout and yaw in `inputs`."""
+        return ard_caching.hash_arrays(
+            inputs["x_turbines"],
+            inputs["y_turbines"],
+            inputs["yaw_turbines"],
+            context=self._cache_context,
+        )
+
+    def load_cached_outputs(self, inputs, outputs) -> bool:
+        """
+        Load the outputs for `inputs` from the result cache, if possible.
+
+        Returns
+        -------
+        bool
+            True if the outputs were found in the cache and loaded, else False
+        """
+
+        if not self.result_cache.enabled:
+            return False
+
+        cached_outputs = self.result_cache.get(
+            FLORISFarmComponent.get_cache_key(self, inputs)
+        )
+        if cached_outputs is None:
+            return False
+
+        for name, value in cached_outputs.items():
+            outputs[name] = value
+        return True
+
+    def store_cached_outputs(self, inputs, outputs):
+        """Store the outputs for `inputs` in the result cache."""
+
+        if not self.result_cache.enabled:
+            return
+
+        self.result_cache.put(
+            FLORISFarmComponent.get_cache_key(self, inputs),
+            {name: outputs[name] for name in outputs.keys()},
+        )
+
     def setup_partials(self):
         """Derivative setup for OM component."""
         # for FLORIS, no derivatives. use FD because FLORIS is cheap
         self.declare_partials("*", "*", method="fd")
 
-    def get_AEP_farm(self):
-        """Get the AEP of a FLORIS farm."""
-        return self.fmodel.get_farm_AEP()
+    def run_FLORIS(self):
+        """
+        Run the FLORIS model, in parallel over the wind conditions if configured.
+
+        The FLORIS model must have been `set` for the evaluation; in parallel,
+        the gathered results are held for the `get_*` methods (as are results
+        precomputed by other means, e.g. in `FLORISGridAEP`), instead of in
+        the FLORIS model itself.
+        """
+
+        self._results_precomputed = None
+
+        N_findex = self.fmodel.core.flow_field.n_findex
+        if self.decomposition_options is not None:
+            FLORISFarmComponent.run_FLORIS_decomposed(self)
+            return
+        if self.parallel_options is None or N_findex < 2:
+            self.fmodel.run()
+            return
+
+        configuration_key, configuration = FLORISFarmComponent.get_worker_configuration(
+            self
+        )
+
+        flow_field = self.fmodel.core.flow_field
+        farm = self.fmodel.core.farm
+
+        def arguments_chunk(idx_chunk):
+            return (
+                configuration_key,
+                configuration,
+                self.fmodel.get_operation_model(),
+                farm.layout_x,
+                farm.layout_y,
+                flow_field.wind_directions[idx_chunk],
+                flow_field.wind_speeds[idx_chunk],
+                flow_field.turbulence_intensities[idx_chunk],
+                farm.yaw_angles[idx_chunk],
+                flow_field.reference_wind_height,
+            )
+
+        comm = ard_parallel.get_MPI_communicator(getattr(self, "comm", None))
+        if self.parallel_options["backend"] == "mpi" and comm is not None:
+            # each rank runs its own chunk, then all the chunks are gathered
+            idx_chunks = ard_parallel.split_indices(N_findex, comm.size)
+            result_rank = None
+            if comm.rank < len(idx_chunks):
+                result_rank = run_FLORIS_conditions(
+                    *arguments_chunk(idx_chunks[comm.rank])
+                )
+            results = [
+                result for result in comm.allgather(result_rank) if result is not None
+            ]
+        else:
+            # the chunks are run on a persistent local process pool
+            pool = ard_parallel.get_process_pool(self.parallel_options["N_workers"])
+            futures = [
+                pool.submit(run_FLORIS_conditions, *arguments_chunk(idx_chunk))
+                for idx_chunk in ard_parallel.split_indices(
+                    N_findex, self.parallel_options["N_chunks"]
+                )
+            ]
+            results = [future.result() for future in futures]
+
+        self._results_precomputed = {
+            "power_turbines": np.concatenate([result[0] for result in results]),
+            "thrust_turbines": np.concatenate([result[1] for result in results]),
+        }
+
+    def get_worker_configuration(self):
+        """
+        Get the FLORIS configuration that workers build their models from.
+
+        The layout and wind conditions, which are set for each run, are
+        stripped from the configuration.
+
+        Returns
+        -------
+        str
+            a hash of the configuration
+        dict
+            the FLORIS configuration dictionary
+        """
+
+        configuration = self.fmodel.core.as_dict()
+        configuration["farm"].update(layout_x=[0.0], layout_y=[0.0])
+        configuration["flow_field"].update(
+            wind_directions=[270.0],
+            wind_speeds=[8.0],
+            turbulence_intensities=[0.06],
+        )
+        return ard_caching.hash_configuration(configuration), configuration
+
+    def run_FLORIS_decomposed(self):
+        """
+        Run the FLORIS model as independent clusters of turbines per direction.
+
+        The FLORIS model must have been `set` for the evaluation. For each wind
+        direction, the farm is split with `get_wake_clusters`; each distinct
+        cluster is run once on the conditions of all of the directions it
+        appears in, on warm FLORIS models (in parallel if configured), and the
+        results are assembled and held for the `get_*` methods. The number of
+        cluster runs is kept in `N_runs_decomposition`.
+        """
+
+        farm = self.fmodel.core.farm
+        flow_field = self.fmodel.core.flow_field
+        layout_x = np.array(farm.layout_x)
+        layout_y = np.array(farm.layout_y)
+        yaw_angles = np.array(farm.yaw_angles)
+        wind_directions = np.array(flow_field.wind_directions)
+
+        # gather the conditions of each distinct cluster over the directions
+        conditions_clusters = {}
+        directions_unique, idx_directions = np.unique(
+            wind_directions, return_inverse=True
+        )
+        for idx_direction, wind_direction in enumerate(directions_unique):
+            idx_conditions = np.flatnonzero(idx_directions == idx_direction)
+            for idx_cluster in get_wake_clusters(
+                layout_x,
+                layout_y,
+                wind_direction,
+                np.max(farm.rotor_diameters),
+                **self.decomposition_options,
+            ):
+                conditions_clusters.setdefault(tuple(idx_cluster), []).append(
+                    idx_conditions
+                )
+        tasks = [
+            (np.array(idx_cluster), np.concatenate(idx_conditions))
+            for idx_cluster, idx_conditions in conditions_clusters.items()
+        ]
+
+        configuration_key, configuration = FLORISFarmComponent.get_worker_configuration(
+            self
+        )
+
+        def arguments_task(task):
+            idx_cluster, idx_conditions = task
+            return (
+                configuration_key,
+                configuration,
+                self.fmodel.get_operation_model(),
+                layout_x[idx_cluster],
+                layout_y[idx_cluster],
+                wind_directions[idx_conditions],
+                flow_field.wind_speeds[idx_conditions],
+                flow_field.turbulence_intensities[idx_conditions],
+                yaw_angles[np.ix_(idx_conditions, idx_cluster)],
+                flow_field.reference_wind_height,
+            )
+
+        comm = ard_parallel.get_MPI_communicator(getattr(self, "comm", None))
+        if self.parallel_options is None:
+            results = [run_FLORIS_conditions(*arguments_task(task)) for task in tasks]
+        elif self.parallel_options["backend"] == "mpi" and comm is not None:
+            # each rank runs every size-th cluster, then all are gathered
+            results_rank = [
+                (idx_task, run_FLORIS_conditions(*arguments_task(tasks[idx_task])))
+                for idx_task in range(comm.rank, len(tasks), comm.size)
+            ]
+            results = [None] * len(tasks)
+            for results_gathered in comm.allgather(results_rank):
+                for idx_task, result in results_gathered:
+                    results[idx_task] = result
+        else:
+            pool = ard_parallel.get_process_pool(self.parallel_options["N_workers"])
+            futures = [
+                pool.submit(run_FLORIS_conditions, *arguments_task(task))
+                for task in tasks
+            ]
+            results = [future.result() for future in futures]
+
+        power_turbines = np.zeros(yaw_angles.shape)
+        thrust_turbines = np.zeros(yaw_angles.shape)
+        for (idx_cluster, idx_conditions), result in zip(tasks, results):
+            power_turbines[np.ix_(idx_conditions, idx_cluster)] = result[0]
+            thrust_turbines[np.ix_(idx_conditions, idx_cluster)] = result[1]
+
+        self.N_runs_decomposition = len(tasks)
+        self._results_precomputed = {
+            "power_turbines": power_turbines,
+            "thrust_turbines": thrust_turbines,
+        }
+
+    def run_FLORIS_incremental(self):
+        """
+        Run the FLORIS model, re-running only the turbines affected by a move.
+
+        The FLORIS model must have been `set` for the evaluation. Without a
+        previous evaluation at the same yaw angles and wind conditions, the
+        whole model is run; otherwise, for each wind direction, only the
+        turbines affected by the moved turbines are re-run, on a reduced farm
+        with the turbines upstream of them, and the results for all of the
+        conditions are held for the `get_*` methods. The fraction of the
+        turbine evaluations of a full run that were needed is kept in
+        `fraction_incremental`.
+        """
+
+        farm = self.fmodel.core.farm
+        flow_field = self.fmodel.core.flow_field
+        layout_x = np.array(farm.layout_x)
+        layout_y = np.array(farm.layout_y)
+        yaw_angles = np.array(farm.yaw_angles)
+        wind_directions = np.array(flow_field.wind_directions)
+        wind_speeds = np.array(flow_field.wind_speeds)
+        turbulence_intensities = np.array(flow_field.turbulence_intensities)
+        wind_data = self.fmodel.wind_data
+        operation_model = self.fmodel.get_operation_model()
+        state = self._incremental_state
+
+        if (
+            state is None
+            or state["wind_data"] is not wind_data
+            or not np.array_equal(state["yaw_angles"], yaw_angles)
+        ):
+            FLORISFarmComponent.run_FLORIS(self)
+            self.fraction_incremental = 1.0
+            results = self._results_precomputed or {
+                # per condition, i.e. without the reshaping onto a wind rose
+                "power_turbines": self.fmodel._get_turbine_powers(),
+                "thrust_turbines": get_thrust_turbines_FLORIS(self.fmodel),
+            }
+        else:
+            results = {
+                name: state[name].copy()
+                for name in ["power_turbines", "thrust_turbines"]
+            }
+            N_evaluations = 0
+            directions_unique, idx_directions = np.unique(
+                wind_directions, return_inverse=True
+            )
+            for idx_direction, wind_direction in enumerate(directions_unique):
+                idx_affected, idx_needed = get_wake_affected_turbines(
+                    state["layout_x"],
+                    state["layout_y"],
+                    layout_x,
+                    layout_y,
+                    wind_direction,
+                    np.max(farm.rotor_diameters),
+                    **self.incremental_options,
+                )
+                if len(idx_affected) == 0:
+                    continue
+
+                # run the reduced farm on the conditions in this direction
+                idx_conditions = np.flatnonzero(idx_directions == idx_direction)
+                self.fmodel.set(
+                    layout_x=layout_x[idx_needed],
+                    layout_y=layout_y[idx_needed],
+                    wind_data=floris.TimeSeries(
+                        wind_directions=wind_directions[idx_conditions],
+                        wind_speeds=wind_speeds[idx_conditions],
+                        turbulence_intensities=turbulence_intensities[idx_conditions],
+                    ),
+                    yaw_angles=yaw_angles[np.ix_(idx_conditions, idx_needed)],
+                )
+                self.fmodel.set_operation_model(operation_model)
+                self.fmodel.run()
+                N_evaluations += len(idx_conditions) * len(idx_needed)
+
+                idx_reduced = np.searchsorted(idx_needed, idx_affected)
+                idx_update = np.ix_(idx_conditions, idx_affected)
+                results["power_turbines"][
+                    idx_update
+                ] = self.fmodel._get_turbine_powers()[:, idx_reduced]
+                results["thrust_turbines"][idx_update] = get_thrust_turbines_FLORIS(
+                    self.fmodel
+                )[:, idx_reduced]
+
+            # restore the full farm and wind data
+            self.fmodel.set(
+                layout_x=layout_x,
+                layout_y=layout_y,
+                wind_data=wind_data,
+                yaw_angles=yaw_angles,
+            )
+            self.fmodel.set_operation_model(operation_model)
+            self.fraction_incremental = N_evaluations / yaw_angles.size
+            self._results_precomputed = results
+
+        self._incremental_state = {
+            "wind_data": wind_data,
+            "layout_x": layout_x,
+            "layout_y": layout_y,
+            "yaw_angles": yaw_angles,
+            "power_turbines": np.array(results["power_turbines"]),
+            "thrust_turbines": np.array(results["thrust_turbines"]),
+        }
+
+    def reshape_to_wind_data(self, values):
+        """
+        Reshape per-condition values to the shape FLORIS uses for the wind data.
+
+        Mirrors the FLORIS reshaping of farm and turbine powers: on a wind rose,
+        the values are scattered into the full (direction, speed) table, with
+        NaN for the zero-frequency bins.
+        """
+
+        wind_data = self.fmodel.wind_data
+        if isinstance(wind_data, (floris.WindRose, floris.WindRoseWRG)):
+            values_rose = np.full((len(wind_data.wd_flat), *values.shape[1:]), np.nan)
+            values_rose[wind_data.non_zero_freq_mask] = values
+            return values_rose.reshape(
+                len(wind_data.wind_directions),
+                len(wind_data.wind_speeds),
+                *values.shape[1:],
+            )
+        return values
+
+    def get_AEP_farm(self, freq=None):
+        """Get the AEP of a FLORIS farm, optionally with condition frequencies."""
+        if self._results_precomputed is None:
+            return self.fmodel.get_farm_AEP(freq=freq)
+
+        # reduce the gathered powers as FLORIS would
+        if freq is None:
+            freq = self.fmodel.wind_data.unpack_freq()
+        power_farm = np.sum(self._results_precomputed["power_turbines"], axis=1)
+        return np.nansum(np.multiply(freq, power_farm)) * 8760
 
     def get_power_farm(self):
         """Get the farm power of a FLORIS farm at each wind condition."""
-        return self.fmodel.get_farm_power()
+        if self._results_precomputed is None:
+            return self.fmodel.get_farm_power()
+        return FLORISFarmComponent.reshape_to_wind_data(
+            self, np.sum(self._results_precomputed["power_turbines"], axis=1)
+        )
 
     def get_power_turbines(self):
         """Get the turbine powers of a FLORIS farm at each wind condition."""
-        return self.fmodel.get_turbine_powers().T
+        if self._results_precomputed is None:
+            return self.fmodel.get_turbine_powers().T
+        return FLORISFarmComponent.reshape_to_wind_data(
+            self, self._results_precomputed["power_turbines"]
+        ).T
 
     def get_thrust_turbines(self):
         """Get the turbine thrusts of a FLORIS farm at each wind condition."""
-        # FLORIS computes the thrust precursors, compute and return thrust
-        # use pure FLORIS to get these values for consistency
-
-        # prepare to unpack thrust data that is not pre-computed in FLORIS
-        CT_turbines = self.fmodel.get_turbine_thrust_coefficients()
-        V_turbines = self.fmodel.turbine_average_velocities
-        rho_floris = self.fmodel.core.flow_field.air_density
-        A_floris = np.pi * self.fmodel.core.farm.rotor_diameters**2 / 4
-
-        # unpacking procedure
-        # from FLORIS's floris_model.py:564 at a6fc5d35aa32614edc450dc399c42af60a816887
-        thrust_turbines = CT_turbines * (0.5 * rho_floris * A_floris * V_turbines**2)
+        if self._results_precomputed is None:
+            thrust_turbines = get_thrust_turbines_FLORIS(self.fmodel)
+        else:
+            thrust_turbines = self._results_precomputed["thrust_turbines"]
         if isinstance(self.fmodel.wind_data, floris.WindRose) or isinstance(
             self.fmodel.wind_data, floris.WindRoseWRG
         ):
@@ -275,15 +1205,95 @@ class FLORISFarmComponent:
         else:
             return thrust_turbines.T
 
-    def dump_floris_yamlfile(self, dir_output=None):
+    def dump_floris_yamlfile(self, dir_output=None, background=False):
         """
         Export the current FLORIS inputs to a YAML file file for reproducibility of the analysis.
-        The file will be saved in the `dir_output` directory, or in the current working directory
-        if `dir_output` is None.
+        The file will be saved in the `dir_output` directory, or in the FLORIS storage directory
+        if `dir_output` is None. With `background`, the current FLORIS core and layout are held
+        immediately and the file is assembled and written on a background thread.
         """
         if dir_output is None:
             dir_output = self.dir_floris
-        self.fmodel.core.to_file(Path(dir_output, "batch.yaml"))
+        path_output = Path(dir_output, "batch.yaml")
+        if not background:
+            self.fmodel.core.to_file(path_output)
+            return
+
+        # hold on to the current core and layout, the FLORIS model changes on
+        # the next evaluation; the configuration is built on the writer thread
+        layout_x, layout_y = FLORISFarmComponent.get_snapshot_layout(self)
+        self._snapshot_futures = [
+            future for future in self._snapshot_futures if not future.done()
+        ]
+        self._snapshot_futures.append(
+            _snapshot_writer.submit(
+                write_FLORIS_snapshot,
+                self.fmodel.core,
+                layout_x,
+                layout_y,
+                path_output,
+            )
+        )
+
+    def get_snapshot_layout(self):
+        """Get a copy of the current FLORIS layout, for a snapshot."""
+        return (
+            np.asarray(self.fmodel.core.farm.layout_x).tolist(),
+            np.asarray(self.fmodel.core.farm.layout_y).tolist(),
+        )
+
+    def snapshot_floris(self, AEP_farm=None):
+        """
+        Take a reproducibility snapshot of the FLORIS inputs, per the snapshot policy.
+
+        Evaluations under finite differences or complex steps are not
+        snapshotted, nor counted towards the "every" and "best" policies.
+
+        Parameters
+        ----------
+        AEP_farm : float, optional
+            the AEP of the evaluation, for the "best" policy
+        """
+
+        if getattr(self, "under_approx", False):
+            return
+
+        self._N_snapshot_evaluations += 1
+
+        if self.snapshot_policy == "always":
+            FLORISFarmComponent.dump_floris_yamlfile(self, background=True)
+        elif self.snapshot_policy == "every":
+            if (self._N_snapshot_evaluations - 1) % self.snapshot_interval == 0:
+                FLORISFarmComponent.dump_floris_yamlfile(self, background=True)
+        elif self.snapshot_policy == "best":
+            if AEP_farm is not None and AEP_farm > self._AEP_snapshot_best:
+                self._AEP_snapshot_best = AEP_farm
+                FLORISFarmComponent.dump_floris_yamlfile(self, background=True)
+        elif self.snapshot_policy == "final":
+            # only the layout changes between evaluations (the yaw angles are
+            # not part of a FLORIS input file), the rest is taken at the flush
+            self._snapshot_final = FLORISFarmComponent.get_snapshot_layout(self)
+
+    def flush_snapshots(self):
+        """Write any final snapshot and wait for the pending snapshot writes."""
+
+        if self._snapshot_final is not None:
+            layout_x, layout_y = self._snapshot_final
+            write_FLORIS_snapshot(
+                self.fmodel.core,
+                layout_x,
+                layout_y,
+                Path(self.dir_floris, "batch.yaml"),
+            )
+            self._snapshot_final = None
+        for future in self._snapshot_futures:
+            future.result()  # surface any errors from the background thread
+        self._snapshot_futures = []
+
+    def cleanup(self):
+        """Cleanup-time FLORIS management."""
+        FLORISFarmComponent.flush_snapshots(self)
+        self.result_cache.flush()
 
 
 class FLORISBatchPower(templates.BatchFarmPowerTemplate, FLORISFarmComponent):
@@ -337,6 +1347,15 @@ class FLORISBatchPower(templates.BatchFarmPowerTemplate, FLORISFarmComponent):
         across all of the conditions that have been queried on the wind rose
         (`N_turbines`, `N_wind_conditions`) (inherited from
         `templates.BatchFarmPowerTemplate`)
+
+    Notes
+    -----
+    Long time series often repeat the same (direction, speed, TI) condition
+    many times. With `deduplicate_conditions` set in the `floris` block of the
+    modeling options, the time series is collapsed to its unique conditions at
+    setup, only those are evaluated by FLORIS, and the results are scattered
+    back to every time step, with the AEP weighted by the condition counts.
+    The reduction is exact.
     """
 
     def initialize(self):
@@ -348,6 +1367,36 @@ class FLORISBatchPower(templates.BatchFarmPowerTemplate, FLORISFarmComponent):
         super().setup()  # run super class script first!
         FLORISFarmComponent.setup(self)  # setup a FLORIS run
 
+        # collapse the time series to the conditions that need evaluation
+        conditions = np.column_stack(
+            [
+                np.array(self.wind_query.wind_directions),
+                np.array(self.wind_query.wind_speeds),
+                np.array(self.wind_query.turbulence_intensities),
+            ]
+        )
+        if self.modeling_options.get("floris", {}).get("deduplicate_conditions"):
+            conditions, idx_conditions = np.unique(
+                conditions,
+                axis=0,
+                return_inverse=True,
+            )
+            self.idx_conditions = idx_conditions.reshape(-1)
+            # weighted conditions (e.g. clustered) keep their weights
+            self.freq_conditions = np.bincount(
+                self.idx_conditions,
+                weights=getattr(
+                    self.wind_query,
+                    "freq",
+                    np.full(self.N_wind_conditions, 1.0 / self.N_wind_conditions),
+                ),
+            )
+        else:
+            self.idx_conditions = None
+            self.freq_conditions = getattr(self.wind_query, "freq", None)
+        self.conditions_evaluated = conditions
+        self.N_conditions_evaluated = conditions.shape[0]
+
     @ard_logging.component_log_capture
     def setup_partials(self):
         FLORISFarmComponent.setup_partials(self)
@@ -355,11 +1404,15 @@ class FLORISBatchPower(templates.BatchFarmPowerTemplate, FLORISFarmComponent):
     @ard_logging.component_log_capture
     def compute(self, inputs, outputs):
 
+        # skip the evaluation if this layout and yaw have been evaluated before
+        if FLORISFarmComponent.load_cached_outputs(self, inputs, outputs):
+            return
+
         # generate the list of conditions for evaluation
         self.time_series = floris.TimeSeries(
-            wind_directions=np.degrees(np.array(self.wind_query.wind_directions)),
-            wind_speeds=np.array(self.wind_query.wind_speeds),
-            turbulence_intensities=np.array(self.wind_query.turbulence_intensities),
+            wind_directions=np.degrees(self.conditions_evaluated[:, 0]),
+            wind_speeds=self.conditions_evaluated[:, 1],
+            turbulence_intensities=self.conditions_evaluated[:, 2],
         )
 
         # set up and run the floris model
@@ -377,17 +1430,31 @@ class FLORISBatchPower(templates.BatchFarmPowerTemplate, FLORISFarmComponent):
         if "peak_shaving_fraction" in self.modeling_options.get("floris", {}):
             self.fmodel.set_operation_model("peak-shaving")
 
-        self.fmodel.run()
+        FLORISFarmComponent.run_FLORIS(self)
 
         # dump the yaml to re-run this case on demand
         # FLORISFarmComponent.dump_floris_yamlfile(self, self.dir_floris)
 
-        # FLORIS computes the powers
-        outputs["AEP_farm"] = FLORISFarmComponent.get_AEP_farm(self)
-        outputs["power_farm"] = FLORISFarmComponent.get_power_farm(self)
+        # FLORIS computes the powers, scattered back to the full time series
+        # for deduplicated conditions
+        idx = slice(None) if self.idx_conditions is None else self.idx_conditions
+        outputs["AEP_farm"] = FLORISFarmComponent.get_AEP_farm(
+            self, freq=self.freq_conditions
+        )
+        outputs["power_farm"] = FLORISFarmComponent.get_power_farm(self)[idx]
         if self.options["modeling_options"]["aero"]["return_turbine_output"]:
-            outputs["power_turbines"] = FLORISFarmComponent.get_power_turbines(self)
-            outputs["thrust_turbines"] = FLORISFarmComponent.get_thrust_turbines(self)
+            outputs["power_turbines"] = FLORISFarmComponent.get_power_turbines(self)[
+                :, idx
+            ]
+            outputs["thrust_turbines"] = FLORISFarmComponent.get_thrust_turbines(self)[
+                :, idx
+            ]
+
+        FLORISFarmComponent.store_cached_outputs(self, inputs, outputs)
+
+    def cleanup(self):
+        super().cleanup()
+        FLORISFarmComponent.cleanup(self)
 
 
 class FLORISAEP(templates.FarmAEPTemplate):
@@ -399,6 +1466,14 @@ class FLORISAEP(templates.FarmAEPTemplate):
     the interface from `templates.FarmAEPTemplate` and the computational guts
     from `FLORISFarmComponent`.
 
+    With a `fidelity_schedule` in the `floris` block of the modeling options,
+    an optimization starts on cheaper `levels` (e.g. a compressed wind rose,
+    a 1-point rotor grid, or a simpler wake model) and moves up to the full
+    fidelity on iteration count, step size, or AEP convergence, see
+    `setup_fidelity_schedule`. The per-condition outputs of a level on a
+    compressed wind rose are expanded back onto the wind conditions of the
+    component with `expand_turbine_values`.
+
     Options
     -------
     case_title : str
@@ -453,6 +1528,248 @@ class FLORISAEP(templates.FarmAEPTemplate):
         super().setup()  # run super class script first!
         FLORISFarmComponent.setup(self)  # setup a FLORIS run
 
+        # set up the lower fidelity levels of a fidelity schedule
+        self.fidelity_levels = []
+        self.fidelity_level = None
+        self.fidelity_history = []
+        options_schedule = self.modeling_options.get("floris", {}).get(
+            "fidelity_schedule"
+        )
+        if options_schedule:
+            FLORISAEP.setup_fidelity_schedule(self, options_schedule)
+
+    def setup_fidelity_schedule(self, options_schedule):
+        """
+        Set up the FLORIS models and wind resources of a fidelity schedule.
+
+        Each of the `levels` of the schedule, from the cheapest, can set a
+        `wind_rose_compression` block (as in the `aero` modeling options), the
+        number of `turbine_grid_points` of the FLORIS rotor grid, and a
+        `wake_model` dictionary of FLORIS wake model strings (e.g.
+        `velocity_model: jensen`), on top of the full-fidelity configuration.
+        A level is left for the next one after `max_iterations` driver
+        iterations, or once the largest turbine move between driver
+        iterations is below `step_size` (in m), or the relative change in AEP
+        between driver iterations is below `AEP_change`, whichever is first.
+        The full fidelity of the component follows the last level.
+
+        A driver iteration is an evaluation at a new layout or yaw outside of
+        finite differences or complex steps, so that neither the steps of a
+        gradient nor re-evaluations at the current point (e.g. by
+        `check_partials`) advance the schedule.
+        """
+
+        for options_level in options_schedule["levels"]:
+            configuration = copy.deepcopy(self.fmodel.core.as_dict())
+            if "turbine_grid_points" in options_level:
+                configuration["solver"]["turbine_grid_points"] = options_level[
+                    "turbine_grid_points"
+                ]
+            configuration["wake"]["model_strings"].update(
+                options_level.get("wake_model", {})
+            )
+
+            wind_query = self.wind_query
+            options_compression = options_level.get("wind_rose_compression")
+            if options_compression is not None:
+                if self.time_series_clustering is not None:
+                    raise ValueError(
+                        "A fidelity level can't compress the wind rose of a "
+                        "clustered time series."
+                    )
+                wind_query, _ = templates.compress_wind_rose(
+                    self.wind_rose_full,
+                    *templates.get_power_curve_from_windIO(
+                        self.windIO["wind_farm"]["turbine"]
+                    ),
+                    AEP_tolerance=options_compression.get("AEP_tolerance", 1.0e-3),
+                    probability_threshold=options_compression.get(
+                        "probability_threshold", 0.0
+                    ),
+                )
+
+            self.fidelity_levels.append(
+                {
+                    "fmodel": floris.FlorisModel(configuration),
+                    "wind_query": wind_query,
+                    "max_iterations": options_level.get("max_iterations"),
+                    "step_size": options_level.get("step_size"),
+                    "AEP_change": options_level.get("AEP_change"),
+                }
+            )
+
+        # the free-stream turbine curves, to expand compressed levels with
+        windIOturbine = self.windIO["wind_farm"]["turbine"]
+        speeds_power, power = templates.get_power_curve_from_windIO(windIOturbine)
+        self._fidelity_curves = {
+            "speeds_power": speeds_power,
+            "power": power,
+            "speeds_Ct": np.array(
+                windIOturbine["performance"]["Ct_curve"]["Ct_wind_speeds"]
+            ),
+            "Ct": np.array(windIOturbine["performance"]["Ct_curve"]["Ct_values"]),
+            "area_rotor": np.pi * windIOturbine["rotor_diameter"] ** 2 / 4,
+        }
+
+        self.fidelity_level = 0
+        self._fidelity_iterations = []
+        self._fidelity_point_last = None
+
+    def update_fidelity_level(self, inputs):
+        """
+        Move on to the next fidelity level if the current one is done with.
+
+        Called at each driver iteration, i.e. not for the finite difference
+        steps of the gradients, which are kept at the fidelity of their
+        driver iteration. The switches are printed to the component log and
+        kept in `fidelity_history`.
+        """
+
+        level = self.fidelity_levels[self.fidelity_level]
+        iterations = self._fidelity_iterations
+        reason = None
+        if (
+            level["max_iterations"] is not None
+            and len(iterations) >= level["max_iterations"]
+        ):
+            reason = f"{len(iterations)} iterations"
+        elif level["step_size"] is not None and len(iterations) > 0:
+            step = np.max(
+                np.abs(
+                    np.concatenate(
+                        [
+                            inputs["x_turbines"] - iterations[-1]["x_turbines"],
+                            inputs["y_turbines"] - iterations[-1]["y_turbines"],
+                        ]
+                    )
+                )
+            )
+            if step < level["step_size"]:
+                reason = f"step size {step:.3e} m"
+        if reason is None and level["AEP_change"] is not None and len(iterations) > 1:
+            AEP_change = np.abs(
+                iterations[-1]["AEP_farm"] / iterations[-2]["AEP_farm"] - 1.0
+            )
+            if AEP_change < level["AEP_change"]:
+                reason = f"relative AEP change {AEP_change:.3e}"
+
+        if reason is not None:
+            self.fidelity_history.append(
+                {
+                    "from": self.fidelity_level,
+                    "to": self.fidelity_level + 1,
+                    "iterations": len(iterations),
+                    "reason": reason,
+                }
+            )
+            print(
+                f"switching FLORIS fidelity from level {self.fidelity_level} to "
+                f"{self.fidelity_level + 1} after {len(iterations)} iterations: "
+                f"{reason}"
+            )
+            self.fidelity_level += 1
+            self._fidelity_iterations = []
+
+    def compute_fidelity_level(self, inputs, outputs):
+        """
+        Compute the outputs at the current (lower) fidelity level.
+
+        The per-condition outputs of a level on a compressed wind rose are
+        expanded back onto the wind conditions of the component, so that
+        downstream components see a full set of powers and thrusts at every
+        level.
+        """
+
+        level = self.fidelity_levels[self.fidelity_level]
+        fmodel = level["fmodel"]
+        fmodel.set(
+            layout_x=inputs["x_turbines"],
+            layout_y=inputs["y_turbines"],
+            wind_data=level["wind_query"],
+            yaw_angles=np.array([inputs["yaw_turbines"]]),
+            reference_wind_height=getattr(
+                self.wind_query,
+                "reference_height",
+                None,
+            ),
+        )
+        if "peak_shaving_fraction" in self.modeling_options.get("floris", {}):
+            fmodel.set_operation_model("peak-shaving")
+        fmodel.run()
+
+        outputs["AEP_farm"] = fmodel.get_farm_AEP(
+            freq=getattr(level["wind_query"], "freq", None)
+        )
+
+        def get_conditions(wind_data):
+            # the flat conditions of a wind resource and the ones FLORIS runs
+            if isinstance(wind_data, (floris.WindRose, floris.WindRoseWRG)):
+                return (
+                    wind_data.wd_flat,
+                    wind_data.ws_flat,
+                    wind_data.non_zero_freq_mask,
+                )
+            directions = np.asarray(wind_data.wind_directions)
+            return (
+                directions,
+                np.asarray(wind_data.wind_speeds),
+                np.ones_like(directions, dtype=bool),
+            )
+
+        power_turbines = fmodel._get_turbine_powers()
+        thrust_turbines = get_thrust_turbines_FLORIS(fmodel)
+        directions, speeds, mask_run = get_conditions(self.wind_query)
+        if level["wind_query"] is not self.wind_query:
+            curves = self._fidelity_curves
+
+            def power_free(speed):
+                return np.interp(
+                    speed, curves["speeds_power"], curves["power"], left=0.0, right=0.0
+                )
+
+            def thrust_free(speed):
+                Ct = np.interp(
+                    speed, curves["speeds_Ct"], curves["Ct"], left=0.0, right=0.0
+                )
+                return (
+                    0.5
+                    * fmodel.core.flow_field.air_density
+                    * curves["area_rotor"]
+                    * Ct
+                    * speed**2
+                )
+
+            directions_level, speeds_level, mask_level = get_conditions(
+                level["wind_query"]
+            )
+            directions_level = directions_level[mask_level]
+            speeds_level = speeds_level[mask_level]
+            power_turbines, thrust_turbines = [
+                expand_turbine_values(
+                    directions_level,
+                    speeds_level,
+                    values,
+                    value_free(speeds_level),
+                    directions[mask_run],
+                    speeds[mask_run],
+                    value_free(speeds[mask_run]),
+                )
+                for values, value_free in [
+                    (power_turbines, power_free),
+                    (thrust_turbines, thrust_free),
+                ]
+            ]
+
+        # scatter onto the conditions of the component, as FLORIS would
+        power_turbines_conditions = np.full((len(directions), self.N_turbines), np.nan)
+        power_turbines_conditions[mask_run] = power_turbines
+        thrust_turbines_conditions = np.zeros((len(directions), self.N_turbines))
+        thrust_turbines_conditions[mask_run] = thrust_turbines
+        outputs["power_farm"] = np.sum(power_turbines_conditions, axis=1)
+        if "power_turbines" in outputs:
+            outputs["power_turbines"] = power_turbines_conditions.T
+            outputs["thrust_turbines"] = thrust_turbines_conditions.T
+
     @ard_logging.component_log_capture
     def setup_partials(self):
         super().setup_partials()
@@ -460,6 +1777,36 @@ class FLORISAEP(templates.FarmAEPTemplate):
     @ard_logging.component_log_capture
     def compute(self, inputs, outputs):
 
+        # run at a lower fidelity level of the schedule, if not done with them
+        if self.fidelity_level is not None and self.fidelity_level < len(
+            self.fidelity_levels
+        ):
+            point = np.concatenate(
+                [inputs["x_turbines"], inputs["y_turbines"], inputs["yaw_turbines"]]
+            )
+            is_iteration = not self.under_approx and not (
+                self._fidelity_point_last is not None
+                and np.array_equal(point, self._fidelity_point_last)
+            )
+            if is_iteration:
+                self._fidelity_point_last = point
+                FLORISAEP.update_fidelity_level(self, inputs)
+            if self.fidelity_level < len(self.fidelity_levels):
+                FLORISAEP.compute_fidelity_level(self, inputs, outputs)
+                if is_iteration:
+                    self._fidelity_iterations.append(
+                        {
+                            "x_turbines": inputs["x_turbines"].copy(),
+                            "y_turbines": inputs["y_turbines"].copy(),
+                            "AEP_farm": outputs["AEP_farm"][0],
+                        }
+                    )
+                return
+
+        # skip the evaluation if this layout and yaw have been evaluated before
+        if FLORISFarmComponent.load_cached_outputs(self, inputs, outputs):
+            return
+
         # set up and run the floris model
         self.fmodel.set(
             layout_x=inputs["x_turbines"],
@@ -475,17 +1822,371 @@ class FLORISAEP(templates.FarmAEPTemplate):
         if "peak_shaving_fraction" in self.modeling_options.get("floris", {}):
             self.fmodel.set_operation_model("peak-shaving")
 
-        self.fmodel.run()
+        if self.incremental_options is not None:
+            FLORISFarmComponent.run_FLORIS_incremental(self)
+        else:
+            FLORISFarmComponent.run_FLORIS(self)
 
-        # dump the yaml to re-run this case on demand
-        FLORISFarmComponent.dump_floris_yamlfile(self, self.dir_floris)
+        # FLORIS computes the powers, with the frequencies of a compressed rose
+        outputs["AEP_farm"] = FLORISFarmComponent.get_AEP_farm(
+            self, freq=getattr(self.wind_query, "freq", None)
+        )
 
-        # FLORIS computes the powers
-        outputs["AEP_farm"] = FLORISFarmComponent.get_AEP_farm(self)
+        # snapshot the yaml to re-run this case on demand
+        FLORISFarmComponent.snapshot_floris(self, AEP_farm=outputs["AEP_farm"][0])
         outputs["power_farm"] = FLORISFarmComponent.get_power_farm(self)
         outputs["power_turbines"] = FLORISFarmComponent.get_power_turbines(self)
         outputs["thrust_turbines"] = FLORISFarmComponent.get_thrust_turbines(self)
 
+        FLORISFarmComponent.store_cached_outputs(self, inputs, outputs)
+
+    def verify_wind_rose_compression(
+        self,
+        x_turbines,
+        y_turbines,
+        yaw_turbines=None,
+    ):
+        """
+        Verify the AEP of the compressed wind rose against the full wind rose.
+
+        Runs FLORIS for the given layout on both the full wind rose and the
+        wind resource used by `compute`, e.g. for a final verification of an
+        optimized layout found using a compressed wind rose.
+
+        Parameters
+        ----------
+        x_turbines : np.ndarray
+            a 1D numpy array of the x-dimension locations of the turbines
+        y_turbines : np.ndarray
+            a 1D numpy array of the y-dimension locations of the turbines
+        yaw_turbines : np.ndarray, optional
+            a 1D numpy array of the turbine yaw angles, by default zero
+
+        Returns
+        -------
+        dict
+            the AEP of the full wind rose `AEP_full`, of the compressed wind
+            resource `AEP_compressed`, and the relative error `AEP_error`
+        """
+
+        if yaw_turbines is None:
+            yaw_turbines = np.zeros_like(x_turbines)
+
+        AEP = {}
+        for key, wind_data in [
+            ("AEP_full", self.wind_rose_full),
+            ("AEP_compressed", self.wind_query),
+        ]:
+            self.fmodel.set(
+                layout_x=x_turbines,
+                layout_y=y_turbines,
+                wind_data=wind_data,
+                yaw_angles=np.array([yaw_turbines]),
+                reference_wind_height=getattr(
+                    self.wind_query,
+                    "reference_height",
+                    None,
+                ),
+            )
+            if "peak_shaving_fraction" in self.modeling_options.get("floris", {}):
+                self.fmodel.set_operation_model("peak-shaving")
+            FLORISFarmComponent.run_FLORIS(self)
+            AEP[key] = FLORISFarmComponent.get_AEP_farm(
+                self, freq=getattr(wind_data, "freq", None)
+            )
+
+        AEP["AEP_error"] = np.abs(AEP["AEP_compressed"] - AEP["AEP_full"]) / np.abs(
+            AEP["AEP_full"]
+        )
+        return AEP
+
     @ard_logging.component_log_capture
     def setup_partials(self):
         FLORISFarmComponent.setup_partials(self)
+
+    def cleanup(self):
+        super().cleanup()
+        FLORISFarmComponent.cleanup(self)
+
+
+class FLORISGridAEP(FLORISAEP):
+    """
+    Component class for the AEP of a rigidly rotated layout, using FLORIS.
+
+    For a layout that is rotated rigidly by `angle_orientation` (e.g. the
+    `GridFarmLayout`), rotating the farm is equivalent to rotating the wind
+    resource the other way. This component runs FLORIS once for the unrotated
+    layout on a table of relative wind directions for every (speed, TI) pair
+    in the wind resource, and then evaluates any orientation by re-weighting
+    the table with the rotated wind resource, interpolating periodically in
+    direction. Orientation sweeps and finite difference steps in
+    `angle_orientation` then need no FLORIS runs; any other change to the
+    layout or the yaw at a driver iteration builds a new table.
+
+    The direction resolution of the table is set by `direction_resolution`
+    (in degrees) in the `floris` block of the modeling options, by default 1°,
+    with the table directions aligned with the wind resource directions so
+    that the AEP is exact at orientations on the table directions. A table
+    costs about (360° / `direction_resolution`) / (number of resource
+    directions) `FLORISAEP` evaluations. Setting `direction_resolution` to
+    "resource" puts the table on the direction bins of the wind resource
+    instead, which makes a table as cheap as one evaluation, but then the AEP
+    is interpolated linearly across each whole bin, so it is piecewise linear
+    in `angle_orientation`, with a kink at every bin, and its finite
+    difference derivative is constant within each bin. The tables of the
+    most recent layouts are kept, up to `table_cache_size` of them, by
+    default enough for a central difference in every input.
+
+    The finite difference steps in any other input (e.g. the turbine
+    positions, or the spacing and skew upstream) are evaluated directly,
+    as by `FLORISAEP`, instead of building a table for each. Each step is
+    offset by the difference between the table and a direct evaluation at
+    the point of the gradient, so that the differences are those of the
+    direct evaluations rather than of the interpolation error of the table.
+    The value is then that of the table, while the gradients w.r.t. these
+    inputs are those of `FLORISAEP`; the two agree to within the
+    interpolation error of the table, which is small on the default fine
+    table but not on the resource bins.
+
+    Options
+    -------
+    case_title : str
+        a "title" for the case, used to disambiguate runs in practice (inherited
+        from `FLORISFarmComponent`)
+    modeling_options : dict
+        a modeling options dictionary (inherited via `FLORISAEP`)
+    wind_query : floris.wind_data.WindRose
+        a WindQuery objects that specifies the wind conditions that are to be
+        computed (inherited via `FLORISAEP`)
+
+    Inputs
+    ------
+    x_turbines : np.ndarray
+        a 1D numpy array indicating the x-dimension locations of the turbines,
+        with length `N_turbines`, after the rotation by `angle_orientation`
+        (inherited via `FLORISAEP`)
+    y_turbines : np.ndarray
+        a 1D numpy array indicating the y-dimension locations of the turbines,
+        with length `N_turbines`, after the rotation by `angle_orientation`
+        (inherited via `FLORISAEP`)
+    yaw_turbines : np.ndarray
+        a numpy array indicating the yaw angle to drive each turbine to with
+        respect to the ambient wind direction, with length `N_turbines`
+        (inherited via `FLORISAEP`)
+    angle_orientation : float
+        the clockwise rotation of the layout with respect to North, as in
+        `ard.layout.gridfarm.GridFarmLayout`
+
+    Outputs
+    -------
+    AEP_farm : float
+        the AEP of the farm given by the analysis (inherited via `FLORISAEP`)
+    power_farm : np.ndarray
+        an array of the farm power for each of the wind conditions that have
+        been queried (inherited via `FLORISAEP`)
+    power_turbines : np.ndarray
+        an array of the farm power for each of the turbines in the farm across
+        all of the conditions that have been queried on the wind rose
+        (`N_turbines`, `N_wind_conditions`) (inherited via `FLORISAEP`)
+    thrust_turbines : np.ndarray
+        an array of the wind turbine thrust for each of the turbines in the farm
+        across all of the conditions that have been queried on the wind rose
+        (`N_turbines`, `N_wind_conditions`) (inherited via `FLORISAEP`)
+    """
+
+    @ard_logging.component_log_capture
+    def setup(self):
+        super().setup()  # run super class script first!
+
+        self.add_input(
+            "angle_orientation",
+            self.modeling_options["layout"].get("angle_orientation", 0.0),
+            units="deg",
+        )
+
+        # the wind conditions that are re-weighted, in FLORIS order
+        (
+            self.directions_conditions,
+            speeds_conditions,
+            TIs_conditions,
+            _,
+        ) = self.wind_query.unpack_for_reinitialize()
+
+        # the (speed, TI) pairs that the table is evaluated at
+        self.pairs_table, idx_pairs = np.unique(
+            np.column_stack([speeds_conditions, TIs_conditions]),
+            axis=0,
+            return_inverse=True,
+        )
+        self.idx_pairs_conditions = idx_pairs.reshape(-1)
+
+        # the relative directions of the table, aligned with the resource and
+        # by default on a fine grid, or on its direction bins if requested
+        options_floris = self.modeling_options.get("floris", {})
+        directions_unique = np.unique(np.mod(self.directions_conditions, 360.0))
+        resolution = options_floris.get("direction_resolution", 1.0)
+        if resolution == "resource":
+            resolution = np.min(
+                np.diff(directions_unique, append=directions_unique[0] + 360.0)
+            )
+        self.N_directions_table = int(np.round(360.0 / resolution))
+        self.resolution_table = 360.0 / self.N_directions_table
+        self.offset_table = np.mod(directions_unique[0], self.resolution_table)
+        self.directions_table = (
+            self.offset_table
+            + np.arange(self.N_directions_table) * self.resolution_table
+        )
+
+        self.tables = ard_caching.LRUResultCache(
+            options_floris.get("table_cache_size", 2 * (3 * self.N_turbines + 1) + 1)
+        )
+        self._table_point = None
+
+    def get_table(self, x_unrotated, y_unrotated, yaw_turbines):
+        """
+        Get the turbine power and thrust tables for an unrotated layout.
+
+        Returns
+        -------
+        dict
+            the turbine powers `power_turbines` and thrusts `thrust_turbines`,
+            each (`N_turbines`, `N_pairs`, `N_directions_table`)
+        """
+
+        key = ard_caching.hash_arrays(x_unrotated, y_unrotated, yaw_turbines)
+        table = self.tables.get(key)
+        if table is not None:
+            return table
+
+        N_pairs = self.pairs_table.shape[0]
+        self.fmodel.set(
+            layout_x=x_unrotated,
+            layout_y=y_unrotated,
+            wind_data=floris.TimeSeries(
+                wind_directions=np.tile(self.directions_table, N_pairs),
+                wind_speeds=np.repeat(self.pairs_table[:, 0], self.N_directions_table),
+                turbulence_intensities=np.repeat(
+                    self.pairs_table[:, 1], self.N_directions_table
+                ),
+            ),
+            yaw_angles=np.array([yaw_turbines]),
+            reference_wind_height=getattr(
+                self.wind_query,
+                "reference_height",
+                None,
+            ),
+        )
+        if "peak_shaving_fraction" in self.modeling_options.get("floris", {}):
+            self.fmodel.set_operation_model("peak-shaving")
+        FLORISFarmComponent.run_FLORIS(self)
+
+        shape_table = (len(x_unrotated), N_pairs, self.N_directions_table)
+        table = {
+            "power_turbines": FLORISFarmComponent.get_power_turbines(self).reshape(
+                shape_table
+            ),
+            "thrust_turbines": FLORISFarmComponent.get_thrust_turbines(self).reshape(
+                shape_table
+            ),
+        }
+        self.tables.put(key, table)
+        return table
+
+    @ard_logging.component_log_capture
+    def compute(self, inputs, outputs):
+
+        # undo the rigid rotation of the layout, rounding off the round-trip
+        # error so that all orientations of a layout share a table
+        angle_orientation = np.radians(inputs["angle_orientation"][0])
+        cos_angle, sin_angle = np.cos(angle_orientation), np.sin(angle_orientation)
+        x_unrotated = (
+            np.round(
+                cos_angle * inputs["x_turbines"] - sin_angle * inputs["y_turbines"], 6
+            )
+            + 0.0  # no negative zeros
+        )
+        y_unrotated = (
+            np.round(
+                sin_angle * inputs["x_turbines"] + cos_angle * inputs["y_turbines"], 6
+            )
+            + 0.0
+        )
+
+        # steps of a gradient off the tables are evaluated directly, offset
+        # by the interpolation error of the table at the point of the gradient
+        key = ard_caching.hash_arrays(x_unrotated, y_unrotated, inputs["yaw_turbines"])
+        if self.under_approx and key not in self.tables:
+            point = self._table_point
+            if point is not None and point["outputs_direct"] is None:
+                super().compute(point["inputs"], outputs)
+                point["outputs_direct"] = {
+                    name: np.copy(outputs[name]) for name in point["outputs_table"]
+                }
+            super().compute(inputs, outputs)
+            if point is not None:
+                for name in point["outputs_table"]:
+                    outputs[name] = (
+                        outputs[name]
+                        + point["outputs_table"][name]
+                        - point["outputs_direct"][name]
+                    )
+            return
+
+        table = self.get_table(x_unrotated, y_unrotated, inputs["yaw_turbines"])
+
+        # a farm rotated clockwise sees the wind from the relative direction
+        # (direction - orientation), interpolate periodically on the table
+        position = (
+            np.mod(
+                self.directions_conditions
+                - inputs["angle_orientation"][0]
+                - self.offset_table,
+                360.0,
+            )
+            / self.resolution_table
+        )
+        idx_lower = np.floor(position).astype(int) % self.N_directions_table
+        idx_upper = (idx_lower + 1) % self.N_directions_table
+        weight_upper = position - np.floor(position)
+
+        def interpolate(values_table):
+            return (
+                (1.0 - weight_upper)
+                * values_table[:, self.idx_pairs_conditions, idx_lower]
+                + weight_upper * values_table[:, self.idx_pairs_conditions, idx_upper]
+            ).T
+
+        # hand the interpolated results to FLORIS-ordered outputs
+        self.fmodel.set(
+            layout_x=inputs["x_turbines"],
+            layout_y=inputs["y_turbines"],
+            wind_data=self.wind_query,
+            yaw_angles=np.array([inputs["yaw_turbines"]]),
+        )
+        self._results_precomputed = {
+            "power_turbines": interpolate(table["power_turbines"]),
+            "thrust_turbines": interpolate(table["thrust_turbines"]),
+        }
+
+        outputs["AEP_farm"] = FLORISFarmComponent.get_AEP_farm(
+            self, freq=getattr(self.wind_query, "freq", None)
+        )
+        outputs["power_farm"] = FLORISFarmComponent.get_power_farm(self)
+        outputs["power_turbines"] = FLORISFarmComponent.get_power_turbines(self)
+        outputs["thrust_turbines"] = FLORISFarmComponent.get_thrust_turbines(self)
+
+        # snapshot the yaml to re-run this case on demand
+        FLORISFarmComponent.snapshot_floris(self, AEP_farm=outputs["AEP_farm"][0])
+
+        # hold on to the point, for the steps of its gradient
+        if not self.under_approx:
+            self._table_point = {
+                "inputs": {
+                    name: np.copy(inputs[name])
+                    for name in ["x_turbines", "y_turbines", "yaw_turbines"]
+                },
+                "outputs_table": {
+                    name: np.copy(outputs[name]) for name in outputs.keys()
+                },
+                "outputs_direct": None,
+            }
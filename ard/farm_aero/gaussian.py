@@ -0,0 +1,538 @@
+from functools import partial
+
+import numpy as np
+import jax.numpy as jnp
+import jax
+
+jax.config.update("jax_enable_x64", True)
+import openmdao.api as om
+
+import ard.farm_aero.templates as templates
+import ard.utils.compilation
+from ard.farm_aero.floris import create_FLORIS_turbine_from_windIO
+
+_deficit_combinations = ["linear", "sos"]
+
+
+def _calculate_gaussian_wake_performance_chunk(
+    x_turbines,
+    y_turbines,
+    yaw_turbines,
+    directions,
+    speeds,
+    TIs,
+    speeds_curve,
+    power_curve,
+    thrust_coefficient_curve,
+    rotor_diameter,
+    air_density=1.225,
+    cosine_loss_exponent_yaw=1.88,
+    wake_expansion=None,
+    deficit_combination="sos",
+    N_iterations=3,
+):
+    """
+    Calculate the turbine powers and thrusts for a chunk of wind conditions.
+
+    Uses the Bastankhah and Porté-Agel (2014) self-similar Gaussian velocity
+    deficit, evaluated at the hub of each waked turbine, with a Jiménez
+    (2010) wake deflection for yawed turbines. The wake expansion rate is
+    either fixed or set from the ambient turbulence intensity after Niayifar
+    and Porté-Agel (2016). The deficits of all upstream turbines are combined
+    linearly or by their sum of squares.
+
+    The waked velocities depend on the thrust coefficients of the upstream
+    turbines at their own waked velocities, so they are found by a fixed
+    number of vectorized fixed-point iterations starting from the free
+    stream; `N_iterations` sweeps are exact for chains of up to
+    `N_iterations` waked turbines, and the thrust coefficients of turbines
+    deeper in a chain lag by the remaining sweeps. Everything is vectorized
+    over the turbines and wind conditions and differentiable with JAX, with
+    intermediates of size (`N_wind_conditions`, `N_turbines`, `N_turbines`),
+    so the wind conditions of a resource are evaluated in chunks by
+    `calculate_gaussian_wake_performance` and `calculate_gaussian_wake_AEP`.
+
+    Parameters
+    ----------
+    x_turbines : np.ndarray
+        the x-dimension locations of the turbines in m, (`N_turbines`,)
+    y_turbines : np.ndarray
+        the y-dimension locations of the turbines in m, (`N_turbines`,)
+    yaw_turbines : np.ndarray
+        the yaw angles of the turbines w.r.t. the wind in deg, (`N_turbines`,)
+    directions : np.ndarray
+        the wind directions in deg, in the meteorological (FLORIS)
+        convention, (`N_wind_conditions`,)
+    speeds : np.ndarray
+        the free-stream wind speeds at hub height in m/s,
+        (`N_wind_conditions`,)
+    TIs : np.ndarray
+        the ambient turbulence intensities, (`N_wind_conditions`,)
+    speeds_curve : np.ndarray
+        the wind speeds of the turbine power and thrust curves in m/s
+    power_curve : np.ndarray
+        the turbine power curve in W
+    thrust_coefficient_curve : np.ndarray
+        the turbine thrust coefficient curve
+    rotor_diameter : float
+        the turbine rotor diameter in m
+    air_density : float, optional
+        the air density in kg/m^3, by default 1.225
+    cosine_loss_exponent_yaw : float, optional
+        the exponent of the cosine loss of power with yaw, by default 1.88
+    wake_expansion : float, optional
+        a fixed wake expansion rate, by default None to set it from the
+        turbulence intensity
+    deficit_combination : str, optional
+        the deficit combination, "linear" or "sos" (the default)
+    N_iterations : int, optional
+        the number of fixed-point sweeps over the waked velocities, by
+        default 3
+
+    Returns
+    -------
+    power_turbines : jnp.ndarray
+        the turbine powers in W, (`N_wind_conditions`, `N_turbines`)
+    thrust_turbines : jnp.ndarray
+        the turbine thrusts in N, (`N_wind_conditions`, `N_turbines`)
+    """
+
+    # stream-wise and cross-stream separations of each (waked, waking) pair
+    angle_flow = jnp.radians(270.0 - directions)[:, None, None]
+    dx_pairs = (x_turbines[:, None] - x_turbines[None, :])[None, :, :]
+    dy_pairs = (y_turbines[:, None] - y_turbines[None, :])[None, :, :]
+    x_stream = dx_pairs * jnp.cos(angle_flow) + dy_pairs * jnp.sin(angle_flow)
+    y_stream = -dx_pairs * jnp.sin(angle_flow) + dy_pairs * jnp.cos(angle_flow)
+
+    # only turbines downstream are waked, with the masked branch kept finite
+    mask_waked = x_stream > 0.0
+    xD_stream = jnp.where(mask_waked, x_stream, 1.0) / rotor_diameter
+
+    # wake expansion rate, per wind condition
+    if wake_expansion is None:
+        k_wake = (0.3837 * TIs + 0.003678)[:, None, None]
+    else:
+        k_wake = wake_expansion
+
+    yaw = jnp.radians(yaw_turbines)[None, None, :]
+
+    def deficit_velocity(speeds_turbines):
+        """the combined velocity deficit fraction at each turbine"""
+
+        thrust_coefficient = jnp.interp(
+            speeds_turbines, speeds_curve, thrust_coefficient_curve
+        )
+        thrust_coefficient = jnp.clip(thrust_coefficient[:, None, :], 0.0, 0.9999)
+
+        # wake width at each waked turbine
+        sqrt_induction = jnp.sqrt(1.0 - thrust_coefficient * jnp.cos(yaw))
+        beta = 0.5 * (1.0 + sqrt_induction) / sqrt_induction
+        sigmaD = k_wake * xD_stream + 0.2 * jnp.sqrt(beta)
+
+        # Jiménez wake deflection, integrated along the stream-wise direction
+        skew_initial = (
+            0.3 * yaw / jnp.cos(yaw) * (1.0 - jnp.sqrt(1.0 - thrust_coefficient))
+        )
+        deflectionD = (
+            -skew_initial / (2.0 * 0.05) * (1.0 - 1.0 / (1.0 + 2.0 * 0.05 * xD_stream))
+        )
+
+        # Gaussian velocity deficit, clipped in the near wake
+        deficit_centerline = 1.0 - jnp.sqrt(
+            jnp.maximum(
+                1.0 - thrust_coefficient * jnp.cos(yaw) / (8.0 * sigmaD**2),
+                1.0e-6,
+            )
+        )
+        deficit = jnp.where(
+            mask_waked,
+            deficit_centerline
+            * jnp.exp(
+                -((y_stream / rotor_diameter - deflectionD) ** 2) / (2.0 * sigmaD**2)
+            ),
+            0.0,
+        )
+
+        if deficit_combination == "linear":
+            return jnp.sum(deficit, axis=2)
+        deficit_squared = jnp.sum(deficit**2, axis=2)
+        mask_deficit = deficit_squared > 0.0
+        return jnp.where(
+            mask_deficit,
+            jnp.sqrt(jnp.where(mask_deficit, deficit_squared, 1.0)),
+            0.0,
+        )
+
+    # sweep the waked velocities from the free stream
+    speeds_free = jnp.broadcast_to(
+        speeds[:, None], (len(speeds), len(x_turbines))
+    ).astype(float)
+    speeds_turbines = speeds_free
+    for _ in range(N_iterations):
+        speeds_turbines = speeds_free * (1.0 - deficit_velocity(speeds_turbines))
+
+    # turbine performance at the waked velocities
+    yaw_turbines_rad = jnp.radians(yaw_turbines)[None, :]
+    power_turbines = jnp.interp(speeds_turbines, speeds_curve, power_curve) * (
+        jnp.cos(yaw_turbines_rad) ** cosine_loss_exponent_yaw
+    )
+    thrust_turbines = (
+        jnp.interp(speeds_turbines, speeds_curve, thrust_coefficient_curve)
+        * jnp.cos(yaw_turbines_rad)
+        * (0.5 * air_density * np.pi * rotor_diameter**2 / 4 * speeds_turbines**2)
+    )
+
+    return power_turbines, thrust_turbines
+
+
+def _split_conditions(N_chunk, *arrays, value_pad=None):
+    """split per-condition arrays into chunks, padding out the last chunk"""
+
+    N_conditions = len(arrays[0])
+    N_pad = -N_conditions % N_chunk
+    if value_pad is None:
+        # repeat the last condition so the padded evaluations stay finite
+        arrays = [jnp.pad(array, (0, N_pad), mode="edge") for array in arrays]
+    else:
+        arrays = [
+            jnp.pad(array, (0, N_pad), constant_values=value_pad) for array in arrays
+        ]
+    return [array.reshape(-1, N_chunk) for array in arrays]
+
+
+@partial(
+    jax.jit,
+    static_argnames=[
+        "wake_expansion",
+        "deficit_combination",
+        "N_iterations",
+        "N_chunk",
+    ],
+)
+def calculate_gaussian_wake_performance(
+    x_turbines,
+    y_turbines,
+    yaw_turbines,
+    directions,
+    speeds,
+    TIs,
+    *args,
+    N_chunk=256,
+    **kwargs,
+):
+    """
+    Calculate the turbine powers and thrusts with a Gaussian wake model.
+
+    The wind conditions are evaluated in chunks of `N_chunk` conditions by
+    `_calculate_gaussian_wake_performance_chunk`, which bounds the memory of
+    its (`N_chunk`, `N_turbines`, `N_turbines`) intermediates for long time
+    series resources.
+
+    Parameters
+    ----------
+    x_turbines, y_turbines, yaw_turbines : np.ndarray
+        the turbine locations in m and yaw angles in deg, (`N_turbines`,)
+    directions, speeds, TIs : np.ndarray
+        the wind directions in deg, free-stream wind speeds at hub height in
+        m/s, and ambient turbulence intensities, (`N_wind_conditions`,)
+    N_chunk : int, optional
+        the number of wind conditions evaluated at once, by default 256
+    *args, **kwargs
+        the turbine and wake model parameters, see
+        `_calculate_gaussian_wake_performance_chunk`
+
+    Returns
+    -------
+    power_turbines : jnp.ndarray
+        the turbine powers in W, (`N_wind_conditions`, `N_turbines`)
+    thrust_turbines : jnp.ndarray
+        the turbine thrusts in N, (`N_wind_conditions`, `N_turbines`)
+    """
+
+    N_conditions = len(directions)
+    N_chunk = min(N_chunk, N_conditions)
+
+    def evaluate_chunk(conditions):
+        return _calculate_gaussian_wake_performance_chunk(
+            x_turbines, y_turbines, yaw_turbines, *conditions, *args, **kwargs
+        )
+
+    power_turbines, thrust_turbines = jax.lax.map(
+        evaluate_chunk, _split_conditions(N_chunk, directions, speeds, TIs)
+    )
+    return (
+        power_turbines.reshape(-1, len(x_turbines))[:N_conditions],
+        thrust_turbines.reshape(-1, len(x_turbines))[:N_conditions],
+    )
+
+
+def calculate_gaussian_wake_AEP(
+    x_turbines,
+    y_turbines,
+    yaw_turbines,
+    pmf,
+    directions,
+    speeds,
+    TIs,
+    *args,
+    N_chunk=256,
+    **kwargs,
+):
+    """
+    Calculate the AEP of a farm with a Gaussian wake model.
+
+    The AEP is accumulated over chunks of `N_chunk` wind conditions by a scan
+    whose body is rematerialized in reverse mode, so the gradient only holds
+    the intermediates of one chunk at a time rather than of every condition.
+
+    Parameters
+    ----------
+    x_turbines, y_turbines, yaw_turbines : np.ndarray
+        the turbine locations in m and yaw angles in deg, (`N_turbines`,)
+    pmf : np.ndarray
+        the probability of each wind condition, (`N_wind_conditions`,)
+    directions, speeds, TIs : np.ndarray
+        the wind directions in deg, free-stream wind speeds at hub height in
+        m/s, and ambient turbulence intensities, (`N_wind_conditions`,)
+    N_chunk : int, optional
+        the number of wind conditions evaluated at once, by default 256
+    *args, **kwargs
+        the turbine and wake model parameters, see
+        `_calculate_gaussian_wake_performance_chunk`
+
+    Returns
+    -------
+    jnp.ndarray
+        the AEP of the farm in W*h
+    """
+
+    N_chunk = min(N_chunk, len(directions))
+
+    @jax.checkpoint
+    def accumulate_chunk(AEP, chunk):
+        pmf_chunk, *conditions = chunk
+        power_turbines, _ = _calculate_gaussian_wake_performance_chunk(
+            x_turbines, y_turbines, yaw_turbines, *conditions, *args, **kwargs
+        )
+        return AEP + 8760.0 * jnp.sum(pmf_chunk * jnp.sum(power_turbines, axis=1)), None
+
+    # padded conditions have no probability, so they add nothing to the AEP
+    (pmf_chunks,) = _split_conditions(N_chunk, pmf, value_pad=0.0)
+    AEP, _ = jax.lax.scan(
+        accumulate_chunk,
+        jnp.zeros(()),
+        (pmf_chunks, *_split_conditions(N_chunk, directions, speeds, TIs)),
+    )
+    return AEP
+
+
+calculate_gaussian_wake_AEP = jax.jit(
+    calculate_gaussian_wake_AEP,
+    static_argnames=[
+        "wake_expansion",
+        "deficit_combination",
+        "N_iterations",
+        "N_chunk",
+    ],
+)
+calculate_gaussian_wake_AEP_grad = jax.jit(
+    jax.value_and_grad(calculate_gaussian_wake_AEP, argnums=[0, 1, 2]),
+    static_argnames=[
+        "wake_expansion",
+        "deficit_combination",
+        "N_iterations",
+        "N_chunk",
+    ],
+)
+
+
+class GaussianWakeAEP(templates.FarmAEPTemplate):
+    """
+    Component class for computing an AEP analysis with a JAX Gaussian wake.
+
+    A component class that evaluates the farm power and associated
+    quantities with an analytic Gaussian wake model written in JAX (see
+    `calculate_gaussian_wake_performance`) over the same wind resource as
+    `FLORISAEP`, with the turbine power and thrust curves read from the
+    windIO turbine via `create_FLORIS_turbine_from_windIO`. Inherits the
+    interface from `templates.FarmAEPTemplate`.
+
+    The partials of `AEP_farm` w.r.t. the turbine locations and yaw angles
+    are exact, and are computed in a single reverse-mode pass, i.e. at about
+    the cost of one extra evaluation rather than one per input. The other
+    outputs are post-processing quantities and have no partials declared.
+
+    The `gaussian_wake` block of the modeling options can set the
+    `deficit_combination` ("sos", the default, or "linear"), a fixed
+    `wake_expansion` rate (by default set from the turbulence intensity),
+    the number of `N_iterations` over the waked velocities (by default 3),
+    and the number of wind conditions `N_chunk` evaluated at once (by
+    default 256), which bounds the memory of the evaluation and its gradient
+    on long time series. The model does not include peak shaving.
+
+    Options
+    -------
+    modeling_options : dict
+        a modeling options dictionary (inherited via
+        `templates.FarmAEPTemplate`)
+    data_path : str
+        absolute path to data directory (inherited from
+        `templates.FarmAEPTemplate`)
+
+    Inputs
+    ------
+    x_turbines : np.ndarray
+        a 1D numpy array indicating the x-dimension locations of the turbines,
+        with length `N_turbines` (inherited via `templates.FarmAEPTemplate`)
+    y_turbines : np.ndarray
+        a 1D numpy array indicating the y-dimension locations of the turbines,
+        with length `N_turbines` (inherited via `templates.FarmAEPTemplate`)
+    yaw_turbines : np.ndarray
+        a numpy array indicating the yaw angle to drive each turbine to with
+        respect to the ambient wind direction, with length `N_turbines`
+        (inherited via `templates.FarmAEPTemplate`)
+
+    Outputs
+    -------
+    AEP_farm : float
+        the AEP of the farm given by the analysis (inherited from
+        `templates.FarmAEPTemplate`)
+    power_farm : np.ndarray
+        an array of the farm power for each of the wind conditions that have
+        been queried (inherited from `templates.FarmAEPTemplate`)
+    power_turbines : np.ndarray
+        an array of the farm power for each of the turbines in the farm across
+        all of the conditions that have been queried on the wind rose
+        (`N_turbines`, `N_wind_conditions`) (inherited from
+        `templates.FarmAEPTemplate`)
+    thrust_turbines : np.ndarray
+        an array of the wind turbine thrust for each of the turbines in the farm
+        across all of the conditions that have been queried on the wind rose
+        (`N_turbines`, `N_wind_conditions`) (inherited from
+        `templates.FarmAEPTemplate`)
+    """
+
+    def initialize(self):
+        super().initialize()  # run super class script first!
+
+    def setup(self):
+        super().setup()  # run super class script first!
+
+        # unpack the turbine curves, in the same way as FLORIS
+        turbine = create_FLORIS_turbine_from_windIO(self.windIO, self.modeling_options)
+        table = turbine["power_thrust_table"]
+        self.turbine_arrays = (
+            np.array(table["wind_speed"], dtype=float),
+            np.array(table["power"], dtype=float) * 1.0e3,  # kW to W
+            np.array(table["thrust_coefficient"], dtype=float),
+        )
+        self.turbine_parameters = {
+            "rotor_diameter": float(turbine["rotor_diameter"]),
+            "air_density": float(table["ref_air_density"]),
+            "cosine_loss_exponent_yaw": float(table["cosine_loss_exponent_yaw"]),
+        }
+
+        # the resource is given at the reference height, shear it to the hub
+        wind_resource = self.windIO["site"]["energy_resource"]["wind_resource"]
+        factor_shear = 1.0
+        if wind_resource.get("shear") and wind_resource.get("reference_height"):
+            factor_shear = (
+                turbine["hub_height"] / wind_resource["reference_height"]
+            ) ** wind_resource["shear"]
+        # a wind rose gives its directions and speeds as the axes of its table
+        directions = getattr(self.wind_query, "wd_flat", self.directions_wind)
+        speeds = getattr(self.wind_query, "ws_flat", self.speeds_wind)
+        self.wind_arrays = (
+            np.array(directions, dtype=float),
+            factor_shear * np.array(speeds, dtype=float),
+            np.array(self.TIs_wind, dtype=float),
+        )
+        self.pmf_array = np.array(self.pmf_wind, dtype=float)
+
+        # set up the wake model
+        options_wake = self.modeling_options.get("gaussian_wake", {})
+        self.wake_parameters = {
+            "wake_expansion": options_wake.get("wake_expansion"),
+            "deficit_combination": options_wake.get("deficit_combination", "sos"),
+            "N_iterations": int(options_wake.get("N_iterations", 3)),
+            "N_chunk": int(options_wake.get("N_chunk", 256)),
+        }
+        if self.wake_parameters["deficit_combination"] not in _deficit_combinations:
+            raise ValueError(
+                "Unknown deficit combination: "
+                f"{self.wake_parameters['deficit_combination']}. "
+                f"Must be one of {_deficit_combinations}."
+            )
+
+        # compile the JAX kernels ahead of time if requested
+        if ard.utils.compilation.configure_jax_compilation(self.modeling_options):
+            x_example = np.zeros(self.N_turbines)
+            ard.utils.compilation.warm_up_kernel(
+                f"{self.pathname}: gaussian wake performance",
+                calculate_gaussian_wake_performance,
+                x_example,
+                x_example,
+                x_example,
+                *self.wind_arrays,
+                *self.turbine_arrays,
+                **self.turbine_parameters,
+                **self.wake_parameters,
+            )
+            ard.utils.compilation.warm_up_kernel(
+                f"{self.pathname}: gaussian wake AEP gradient",
+                calculate_gaussian_wake_AEP_grad,
+                x_example,
+                x_example,
+                x_example,
+                self.pmf_array,
+                *self.wind_arrays,
+                *self.turbine_arrays,
+                **self.turbine_parameters,
+                **self.wake_parameters,
+            )
+
+    def setup_partials(self):
+        """Derivative setup for OM component."""
+        self.declare_partials(
+            "AEP_farm",
+            ["x_turbines", "y_turbines", "yaw_turbines"],
+            method="exact",
+        )
+
+    def compute(self, inputs, outputs):
+
+        power_turbines, thrust_turbines = calculate_gaussian_wake_performance(
+            inputs["x_turbines"],
+            inputs["y_turbines"],
+            inputs["yaw_turbines"],
+            *self.wind_arrays,
+            *self.turbine_arrays,
+            **self.turbine_parameters,
+            **self.wake_parameters,
+        )
+        power_turbines = np.array(power_turbines)
+
+        outputs["AEP_farm"] = 8760.0 * np.sum(
+            self.pmf_array * np.sum(power_turbines, axis=1)
+        )
+        outputs["power_farm"] = np.sum(power_turbines, axis=1)
+        if self.modeling_options.get("aero", {}).get("return_turbine_output"):
+            outputs["power_turbines"] = power_turbines.T
+            outputs["thrust_turbines"] = np.array(thrust_turbines).T
+
+    def compute_partials(self, inputs, partials):
+
+        _, (dAEP_dx, dAEP_dy, dAEP_dyaw) = calculate_gaussian_wake_AEP_grad(
+            inputs["x_turbines"],
+            inputs["y_turbines"],
+            inputs["yaw_turbines"],
+            self.pmf_array,
+            *self.wind_arrays,
+            *self.turbine_arrays,
+            **self.turbine_parameters,
+            **self.wake_parameters,
+        )
+
+        partials["AEP_farm", "x_turbines"] = np.array(dAEP_dx)
+        partials["AEP_farm", "y_turbines"] = np.array(dAEP_dy)
+        partials["AEP_farm", "yaw_turbines"] = np.array(dAEP_dyaw)
@@ -0,0 +1,284 @@
+import numpy as np
+import openmdao.api as om
+
+
+def compute_AEP_scenarios(
+    power_farm: np.ndarray,
+    weights: np.ndarray,
+) -> np.ndarray:
+    """
+    Compute the AEP of a farm under a batch of alternative wind resources.
+
+    For a fixed layout, the AEP is a probability-weighted sum of the farm
+    power at each wind condition, so the AEP of every scenario, e.g. the
+    probability tables of alternative wind roses or the weightings of the
+    samples of a time series, is a single matrix-vector product with the
+    per-condition farm powers.
+
+    Parameters
+    ----------
+    power_farm : np.ndarray
+        the farm power at each wind condition in W, (`N_wind_conditions`,),
+        e.g. the (flattened) `power_farm` output of a farm aero component;
+        conditions that were not evaluated are NaN
+    weights : np.ndarray
+        the weight of each wind condition in each scenario,
+        (`N_scenarios`, `N_wind_conditions`), normalized to a probability by
+        scenario
+
+    Returns
+    -------
+    np.ndarray
+        the AEP of each scenario in W*h, (`N_scenarios`,)
+
+    Raises
+    ------
+    ValueError
+        if a scenario weights a wind condition that was not evaluated
+    """
+
+    power_farm = np.asarray(power_farm, dtype=float).reshape(-1)
+    weights = np.atleast_2d(np.asarray(weights, dtype=float))
+    if weights.shape[1] != power_farm.size:
+        raise ValueError(
+            f"The scenario weights have {weights.shape[1]} wind conditions, but "
+            f"the farm power has {power_farm.size}."
+        )
+
+    mask_evaluated = np.isfinite(power_farm)
+    if np.any(weights[:, ~mask_evaluated] != 0.0):
+        raise ValueError(
+            "A scenario weights wind conditions that were not evaluated, e.g. "
+            "zero-frequency bins of the wind rose; evaluate the farm on a wind "
+            "resource that covers all of the scenarios."
+        )
+
+    pmf = weights / np.sum(weights, axis=1, keepdims=True)
+    return 8760.0 * (pmf[:, mask_evaluated] @ power_farm[mask_evaluated])
+
+
+def get_group_weights(
+    groups: np.ndarray,
+    weights: np.ndarray = None,
+) -> np.ndarray:
+    """
+    Get the scenario weights of each group of wind conditions on its own.
+
+    E.g. with the year of each sample of a multi-year time series as the
+    groups, each scenario is one year of the time series, for the
+    inter-annual variability of the AEP with `compute_AEP_scenarios`.
+
+    Parameters
+    ----------
+    groups : np.ndarray
+        a label of the group of each wind condition, (`N_wind_conditions`,)
+    weights : np.ndarray, optional
+        the weight of each wind condition, (`N_wind_conditions`,), by default
+        uniform
+
+    Returns
+    -------
+    np.ndarray
+        the weights of the scenario of each group, in the sorted order of the
+        group labels, (`N_groups`, `N_wind_conditions`)
+    """
+
+    groups = np.asarray(groups).reshape(-1)
+    if weights is None:
+        weights = np.ones(groups.size)
+    labels = np.unique(groups)
+    return (groups[None, :] == labels[:, None]) * np.asarray(weights, dtype=float)
+
+
+def bootstrap_AEP(
+    power_farm: np.ndarray,
+    weights: np.ndarray = None,
+    groups: np.ndarray = None,
+    N_samples: int = 1000,
+    seed: int = 0,
+) -> np.ndarray:
+    """
+    Draw bootstrap samples of the AEP of a farm from its wind conditions.
+
+    The wind conditions are resampled with replacement in groups, e.g. the
+    years of a multi-year time series for inter-annual variability, or each
+    condition on its own by default. Every sample is a multinomial draw of
+    the group counts, so that all of the samples are evaluated together as a
+    matrix product of the counts with the energy and weight of each group.
+
+    Parameters
+    ----------
+    power_farm : np.ndarray
+        the farm power at each wind condition in W, (`N_wind_conditions`,)
+    weights : np.ndarray, optional
+        the weight of each wind condition, (`N_wind_conditions`,), by default
+        uniform, e.g. for the samples of a time series
+    groups : np.ndarray, optional
+        a label of the group of each wind condition that is resampled as a
+        block, (`N_wind_conditions`,), by default each condition on its own
+    N_samples : int, optional
+        the number of bootstrap samples, by default 1000
+    seed : int, optional
+        the seed of the random number generator, by default 0
+
+    Returns
+    -------
+    np.ndarray
+        the AEP of each bootstrap sample in W*h, (`N_samples`,)
+    """
+
+    power_farm = np.asarray(power_farm, dtype=float).reshape(-1)
+    if weights is None:
+        weights = np.ones_like(power_farm)
+    weights = np.asarray(weights, dtype=float).reshape(-1)
+    if groups is None:
+        groups = np.arange(power_farm.size)
+
+    # the energy and weight of each group, excluding unevaluated conditions
+    _, idx_groups = np.unique(np.asarray(groups).reshape(-1), return_inverse=True)
+    N_groups = np.max(idx_groups) + 1
+    mask_evaluated = np.isfinite(power_farm) & (weights != 0.0)
+    energy_groups = np.bincount(
+        idx_groups[mask_evaluated],
+        weights=weights[mask_evaluated] * power_farm[mask_evaluated],
+        minlength=N_groups,
+    )
+    weight_groups = np.bincount(
+        idx_groups[mask_evaluated],
+        weights=weights[mask_evaluated],
+        minlength=N_groups,
+    )
+
+    rng = np.random.default_rng(seed)
+    counts = rng.multinomial(N_groups, np.full(N_groups, 1.0 / N_groups), N_samples)
+    return 8760.0 * (counts @ energy_groups) / (counts @ weight_groups)
+
+
+def get_exceedance_AEP(
+    AEP_samples: np.ndarray,
+    levels=(50, 90),
+) -> dict:
+    """
+    Get the AEP exceedance levels (e.g. P50 and P90) of a set of AEP samples.
+
+    Parameters
+    ----------
+    AEP_samples : np.ndarray
+        samples of the AEP, e.g. from `bootstrap_AEP`
+    levels : iterable of float, optional
+        the exceedance probabilities in percent, by default (50, 90)
+
+    Returns
+    -------
+    dict
+        the AEP that is exceeded with each probability, keyed `P<level>`
+    """
+
+    return {
+        f"P{level:g}": np.percentile(AEP_samples, 100.0 - level) for level in levels
+    }
+
+
+class AEPScenarios(om.ExplicitComponent):
+    """
+    Component class for the AEP of a farm under alternative wind resources.
+
+    Takes the per-condition farm power of a farm aero component (e.g.
+    `FLORISAEP` or `FLORISBatchPower`) and evaluates the AEP for a batch of
+    alternative scenarios, i.e. probability tables or time series weightings
+    on the same wind conditions, with `compute_AEP_scenarios`, and the
+    exceedance levels of a bootstrap of the wind conditions with
+    `bootstrap_AEP`, without re-running the farm aero model.
+
+    The `scenarios` block of the `aero` modeling options sets the `weights`
+    (`N_scenarios`, `N_wind_conditions`) of the scenarios, and can set a
+    `bootstrap` block with the `weights` and `groups` of the conditions, the
+    `N_samples`, the `seed`, and the exceedance `levels` (by default P50 and
+    P90).
+
+    Options
+    -------
+    modeling_options : dict
+        a modeling options dictionary
+
+    Inputs
+    ------
+    power_farm : np.ndarray
+        the farm power at each wind condition, (`N_wind_conditions`,)
+
+    Outputs
+    -------
+    AEP_scenarios : np.ndarray
+        the AEP of each scenario, (`N_scenarios`,)
+    AEP_P<level> : float
+        the AEP exceeded with probability <level> percent over the bootstrap
+        samples, for each exceedance level if `bootstrap` is set
+    """
+
+    def initialize(self):
+        """Initialization of OM component."""
+        self.options.declare("modeling_options")
+
+    def setup(self):
+        """Setup of OM component."""
+
+        # load modeling options
+        self.modeling_options = self.options["modeling_options"]
+        options_scenarios = self.modeling_options["aero"]["scenarios"]
+        self.weights_scenarios = np.atleast_2d(
+            np.asarray(options_scenarios["weights"], dtype=float)
+        )
+        self.N_scenarios, self.N_wind_conditions = self.weights_scenarios.shape
+        self.options_bootstrap = options_scenarios.get("bootstrap")
+
+        self.add_input(
+            "power_farm",
+            np.zeros((self.N_wind_conditions,)),
+            units="W",
+        )
+        self.add_output(
+            "AEP_scenarios",
+            np.zeros((self.N_scenarios,)),
+            units="W*h",
+        )
+        if self.options_bootstrap is not None:
+            self.levels_bootstrap = self.options_bootstrap.get("levels", [50, 90])
+            for level in self.levels_bootstrap:
+                self.add_output(f"AEP_P{level:g}", 0.0, units="W*h")
+
+    def setup_partials(self):
+        """Derivative setup for OM component."""
+        # the scenario AEPs are linear in the farm power
+        self.declare_partials("AEP_scenarios", "power_farm", method="exact")
+        if self.options_bootstrap is not None:
+            self.declare_partials("AEP_P*", "power_farm", method="fd")
+
+    def compute(self, inputs, outputs):
+        """Computation for the OM component."""
+
+        outputs["AEP_scenarios"] = compute_AEP_scenarios(
+            inputs["power_farm"], self.weights_scenarios
+        )
+
+        if self.options_bootstrap is not None:
+            AEP_samples = bootstrap_AEP(
+                inputs["power_farm"],
+                weights=self.options_bootstrap.get("weights"),
+                groups=self.options_bootstrap.get("groups"),
+                N_samples=self.options_bootstrap.get("N_samples", 1000),
+                seed=self.options_bootstrap.get("seed", 0),
+            )
+            for name, value in get_exceedance_AEP(
+                AEP_samples, self.levels_bootstrap
+            ).items():
+                outputs[f"AEP_{name}"] = value
+
+    def compute_partials(self, inputs, partials):
+        """Derivative computation for the OM component."""
+
+        pmf = self.weights_scenarios / np.sum(
+            self.weights_scenarios, axis=1, keepdims=True
+        )
+        partials["AEP_scenarios", "power_farm"] = 8760.0 * np.where(
+            np.isfinite(inputs["power_farm"]), pmf, 0.0
+        )
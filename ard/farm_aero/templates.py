@@ -137,23 +137,26 @@ def create_windresource_from_windIO(
                 "only time-series was found."
             )
 
-        wind_directions = np.array(
+        # arrays loaded from data files (e.g. memory-mapped) are kept as-is
+        wind_directions = np.asarray(
             wind_resource["wind_direction"].get("data", wind_resource["wind_direction"])
             if type(wind_resource["wind_direction"]) is dict
             else wind_resource["wind_direction"]
         )
-        wind_speeds = np.array(
+        wind_speeds = np.asarray(
             wind_resource["wind_speed"].get("data", wind_resource["wind_speed"])
             if type(wind_resource["wind_speed"]) is dict
             else wind_resource["wind_speed"]
         )
         if "turbulence_intensity" in wind_resource:
-            if "data" in wind_resource["turbulence_intensity"]:
-                turbulence_intensities = np.array(
+            if type(wind_resource["turbulence_intensity"]) is dict:
+                turbulence_intensities = np.asarray(
                     wind_resource["turbulence_intensity"]["data"]
                 )
             else:
-                turbulence_intensities = np.array(wind_resource["turbulence_intensity"])
+                turbulence_intensities = np.asarray(
+                    wind_resource["turbulence_intensity"]
+                )
         else:
             raise KeyError(
                 "Missing 'turbulence_intensity' in time-series wind resource."
@@ -182,6 +185,493 @@ def create_windresource_from_windIO(
         )
 
 
+def get_power_curve_from_windIO(
+    windIOturbine: dict,
+    air_density: float = 1.225,
+):
+    """
+    takes a windIO turbine specification and gets its power curve
+
+    Parameters
+    ----------
+    windIOturbine : dict
+        a windIO turbine specification, i.e. the `wind_farm`/`turbine` entry of
+        a windIO plant specification
+    air_density : float, optional
+        the air density to convert a power coefficient curve to power with, by
+        default 1.225
+
+    Returns
+    -------
+    np.ndarray
+        the wind speeds of the power curve, in m/s
+    np.ndarray
+        the power at each of the wind speeds, in W
+
+    Raises
+    ------
+    IndexError
+        if no power curve can be found in the windIO turbine specification
+    """
+
+    performance = windIOturbine["performance"]
+
+    if "Cp_curve" in performance:
+        wind_speeds = np.array(performance["Cp_curve"]["Cp_wind_speeds"])
+        area_rotor = np.pi * windIOturbine["rotor_diameter"] ** 2 / 4
+        power = (
+            0.5
+            * air_density
+            * area_rotor
+            * wind_speeds**3
+            * np.array(performance["Cp_curve"]["Cp_values"])
+        )
+    elif "power_curve" in performance:
+        wind_speeds = np.array(performance["power_curve"]["power_wind_speeds"])
+        power = np.array(performance["power_curve"]["power_values"])
+    elif all(
+        val in performance
+        for val in [
+            "rated_power",
+            "rated_wind_speed",
+            "cutin_wind_speed",
+            "cutout_wind_speed",
+        ]
+    ):
+        # synthetic power curve, as in the FLORIS turbine creation
+        wind_speeds = np.array(performance["Ct_curve"]["Ct_wind_speeds"])
+        power = (
+            wind_speeds**3
+            / performance["rated_wind_speed"] ** 3
+            * performance["rated_power"]
+        )
+        power[wind_speeds >= performance["rated_wind_speed"]] = performance[
+            "rated_power"
+        ]
+        power[wind_speeds <= performance["cutin_wind_speed"]] = 0.0
+        power[wind_speeds >= performance["cutout_wind_speed"]] = 0.0
+    else:
+        raise IndexError(
+            "The windIO file appears to be invalid. Try validating and re-running."
+        )
+
+    # a rated power, if given, caps the (e.g. Cp-derived) power curve
+    if "rated_power" in performance:
+        power = np.minimum(power, performance["rated_power"])
+
+    return wind_speeds, power
+
+
+def compress_wind_rose(
+    wind_rose: floris.WindRose,
+    wind_speeds_power_curve: np.ndarray,
+    power_curve: np.ndarray,
+    AEP_tolerance: float = 1.0e-3,
+    probability_threshold: float = 0.0,
+    velocity_deficits=(0.0, 0.15, 0.3),
+):
+    """
+    compress a wind rose into fewer weighted conditions to an AEP tolerance
+
+    The compression first merges all of the bins below the cut-in speed, which
+    produce no power, into a single condition. The remaining speed bins are
+    split into contiguous groups, each represented by its probability-weighted
+    mean speed (a one-point quadrature over the group), and the groups are
+    refined until the estimated AEP error meets the tolerance. Finally, any
+    (direction, speed group) cell with a probability below the threshold is
+    merged into the nearest retained speed group in the same direction.
+
+    The AEP error is estimated without a wake model, as the worst error of the
+    power curve energy over a set of velocity deficits, so that the speeds seen
+    by waked turbines are also accounted for; the error of the compressed rose
+    against the full rose for a real farm should be verified with the wake
+    model.
+
+    Parameters
+    ----------
+    wind_rose : floris.WindRose
+        the full wind rose to compress
+    wind_speeds_power_curve : np.ndarray
+        the wind speeds of the turbine power curve, in m/s
+    power_curve : np.ndarray
+        the turbine power at each of the power curve wind speeds
+    AEP_tolerance : float, optional
+        the relative AEP error the compression is allowed, by default 1.0e-3
+    probability_threshold : float, optional
+        the probability below which (direction, speed group) cells are merged
+        into a neighboring cell, by default 0.0
+    velocity_deficits : tuple, optional
+        the fractional velocity deficits at which the power curve energy is
+        checked to estimate the AEP error, by default (0.0, 0.15, 0.3)
+
+    Returns
+    -------
+    floris.TimeSeries
+        the compressed wind resource, as a set of conditions with their
+        probabilities stashed in a `freq` attribute
+    dict
+        a summary of the compression, with the estimated relative `AEP_error`,
+        the number of nonzero-probability conditions in the full rose
+        `N_conditions_full`, and in the compressed resource `N_conditions`
+    """
+
+    wind_directions = np.array(wind_rose.wind_directions)
+    wind_speeds = np.array(wind_rose.wind_speeds)
+    freq_table = np.array(wind_rose.freq_table)
+    ti_table = np.array(wind_rose.ti_table)
+
+    def power_free(speed):
+        return np.interp(speed, wind_speeds_power_curve, power_curve, left=0.0)
+
+    def power_proxy(speed):
+        # the power at each velocity deficit, shaped (deficits, speeds)
+        return np.array(
+            [
+                power_free(np.atleast_1d(speed) * (1.0 - deficit))
+                for deficit in velocity_deficits
+            ]
+        )
+
+    # the bins below cut-in make no power, even without wakes
+    speed_peak_power = wind_speeds_power_curve[np.argmax(power_curve)]
+    mask_below_cutin = (power_free(wind_speeds) <= 0.0) & (
+        wind_speeds < speed_peak_power
+    )
+    idx_live = np.flatnonzero(~mask_below_cutin)
+
+    # the proxy AEP of the full rose, at each velocity deficit
+    energy_bins = (
+        freq_table[np.newaxis, :, :] * power_proxy(wind_speeds)[:, np.newaxis, :]
+    )
+    energy_full = np.sum(energy_bins, axis=(1, 2))
+    mask_energy = energy_full > 0.0
+
+    def collapse(idx_group):
+        # one-point quadrature: the probability-weighted mean speed
+        freq_group = freq_table[:, idx_group]
+        if np.sum(freq_group) > 0.0:
+            speed = np.sum(freq_group * wind_speeds[idx_group]) / np.sum(freq_group)
+        else:
+            speed = np.mean(wind_speeds[idx_group])
+        freq = np.sum(freq_group, axis=1)
+        ti = np.where(
+            freq > 0.0,
+            np.sum(freq_group * ti_table[:, idx_group], axis=1)
+            / np.where(freq > 0.0, freq, 1.0),
+            np.mean(ti_table[:, idx_group], axis=1),
+        )
+        return speed, freq, ti
+
+    def build(groups):
+        # collapse each speed group, then merge any low-probability cells
+        if not groups:
+            return np.zeros(0), *2 * [np.zeros((len(wind_directions), 0))]
+        collapsed = [collapse(idx_live[start:end]) for start, end in groups]
+        speeds = np.array([speed for speed, _, _ in collapsed])
+        freq = np.array([f for _, f, _ in collapsed]).T
+        ti = np.array([t for _, _, t in collapsed]).T
+        for idx_direction in range(len(wind_directions)):
+            mask_kept = (freq[idx_direction] > 0.0) & (
+                freq[idx_direction] >= probability_threshold
+            )
+            if not np.any(mask_kept):
+                mask_kept[np.argmax(freq[idx_direction])] = True
+            idx_kept = np.flatnonzero(mask_kept)
+            for idx_group in np.flatnonzero(~mask_kept):
+                idx_target = idx_kept[np.argmin(np.abs(idx_kept - idx_group))]
+                freq[idx_direction, idx_target] += freq[idx_direction, idx_group]
+                freq[idx_direction, idx_group] = 0.0
+        return speeds, freq, ti
+
+    def error_relative(energy_difference):
+        # the worst relative error over the velocity deficits
+        if not np.any(mask_energy):
+            return 0.0
+        return np.max(np.abs(energy_difference[mask_energy]) / energy_full[mask_energy])
+
+    def error_AEP(speeds, freq):
+        energy = np.sum(
+            freq[np.newaxis, :, :] * power_proxy(speeds)[:, np.newaxis, :],
+            axis=(1, 2),
+        )
+        return error_relative(energy - energy_full)
+
+    def error_group(start, end):
+        # the proxy energy error of collapsing a group, ignoring merges
+        if end - start < 2:
+            return -1.0  # a single bin can't be refined
+        speed, freq, _ = collapse(idx_live[start:end])
+        energy_group = np.sum(energy_bins[:, :, idx_live[start:end]], axis=(1, 2))
+        return error_relative(energy_group - np.sum(freq) * power_proxy(speed)[:, 0])
+
+    # adaptively refine the speed groups until the tolerance is met
+    groups = [(0, len(idx_live))] if len(idx_live) else []
+    speeds, freq, ti = build(groups)
+    while groups and error_AEP(speeds, freq) > AEP_tolerance:
+        errors_group = [error_group(start, end) for start, end in groups]
+        if np.max(errors_group) <= 0.0:
+            break  # no refinement left that can reduce the error
+        idx_split = int(np.argmax(errors_group))
+        start, end = groups[idx_split]
+        groups[idx_split : idx_split + 1] = [
+            (start, (start + end) // 2),
+            ((start + end) // 2, end),
+        ]
+        speeds, freq, ti = build(groups)
+
+    # pack the retained cells as conditions, direction-major like a wind rose
+    WD, WS = np.meshgrid(wind_directions, speeds, indexing="ij")
+    mask_conditions = freq > 0.0
+    directions_conditions = WD[mask_conditions]
+    speeds_conditions = WS[mask_conditions]
+    TIs_conditions = ti[mask_conditions]
+    freq_conditions = freq[mask_conditions]
+
+    # all of the below cut-in probability goes to a single condition
+    freq_below_cutin = np.sum(freq_table[:, mask_below_cutin])
+    if freq_below_cutin > 0.0:
+        speed_below_cutin, _, TI_below_cutin = collapse(
+            np.flatnonzero(mask_below_cutin)
+        )
+        idx_direction = np.argmax(np.sum(freq_table[:, mask_below_cutin], axis=1))
+        directions_conditions = np.append(
+            directions_conditions, wind_directions[idx_direction]
+        )
+        speeds_conditions = np.append(speeds_conditions, speed_below_cutin)
+        TIs_conditions = np.append(TIs_conditions, TI_below_cutin[idx_direction])
+        freq_conditions = np.append(freq_conditions, freq_below_cutin)
+
+    wind_resource_representation = floris.TimeSeries(
+        wind_directions=directions_conditions,
+        wind_speeds=speeds_conditions,
+        turbulence_intensities=TIs_conditions,
+    )
+    # stash the probabilities and metadata for the wind resource
+    wind_resource_representation.freq = freq_conditions
+    wind_resource_representation.reference_height = getattr(
+        wind_rose, "reference_height", None
+    )
+
+    summary = {
+        "AEP_error": error_AEP(speeds, freq),
+        "N_conditions_full": int(np.sum(freq_table > 0.0)),
+        "N_conditions": len(freq_conditions),
+    }
+
+    return wind_resource_representation, summary
+
+
+def _assign_clusters(features, centroids, N_chunk=16384):
+    """get the nearest centroid and squared distance to it, in chunks"""
+    idx_cluster = np.empty(len(features), dtype=int)
+    distance_squared = np.empty(len(features))
+    norm_centroids = np.sum(centroids**2, axis=1)
+    for start in range(0, len(features), N_chunk):
+        chunk = features[start : start + N_chunk]
+        distances = (
+            np.sum(chunk**2, axis=1)[:, np.newaxis]
+            - 2.0 * chunk @ centroids.T
+            + norm_centroids[np.newaxis, :]
+        )
+        idx_cluster[start : start + N_chunk] = np.argmin(distances, axis=1)
+        distance_squared[start : start + N_chunk] = np.maximum(
+            np.min(distances, axis=1), 0.0
+        )
+    return idx_cluster, distance_squared
+
+
+def cluster_time_series(
+    time_series: floris.TimeSeries,
+    N_clusters: int,
+    method: str = "kmeans",
+    N_extreme: int = 0,
+    thrust_coefficient_curve=None,
+    direction_period: float = 360.0,
+    N_iterations: int = 100,
+    seed: int = 0,
+):
+    """
+    reduce a wind time series to a set of weighted representative conditions
+
+    The conditions are clustered by k-means over their wind speed, direction,
+    and turbulence intensity, with the speed and turbulence intensity
+    standardized and the direction embedded on the unit circle. Each cluster is
+    represented by its centroid (method "kmeans") or by the member condition
+    nearest to its centroid (method "kmedoids"), weighted by the fraction of
+    the time series in the cluster.
+
+    Optionally, the `N_extreme` conditions with the highest free-stream rotor
+    thrust are kept as conditions of their own, so that the load cases that
+    drive e.g. a mooring design are not averaged away by the clustering.
+
+    Parameters
+    ----------
+    time_series : floris.TimeSeries
+        the wind time series to reduce
+    N_clusters : int
+        the number of representative conditions to cluster the time series into
+    method : str, optional
+        "kmeans" to represent clusters by their centroids, or "kmedoids" to
+        represent them by their medoids, by default "kmeans"
+    N_extreme : int, optional
+        the number of highest-thrust conditions to keep unclustered, by default
+        0
+    thrust_coefficient_curve : tuple, optional
+        the wind speeds and thrust coefficients of the turbine thrust curve,
+        required if `N_extreme` is nonzero
+    direction_period : float, optional
+        the period of the wind directions, 360.0 for degrees (the default) or
+        2 pi for radians
+    N_iterations : int, optional
+        the maximum number of k-means iterations, by default 100
+    seed : int, optional
+        the seed for the k-means++ initialization, by default 0
+
+    Returns
+    -------
+    floris.TimeSeries
+        the representative conditions, with their probabilities stashed in a
+        `freq` attribute
+    dict
+        a summary of the clustering, with the number of conditions in the time
+        series `N_conditions_full` and in the representation `N_conditions`,
+        and the `inertia` (the mean squared distance in the feature space of
+        each clustered condition to its centroid)
+
+    Raises
+    ------
+    ValueError
+        if the method is unknown, or `N_extreme` is set without a thrust curve
+    """
+
+    if method not in ["kmeans", "kmedoids"]:
+        raise ValueError(f"Unknown time series clustering method: {method}.")
+
+    wind_directions = np.array(time_series.wind_directions)
+    wind_speeds = np.array(time_series.wind_speeds)
+    turbulence_intensities = np.array(time_series.turbulence_intensities)
+    N_conditions_full = len(wind_speeds)
+
+    # split off the extreme-thrust conditions
+    idx_extreme = np.zeros(0, dtype=int)
+    if N_extreme > 0:
+        if thrust_coefficient_curve is None:
+            raise ValueError(
+                "A thrust coefficient curve is needed to keep extreme conditions."
+            )
+        thrust = (
+            np.interp(wind_speeds, *thrust_coefficient_curve, left=0.0, right=0.0)
+            * wind_speeds**2
+        )
+        idx_extreme = np.argsort(thrust)[::-1][:N_extreme]
+    mask_clustered = np.ones(N_conditions_full, dtype=bool)
+    mask_clustered[idx_extreme] = False
+    idx_clustered = np.flatnonzero(mask_clustered)
+
+    # standardized features, with the direction on the unit circle
+    angle = 2.0 * np.pi * wind_directions[idx_clustered] / direction_period
+    features = np.column_stack(
+        [
+            (wind_speeds[idx_clustered] - np.mean(wind_speeds[idx_clustered]))
+            / max(np.std(wind_speeds[idx_clustered]), np.finfo(float).eps),
+            np.cos(angle),
+            np.sin(angle),
+            (
+                turbulence_intensities[idx_clustered]
+                - np.mean(turbulence_intensities[idx_clustered])
+            )
+            / max(np.std(turbulence_intensities[idx_clustered]), np.finfo(float).eps),
+        ]
+    )
+    N_clusters = min(N_clusters, len(idx_clustered))
+
+    # k-means++ initialization
+    rng = np.random.default_rng(seed)
+    centroids = np.empty((N_clusters, features.shape[1]))
+    centroids[0] = features[rng.integers(len(features))]
+    distance_squared = np.sum((features - centroids[0]) ** 2, axis=1)
+    for idx_centroid in range(1, N_clusters):
+        if np.sum(distance_squared) > 0.0:
+            p_choice = distance_squared / np.sum(distance_squared)
+        else:
+            p_choice = None
+        centroids[idx_centroid] = features[rng.choice(len(features), p=p_choice)]
+        distance_squared = np.minimum(
+            distance_squared, np.sum((features - centroids[idx_centroid]) ** 2, axis=1)
+        )
+
+    # Lloyd iterations
+    idx_cluster = None
+    for _ in range(N_iterations):
+        idx_cluster_new, distance_squared = _assign_clusters(features, centroids)
+        if idx_cluster is not None and np.all(idx_cluster_new == idx_cluster):
+            break
+        idx_cluster = idx_cluster_new
+        counts = np.bincount(idx_cluster, minlength=N_clusters)
+        for idx_feature in range(features.shape[1]):
+            sums = np.bincount(
+                idx_cluster, weights=features[:, idx_feature], minlength=N_clusters
+            )
+            centroids[counts > 0, idx_feature] = sums[counts > 0] / counts[counts > 0]
+    idx_cluster, distance_squared = _assign_clusters(features, centroids)
+    counts = np.bincount(idx_cluster, minlength=N_clusters)
+    mask_used = counts > 0
+
+    # the representative condition of each cluster
+    if method == "kmeans":
+        directions_clusters = (
+            np.arctan2(
+                np.bincount(idx_cluster, weights=np.sin(angle), minlength=N_clusters),
+                np.bincount(idx_cluster, weights=np.cos(angle), minlength=N_clusters),
+            )
+            % (2.0 * np.pi)
+            * direction_period
+            / (2.0 * np.pi)
+        )
+        speeds_clusters, TIs_clusters = [
+            np.bincount(
+                idx_cluster, weights=values[idx_clustered], minlength=N_clusters
+            )
+            / np.maximum(counts, 1)
+            for values in [wind_speeds, turbulence_intensities]
+        ]
+    else:
+        idx_medoids = np.zeros(N_clusters, dtype=int)
+        for idx_centroid in np.flatnonzero(mask_used):
+            idx_members = np.flatnonzero(idx_cluster == idx_centroid)
+            idx_medoids[idx_centroid] = idx_clustered[
+                idx_members[np.argmin(distance_squared[idx_members])]
+            ]
+        directions_clusters = wind_directions[idx_medoids]
+        speeds_clusters = wind_speeds[idx_medoids]
+        TIs_clusters = turbulence_intensities[idx_medoids]
+
+    wind_resource_representation = floris.TimeSeries(
+        wind_directions=np.append(
+            directions_clusters[mask_used], wind_directions[idx_extreme]
+        ),
+        wind_speeds=np.append(speeds_clusters[mask_used], wind_speeds[idx_extreme]),
+        turbulence_intensities=np.append(
+            TIs_clusters[mask_used], turbulence_intensities[idx_extreme]
+        ),
+    )
+    # stash the probabilities and metadata for the wind resource
+    wind_resource_representation.freq = (
+        np.append(counts[mask_used], np.ones(len(idx_extreme))) / N_conditions_full
+    )
+    wind_resource_representation.reference_height = getattr(
+        time_series, "reference_height", None
+    )
+
+    summary = {
+        "N_conditions_full": N_conditions_full,
+        "N_conditions": len(wind_resource_representation.freq),
+        "inertia": float(np.mean(distance_squared)),
+    }
+
+    return wind_resource_representation, summary
+
+
 class FarmAeroTemplate(om.ExplicitComponent):
     """
     Template component for using a farm aerodynamics model.
@@ -233,6 +723,36 @@ class FarmAeroTemplate(om.ExplicitComponent):
             units="deg",
         )
 
+    def cluster_wind_time_series(self, time_series, direction_period=360.0):
+        """
+        Cluster a wind time series as set in the `time_series_clustering` block.
+
+        The block of the `aero` modeling options sets the `N_clusters`, and can
+        set the `method`, the number of extreme-thrust conditions to keep
+        `N_extreme`, and the `seed` for `cluster_time_series`.
+        """
+
+        options_clustering = self.modeling_options["aero"]["time_series_clustering"]
+        performance = self.windIO["wind_farm"]["turbine"].get("performance", {})
+        thrust_coefficient_curve = (
+            (
+                np.array(performance["Ct_curve"]["Ct_wind_speeds"]),
+                np.array(performance["Ct_curve"]["Ct_values"]),
+            )
+            if "Ct_curve" in performance
+            else None
+        )
+
+        return cluster_time_series(
+            time_series,
+            options_clustering["N_clusters"],
+            method=options_clustering.get("method", "kmeans"),
+            N_extreme=options_clustering.get("N_extreme", 0),
+            thrust_coefficient_curve=thrust_coefficient_curve,
+            direction_period=direction_period,
+            seed=options_clustering.get("seed", 0),
+        )
+
     def compute(self, inputs, outputs):
         """
         Computation for the OM component.
@@ -304,9 +824,22 @@ class BatchFarmPowerTemplate(FarmAeroTemplate):
             self.windIO,
             "timeseries",
         )
-        self.directions_wind = self.wind_query.wind_directions.tolist()
-        self.speeds_wind = self.wind_query.wind_speeds.tolist()
-        self.TIs_wind = self.wind_query.turbulence_intensities.tolist()
+
+        # optionally cluster the time series into weighted representative
+        # conditions; the batch power directions are converted from radians
+        self.wind_time_series_full = self.wind_query
+        self.time_series_clustering = None
+        if self.modeling_options.get("aero", {}).get("time_series_clustering"):
+            self.wind_query, self.time_series_clustering = (
+                self.cluster_wind_time_series(
+                    self.wind_time_series_full,
+                    direction_period=2.0 * np.pi,
+                )
+            )
+
+        self.directions_wind = self.wind_query.wind_directions
+        self.speeds_wind = self.wind_query.wind_speeds
+        self.TIs_wind = self.wind_query.turbulence_intensities
         self.N_wind_conditions = len(self.directions_wind)
 
         # add the outputs we want for a batched power analysis:
@@ -389,6 +922,11 @@ class FarmAEPTemplate(FarmAeroTemplate):
     A farm power component, based on this template, will compute the power and
     thrust for a farm composed of a given rotor type.
 
+    With a `wind_rose_compression` block in the `aero` modeling options, the
+    wind rose is compressed at setup by `compress_wind_rose` to the given
+    `AEP_tolerance` (merging cells below `probability_threshold`), and the
+    conditions and outputs correspond to the compressed resource.
+
     Options
     -------
     modeling_options : dict
@@ -436,18 +974,58 @@ class FarmAEPTemplate(FarmAeroTemplate):
         super().setup()
         data_path = str(self.options["data_path"])
 
+        # a time series resource is clustered into weighted conditions
+        options_aero = self.modeling_options.get("aero", {})
         self.wind_query = create_windresource_from_windIO(
             self.windIO,
-            "probability",
+            (
+                "timeseries"
+                if options_aero.get("time_series_clustering")
+                else "probability"
+            ),
         )
+        # the full wind resource is kept, e.g. to verify a reduced resource
+        self.wind_rose_full = self.wind_query
+        self.wind_time_series_full = None
+        self.time_series_clustering = None
+        if options_aero.get("time_series_clustering"):
+            self.wind_time_series_full = self.wind_query
+            self.wind_query, self.time_series_clustering = (
+                self.cluster_wind_time_series(self.wind_time_series_full)
+            )
 
         if data_path is None:
             data_path = ""
 
-        self.directions_wind = self.wind_query.wind_directions
-        self.speeds_wind = self.wind_query.wind_speeds
-        self.TIs_wind = self.wind_query.ti_table_flat
-        self.pmf_wind = self.wind_query.freq_table_flat
+        # optionally compress the wind rose into fewer weighted conditions
+        self.wind_rose_compression = None
+        options_compression = self.modeling_options.get("aero", {}).get(
+            "wind_rose_compression"
+        )
+        if self.time_series_clustering is not None:
+            self.directions_wind = self.wind_query.wind_directions
+            self.speeds_wind = self.wind_query.wind_speeds
+            self.TIs_wind = self.wind_query.turbulence_intensities
+            self.pmf_wind = self.wind_query.freq
+        elif options_compression is not None:
+            self.wind_query, self.wind_rose_compression = compress_wind_rose(
+                self.wind_rose_full,
+                *get_power_curve_from_windIO(self.windIO["wind_farm"]["turbine"]),
+                AEP_tolerance=options_compression.get("AEP_tolerance", 1.0e-3),
+                probability_threshold=options_compression.get(
+                    "probability_threshold", 0.0
+                ),
+            )
+
+            self.directions_wind = self.wind_query.wind_directions
+            self.speeds_wind = self.wind_query.wind_speeds
+            self.TIs_wind = self.wind_query.turbulence_intensities
+            self.pmf_wind = self.wind_query.freq
+        else:
+            self.directions_wind = self.wind_query.wind_directions
+            self.speeds_wind = self.wind_query.wind_speeds
+            self.TIs_wind = self.wind_query.ti_table_flat
+            self.pmf_wind = self.wind_query.freq_table_flat
         self.N_wind_conditions = len(self.pmf_wind)
 
         # add the outputs we want for an AEP analysis:
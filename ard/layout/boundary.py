@@ -3,6 +3,7 @@ import jax.numpy as jnp
 import jax
 
 jax.config.update("jax_enable_x64", True)
+import ard.utils.compilation
 import ard.utils.geometry
 import openmdao.api as om
 
@@ -66,10 +67,50 @@ class FarmBoundaryDistancePolygon(om.ExplicitComponent):
             np.zeros(self.N_turbines, dtype=int),  # default to zero for all turbines
         )
 
-        # prep the jacobian
-        self.distance_multi_point_to_multi_polygon_ray_casting_jac = jax.jacfwd(
-            ard.utils.geometry.distance_multi_point_to_multi_polygon_ray_casting, [0, 1]
-        )
+        # select the polygon distance engine: "switch" dispatches to one kernel per
+        # polygon, "padded" packs all polygons into one padded vertex tensor, and
+        # "sdf" interpolates a signed distance field precomputed on a grid
+        boundary_options = self.modeling_options.get("boundary", {})
+        self.polygon_engine = boundary_options.get("polygon_engine", "switch")
+        if self.polygon_engine == "switch":
+            self.distance_kernel = (
+                ard.utils.geometry.distance_multi_point_to_multi_polygon_ray_casting
+            )
+            self.distance_jac_kernel = (
+                ard.utils.geometry.distance_multi_point_to_multi_polygon_ray_casting_diagonal_jac
+            )
+            self.distance_kernel_args = (self.boundary_vertices, self.boundary_regions)
+        elif self.polygon_engine == "padded":
+            self.distance_kernel = (
+                ard.utils.geometry.distance_multi_point_to_multi_polygon_ray_casting_padded
+            )
+            self.distance_jac_kernel = (
+                ard.utils.geometry.distance_multi_point_to_multi_polygon_ray_casting_padded_diagonal_jac
+            )
+            self.distance_kernel_args = (
+                *ard.utils.geometry.pack_polygons(self.boundary_vertices),
+                self.boundary_regions,
+            )
+        elif self.polygon_engine == "sdf":
+            self.distance_kernel = (
+                ard.utils.geometry.distance_multi_point_signed_distance_field
+            )
+            self.distance_jac_kernel = (
+                ard.utils.geometry.distance_multi_point_signed_distance_field_diagonal_jac
+            )
+            self.distance_kernel_args = (
+                *ard.utils.geometry.build_signed_distance_field(
+                    self.boundary_vertices,
+                    N_grid_points=boundary_options.get("sdf_N_grid_points", 200),
+                    margin=boundary_options.get("sdf_margin_m"),
+                ),
+                self.boundary_regions,
+            )
+        else:
+            raise ValueError(
+                f"Unknown polygon_engine '{self.polygon_engine}', "
+                "expected 'switch', 'padded', or 'sdf'."
+            )
 
         # set up inputs and outputs for mooring system
         self.add_input(
@@ -85,6 +126,24 @@ class FarmBoundaryDistancePolygon(om.ExplicitComponent):
             units="m",
         )
 
+        # compile the JAX kernels ahead of time if requested
+        if ard.utils.compilation.configure_jax_compilation(self.modeling_options):
+            x_example = np.zeros(self.N_turbines)
+            ard.utils.compilation.warm_up_kernel(
+                f"{self.pathname}: boundary distances",
+                self.distance_kernel,
+                x_example,
+                x_example,
+                *self.distance_kernel_args,
+            )
+            ard.utils.compilation.warm_up_kernel(
+                f"{self.pathname}: boundary distances jacobian",
+                self.distance_jac_kernel,
+                x_example,
+                x_example,
+                *self.distance_kernel_args,
+            )
+
     def setup_partials(self):
         """Derivative setup for the OpenMDAO component."""
         # the default (but not preferred!) derivatives are FDM
@@ -103,13 +162,8 @@ class FarmBoundaryDistancePolygon(om.ExplicitComponent):
         x_turbines = inputs["x_turbines"]
         y_turbines = inputs["y_turbines"]
 
-        boundary_distances = (
-            ard.utils.geometry.distance_multi_point_to_multi_polygon_ray_casting(
-                x_turbines,
-                y_turbines,
-                boundary_vertices=self.boundary_vertices,
-                regions=self.boundary_regions,
-            )
+        boundary_distances = self.distance_kernel(
+            x_turbines, y_turbines, *self.distance_kernel_args
         )
 
         outputs["boundary_distances"] = boundary_distances
@@ -120,9 +174,38 @@ class FarmBoundaryDistancePolygon(om.ExplicitComponent):
         x_turbines = inputs["x_turbines"]
         y_turbines = inputs["y_turbines"]
 
-        jacobian = self.distance_multi_point_to_multi_polygon_ray_casting_jac(
-            x_turbines, y_turbines, self.boundary_vertices, self.boundary_regions
+        # each distance depends only on its own turbine, so get the diagonal only
+        jacobian_diagonal = self.distance_jac_kernel(
+            x_turbines, y_turbines, *self.distance_kernel_args
         )
 
-        partials["boundary_distances", "x_turbines"] = jacobian[0].diagonal()
-        partials["boundary_distances", "y_turbines"] = jacobian[1].diagonal()
+        partials["boundary_distances", "x_turbines"] = jacobian_diagonal[0]
+        partials["boundary_distances", "y_turbines"] = jacobian_diagonal[1]
+
+    def compute_exact_distances(self, x_turbines, y_turbines):
+        """
+        Compute the boundary distances with exact ray-casting, regardless of the
+        selected polygon engine, e.g. to re-check a design found with the
+        interpolated signed distance field.
+
+        Parameters
+        ----------
+        x_turbines : np.ndarray
+            the x-dimension locations of the turbines, in meters
+        y_turbines : np.ndarray
+            the y-dimension locations of the turbines, in meters
+
+        Returns
+        -------
+        np.ndarray
+            the boundary distances of the turbines, in meters
+        """
+
+        return np.asarray(
+            ard.utils.geometry.distance_multi_point_to_multi_polygon_ray_casting(
+                jnp.asarray(x_turbines, dtype=float),
+                jnp.asarray(y_turbines, dtype=float),
+                self.boundary_vertices,
+                self.boundary_regions,
+            )
+        )
@@ -3,6 +3,7 @@ import jax.numpy as jnp
 import jax
 
 jax.config.update("jax_enable_x64", True)
+import ard.utils.compilation
 import ard.utils.geometry
 import openmdao.api as om
 
@@ -72,10 +73,53 @@ class FarmExclusionDistancePolygon(om.ExplicitComponent):
             np.zeros(self.N_turbines, dtype=int),  # default to zero for all turbines
         )
 
-        # prep the jacobian
-        self.distance_multi_point_to_multi_polygon_ray_casting_jac = jax.jacfwd(
-            ard.utils.geometry.distance_multi_point_to_multi_polygon_ray_casting, [0, 1]
-        )
+        # select the polygon distance engine: "switch" dispatches to one kernel per
+        # polygon, "padded" packs all polygons into one padded vertex tensor, and
+        # "sdf" interpolates a signed distance field precomputed on a grid
+        exclusions_options = self.modeling_options.get("exclusions", {})
+        self.polygon_engine = exclusions_options.get("polygon_engine", "switch")
+        if self.polygon_engine == "switch":
+            self.distance_kernel = (
+                ard.utils.geometry.distance_multi_point_to_multi_polygon_ray_casting
+            )
+            self.distance_jac_kernel = (
+                ard.utils.geometry.distance_multi_point_to_multi_polygon_ray_casting_diagonal_jac
+            )
+            self.distance_kernel_args = (
+                self.exclusion_vertices,
+                self.exclusion_regions,
+            )
+        elif self.polygon_engine == "padded":
+            self.distance_kernel = (
+                ard.utils.geometry.distance_multi_point_to_multi_polygon_ray_casting_padded
+            )
+            self.distance_jac_kernel = (
+                ard.utils.geometry.distance_multi_point_to_multi_polygon_ray_casting_padded_diagonal_jac
+            )
+            self.distance_kernel_args = (
+                *ard.utils.geometry.pack_polygons(self.exclusion_vertices),
+                self.exclusion_regions,
+            )
+        elif self.polygon_engine == "sdf":
+            self.distance_kernel = (
+                ard.utils.geometry.distance_multi_point_signed_distance_field
+            )
+            self.distance_jac_kernel = (
+                ard.utils.geometry.distance_multi_point_signed_distance_field_diagonal_jac
+            )
+            self.distance_kernel_args = (
+                *ard.utils.geometry.build_signed_distance_field(
+                    self.exclusion_vertices,
+                    N_grid_points=exclusions_options.get("sdf_N_grid_points", 200),
+                    margin=exclusions_options.get("sdf_margin_m"),
+                ),
+                self.exclusion_regions,
+            )
+        else:
+            raise ValueError(
+                f"Unknown polygon_engine '{self.polygon_engine}', "
+                "expected 'switch', 'padded', or 'sdf'."
+            )
 
         # set up inputs and outputs for turbine exclusion distances
         self.add_input(
@@ -91,6 +135,24 @@ class FarmExclusionDistancePolygon(om.ExplicitComponent):
             units="m",
         )
 
+        # compile the JAX kernels ahead of time if requested
+        if ard.utils.compilation.configure_jax_compilation(self.modeling_options):
+            x_example = np.zeros(self.N_turbines)
+            ard.utils.compilation.warm_up_kernel(
+                f"{self.pathname}: exclusion distances",
+                self.distance_kernel,
+                x_example,
+                x_example,
+                *self.distance_kernel_args,
+            )
+            ard.utils.compilation.warm_up_kernel(
+                f"{self.pathname}: exclusion distances jacobian",
+                self.distance_jac_kernel,
+                x_example,
+                x_example,
+                *self.distance_kernel_args,
+            )
+
     def setup_partials(self):
         """Derivative setup for the OpenMDAO component."""
         # override the OpenMDAO default FDM derivatives by declaring exact derivatives
@@ -109,13 +171,8 @@ class FarmExclusionDistancePolygon(om.ExplicitComponent):
         x_turbines = inputs["x_turbines"]
         y_turbines = inputs["y_turbines"]
 
-        exclusion_distances = (
-            ard.utils.geometry.distance_multi_point_to_multi_polygon_ray_casting(
-                x_turbines,
-                y_turbines,
-                boundary_vertices=self.exclusion_vertices,
-                regions=self.exclusion_regions,
-            )
+        exclusion_distances = self.distance_kernel(
+            x_turbines, y_turbines, *self.distance_kernel_args
         )
 
         outputs["exclusion_distances"] = -exclusion_distances
@@ -126,9 +183,38 @@ class FarmExclusionDistancePolygon(om.ExplicitComponent):
         x_turbines = inputs["x_turbines"]
         y_turbines = inputs["y_turbines"]
 
-        jacobian = self.distance_multi_point_to_multi_polygon_ray_casting_jac(
-            x_turbines, y_turbines, self.exclusion_vertices, self.exclusion_regions
+        # each distance depends only on its own turbine, so get the diagonal only
+        jacobian_diagonal = self.distance_jac_kernel(
+            x_turbines, y_turbines, *self.distance_kernel_args
         )
 
-        partials["exclusion_distances", "x_turbines"] = -jacobian[0].diagonal()
-        partials["exclusion_distances", "y_turbines"] = -jacobian[1].diagonal()
+        partials["exclusion_distances", "x_turbines"] = -jacobian_diagonal[0]
+        partials["exclusion_distances", "y_turbines"] = -jacobian_diagonal[1]
+
+    def compute_exact_distances(self, x_turbines, y_turbines):
+        """
+        Compute the exclusion distances with exact ray-casting, regardless of the
+        selected polygon engine, e.g. to re-check a design found with the
+        interpolated signed distance field.
+
+        Parameters
+        ----------
+        x_turbines : np.ndarray
+            the x-dimension locations of the turbines, in meters
+        y_turbines : np.ndarray
+            the y-dimension locations of the turbines, in meters
+
+        Returns
+        -------
+        np.ndarray
+            the exclusion distances of the turbines, in meters
+        """
+
+        return -np.asarray(
+            ard.utils.geometry.distance_multi_point_to_multi_polygon_ray_casting(
+                jnp.asarray(x_turbines, dtype=float),
+                jnp.asarray(y_turbines, dtype=float),
+                self.exclusion_vertices,
+                self.exclusion_regions,
+            )
+        )
@@ -1,6 +1,8 @@
 import numpy as np
+import scipy.spatial
 import jax.numpy as jnp
 import jax
+import ard.utils.compilation
 import ard.utils.mathematics
 import openmdao.api as om
 
@@ -56,10 +58,27 @@ class TurbineSpacing(om.ExplicitComponent):
             units="km",
         )
 
+        # compile the JAX kernels ahead of time if requested
+        if ard.utils.compilation.configure_jax_compilation(self.modeling_options):
+            x_example = np.zeros(self.N_turbines)
+            ard.utils.compilation.warm_up_kernel(
+                f"{self.pathname}: turbine spacing",
+                calculate_turbine_spacing,
+                x_example,
+                x_example,
+            )
+            ard.utils.compilation.warm_up_kernel(
+                f"{self.pathname}: turbine spacing jacobian",
+                calculate_turbine_spacing_sparse_jac,
+                x_example,
+                x_example,
+            )
+
     def setup_partials(self):
         """Derivative setup for the OpenMDAO component."""
-        # the default (but not preferred!) derivatives are FDM
-        self.declare_partials("*", "*", method="exact")
+        # each spacing depends on exactly two turbines, so declare sparse partials
+        rows, cols = get_turbine_spacing_sparsity(self.N_turbines)
+        self.declare_partials("*", "*", method="exact", rows=rows, cols=cols)
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
         """Computation for the OpenMDAO component."""
@@ -78,12 +97,306 @@ class TurbineSpacing(om.ExplicitComponent):
         x_turbines = inputs["x_turbines"]
         y_turbines = inputs["y_turbines"]
 
-        jacobian = calculate_turbine_spacing_jac(x_turbines, y_turbines)
+        jacobian = calculate_turbine_spacing_sparse_jac(x_turbines, y_turbines)
 
         partials["turbine_spacing", "x_turbines"] = jacobian[0]
         partials["turbine_spacing", "y_turbines"] = jacobian[1]
 
 
+class TurbineSpacingNeighbors(om.ExplicitComponent):
+    """
+    A class to return distances between neighboring pairs of turbines without
+    duplicates.
+
+    Rather than returning every pair distance, the pairs are culled to the
+    `N_neighbors` nearest neighbors of each turbine, optionally restricted to
+    pairs closer than a cutoff radius. The neighbor pairs are found with a
+    KD-tree that is rebuilt on every evaluation, and the output is padded to a
+    fixed size so that the OpenMDAO variable sizes stay static. Each spacing
+    depends only on the two turbines in its pair, but the pairs move with the
+    layout, so rather than declaring a static sparsity the component is
+    matrix-free and applies the two nonzeros of each row of its Jacobian.
+
+    Options
+    -------
+    modeling_options : dict
+        a modeling options dictionary (inherited from `FarmAeroTemplate`); the
+        optional `spacing` block can set `N_neighbors` (the number of nearest
+        neighbors to keep per turbine, defaults to 6) and `radius_cutoff_m` (the
+        maximum pair distance to keep in meters, defaults to no cutoff)
+
+    Inputs
+    ------
+    x_turbines : np.ndarray
+        a 1D numpy array indicating the x-dimension locations of the turbines,
+        with length `N_turbines` (mirrored w.r.t. `FarmAeroTemplate`)
+    y_turbines : np.ndarray
+        a 1D numpy array indicating the y-dimension locations of the turbines,
+        with length `N_turbines` (mirrored w.r.t. `FarmAeroTemplate`)
+
+    Outputs
+    -------
+    turbine_spacing : np.ndarray
+        a 1D numpy array indicating the distances between neighboring turbine
+        pairs, sorted from closest to farthest, with length
+        min(N_turbines*N_neighbors, (N_turbines - 1)*N_turbines/2). Unused
+        entries are padded by repeating the farthest retained pair, or with the
+        cutoff radius (with zero derivatives) if no pairs are found.
+    """
+
+    def initialize(self):
+        """Initialization of the OpenMDAO component."""
+        self.options.declare("modeling_options")
+
+    def setup(self):
+        """Setup of the OpenMDAO component."""
+
+        # load modeling options
+        self.modeling_options = self.options["modeling_options"]
+        self.N_turbines = int(self.modeling_options["layout"]["N_turbines"])
+        spacing_options = self.modeling_options.get("spacing", {})
+        self.N_neighbors = min(
+            int(spacing_options.get("N_neighbors", 6)), self.N_turbines - 1
+        )
+        radius_cutoff_m = spacing_options.get("radius_cutoff_m")
+        self.radius_cutoff = (
+            None if radius_cutoff_m is None else radius_cutoff_m / 1.0e3
+        )  # convert to km to match the component units
+        self.N_distances = min(
+            int((self.N_turbines - 1) * self.N_turbines / 2),
+            self.N_turbines * self.N_neighbors,
+        )
+
+        # set up inputs and outputs for turbine spacing
+        self.add_input(
+            "x_turbines", jnp.zeros((self.N_turbines,)), units="km"
+        )  # x location of the turbines in km w.r.t. reference coordinates
+        self.add_input(
+            "y_turbines", jnp.zeros((self.N_turbines,)), units="km"
+        )  # y location of the turbines in km w.r.t. reference coordinates
+
+        self.add_output(
+            "turbine_spacing",
+            jnp.zeros(self.N_distances),
+            units="km",
+        )
+
+        # the neighbor pairs and their Jacobian nonzeros, at the last layout
+        self._layout_jacobian = None
+        self._pairs_jacobian = None
+
+        # compile the JAX kernels ahead of time if requested
+        if ard.utils.compilation.configure_jax_compilation(self.modeling_options):
+            x_example = np.zeros(self.N_turbines)
+            indices_example = np.zeros(self.N_distances, dtype=int)
+            ard.utils.compilation.warm_up_kernel(
+                f"{self.pathname}: neighbor turbine spacing",
+                calculate_turbine_spacing_pairs,
+                x_example,
+                x_example,
+                indices_example,
+                indices_example,
+            )
+            ard.utils.compilation.warm_up_kernel(
+                f"{self.pathname}: neighbor turbine spacing jacobian",
+                calculate_turbine_spacing_pairs_sparse_jac,
+                x_example,
+                x_example,
+                indices_example,
+                indices_example,
+            )
+
+    def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
+        """Computation for the OpenMDAO component."""
+
+        # unpack the working variables
+        x_turbines = inputs["x_turbines"]
+        y_turbines = inputs["y_turbines"]
+
+        i_indices, j_indices, mask_pairs = get_turbine_spacing_neighbor_pairs(
+            x_turbines,
+            y_turbines,
+            N_neighbors=self.N_neighbors,
+            N_pairs_max=self.N_distances,
+            radius_cutoff=self.radius_cutoff,
+        )
+
+        spacing_distances = calculate_turbine_spacing_pairs(
+            x_turbines, y_turbines, i_indices, j_indices
+        )
+
+        # if no pairs are within the cutoff radius, pad with the cutoff radius
+        outputs["turbine_spacing"] = (
+            spacing_distances if np.any(mask_pairs) else self.radius_cutoff
+        )
+
+    def compute_jacvec_product(self, inputs, d_inputs, d_outputs, mode):
+        """Matrix-free Jacobian product for the OpenMDAO component."""
+
+        i_indices, j_indices, jacobians = self._get_pairs_jacobian(inputs)
+
+        # each spacing has nonzeros only for the two turbines in its pair
+        for name_input, jacobian in zip(["x_turbines", "y_turbines"], jacobians):
+            if name_input not in d_inputs:
+                continue
+            if mode == "fwd":
+                d_outputs["turbine_spacing"] += (
+                    jacobian[:, 0] * d_inputs[name_input][i_indices]
+                    + jacobian[:, 1] * d_inputs[name_input][j_indices]
+                )
+            else:
+                d_spacing = d_outputs["turbine_spacing"]
+                d_inputs[name_input] += np.bincount(
+                    i_indices,
+                    weights=jacobian[:, 0] * d_spacing,
+                    minlength=self.N_turbines,
+                ) + np.bincount(
+                    j_indices,
+                    weights=jacobian[:, 1] * d_spacing,
+                    minlength=self.N_turbines,
+                )
+
+    def _get_pairs_jacobian(self, inputs):
+        """Get the neighbor pairs and their Jacobian nonzeros at the layout."""
+
+        # unpack the working variables
+        x_turbines = inputs["x_turbines"]
+        y_turbines = inputs["y_turbines"]
+
+        # the products are applied once per seed, so only find the pairs once
+        layout = np.concatenate([x_turbines, y_turbines])
+        if self._layout_jacobian is not None and np.array_equal(
+            layout, self._layout_jacobian
+        ):
+            return self._pairs_jacobian
+
+        i_indices, j_indices, mask_pairs = get_turbine_spacing_neighbor_pairs(
+            x_turbines,
+            y_turbines,
+            N_neighbors=self.N_neighbors,
+            N_pairs_max=self.N_distances,
+            radius_cutoff=self.radius_cutoff,
+        )
+
+        # the (turbine i, turbine j) nonzeros of each pair, zero if none found
+        jacobians = [
+            np.array(jacobian).reshape(-1, 2) * np.any(mask_pairs)
+            for jacobian in calculate_turbine_spacing_pairs_sparse_jac(
+                x_turbines, y_turbines, i_indices, j_indices
+            )
+        ]
+
+        self._layout_jacobian = layout
+        self._pairs_jacobian = (i_indices, j_indices, jacobians)
+        return self._pairs_jacobian
+
+
+def get_turbine_spacing_neighbor_pairs(
+    x_turbines: np.ndarray,
+    y_turbines: np.ndarray,
+    N_neighbors: int,
+    N_pairs_max: int,
+    radius_cutoff: float = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Find the unique pairs of neighboring turbines using a KD-tree.
+
+    This function is not differentiable and is intended to select the pairs for
+    which spacing distances are computed.
+
+    Args:
+        x_turbines (np.ndarray): a 1D numpy array indicating the x-dimension locations of the turbines,
+            with length `N_turbines`.
+        y_turbines (np.ndarray): a 1D numpy array indicating the y-dimension locations of the turbines,
+            with length `N_turbines`.
+        N_neighbors (int): the number of nearest neighbors to find for each turbine.
+        N_pairs_max (int): the fixed number of pairs to return; if more unique pairs
+            are found, only the closest `N_pairs_max` pairs are kept.
+        radius_cutoff (float, optional): only keep pairs closer than this distance.
+            Defaults to None, for no cutoff.
+
+    Returns:
+        i_indices (np.ndarray): index of the first turbine in each pair, with length `N_pairs_max`.
+        j_indices (np.ndarray): index of the second turbine in each pair, with length `N_pairs_max`.
+        mask_pairs (np.ndarray): boolean mask that is True for the unique pairs that were found
+            and False for padding entries, which repeat the farthest pair found, with length
+            `N_pairs_max`.
+    """
+
+    N_turbines = len(x_turbines)
+    points = np.stack([np.asarray(x_turbines), np.asarray(y_turbines)], axis=1)
+
+    # query the k nearest neighbors (plus the turbine itself) of every turbine
+    tree = scipy.spatial.KDTree(points)
+    distances, neighbors = tree.query(
+        points,
+        k=min(N_neighbors + 1, N_turbines),
+        distance_upper_bound=np.inf if radius_cutoff is None else radius_cutoff,
+    )
+    distances = distances.reshape(N_turbines, -1)
+    neighbors = neighbors.reshape(N_turbines, -1)
+
+    # drop self-pairs and missing neighbors (flagged by KDTree with index N)
+    i_candidates = np.repeat(np.arange(N_turbines), neighbors.shape[1])
+    j_candidates = neighbors.flatten()
+    distance_candidates = distances.flatten()
+    mask_valid = (j_candidates < N_turbines) & (j_candidates != i_candidates)
+
+    # sort each pair so that i < j and remove the duplicates
+    pairs = np.sort(
+        np.stack([i_candidates[mask_valid], j_candidates[mask_valid]], axis=1), axis=1
+    )
+    pairs, idx_unique = np.unique(pairs, axis=0, return_index=True)
+    distance_pairs = distance_candidates[mask_valid][idx_unique]
+
+    # keep the closest pairs that fit in the fixed-size output
+    pairs = pairs[np.argsort(distance_pairs, kind="stable")][:N_pairs_max]
+    N_pairs = len(pairs)
+
+    # pad to the fixed size by repeating the farthest pair (or turbine 0 if none)
+    i_indices = np.full(N_pairs_max, pairs[-1, 0] if N_pairs else 0, dtype=int)
+    j_indices = np.full(N_pairs_max, pairs[-1, 1] if N_pairs else 0, dtype=int)
+    i_indices[:N_pairs] = pairs[:, 0]
+    j_indices[:N_pairs] = pairs[:, 1]
+    mask_pairs = np.arange(N_pairs_max) < N_pairs
+
+    return i_indices, j_indices, mask_pairs
+
+
+def calculate_turbine_spacing_pairs(
+    x_turbines: np.ndarray,
+    y_turbines: np.ndarray,
+    i_indices: np.ndarray,
+    j_indices: np.ndarray,
+) -> np.ndarray:
+    """Calculate the spacing between specified pairs of turbines.
+
+    Args:
+        x_turbines (np.ndarray): a 1D numpy array indicating the x-dimension locations of the turbines,
+            with length `N_turbines`.
+        y_turbines (np.ndarray): a 1D numpy array indicating the y-dimension locations of the turbines,
+            with length `N_turbines`.
+        i_indices (np.ndarray): index of the first turbine in each pair.
+        j_indices (np.ndarray): index of the second turbine in each pair.
+
+    Returns:
+        turbine distances (np.ndarray): a 1D numpy array indicating the distance between
+            each pair of turbines, with the same length as `i_indices`.
+    """
+
+    # Compute deltas
+    dx = x_turbines[j_indices] - x_turbines[i_indices]
+    dy = y_turbines[j_indices] - y_turbines[i_indices]
+    deltas = jnp.stack([dx, dy], axis=1)
+
+    # Vectorized norm calculation
+    spacing_distance = ard.utils.mathematics.smooth_norm_vec(deltas)
+
+    return spacing_distance
+
+
+calculate_turbine_spacing_pairs = jax.jit(calculate_turbine_spacing_pairs)
+
+
 def calculate_turbine_spacing(
     x_turbines: np.ndarray,
     y_turbines: np.ndarray,
@@ -122,3 +435,109 @@ def calculate_turbine_spacing(
 
 calculate_turbine_spacing = jax.jit(calculate_turbine_spacing)
 calculate_turbine_spacing_jac = jax.jacrev(calculate_turbine_spacing, argnums=[0, 1])
+
+
+def get_turbine_spacing_sparsity(N_turbines: int) -> tuple[np.ndarray, np.ndarray]:
+    """Get the sparsity pattern of the turbine spacing Jacobian.
+
+    Each entry of the turbine spacing vector depends only on the two turbines
+    in its pair, so each row of the Jacobian w.r.t. either the x or y turbine
+    locations has exactly two nonzero entries.
+
+    Args:
+        N_turbines (int): the number of turbines in the farm.
+
+    Returns:
+        rows (np.ndarray): row indices of the nonzero Jacobian entries, with
+            length (N_turbines - 1)*N_turbines, ordered to match the values
+            from `calculate_turbine_spacing_sparse_jac`.
+        cols (np.ndarray): column indices of the nonzero Jacobian entries, with
+            length (N_turbines - 1)*N_turbines, ordered to match the values
+            from `calculate_turbine_spacing_sparse_jac`.
+    """
+
+    i_indices, j_indices = np.triu_indices(N_turbines, k=1)
+
+    rows = np.repeat(np.arange(len(i_indices)), 2)
+    cols = np.stack([i_indices, j_indices], axis=1).flatten()
+
+    return rows, cols
+
+
+def calculate_turbine_spacing_sparse_jac(
+    x_turbines: np.ndarray,
+    y_turbines: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Calculate the nonzero entries of the Jacobian of `calculate_turbine_spacing`.
+
+    Args:
+        x_turbines (np.ndarray): a 1D numpy array indicating the x-dimension locations of the turbines,
+            with length `N_turbines`.
+        y_turbines (np.ndarray): a 1D numpy array indicating the y-dimension locations of the turbines,
+            with length `N_turbines`.
+
+    Returns:
+        jacobian x values (np.ndarray): nonzero derivatives of the turbine spacing w.r.t. the
+            x turbine locations, with length (N_turbines - 1)*N_turbines, matching the
+            sparsity pattern from `get_turbine_spacing_sparsity`.
+        jacobian y values (np.ndarray): nonzero derivatives of the turbine spacing w.r.t. the
+            y turbine locations, with length (N_turbines - 1)*N_turbines, matching the
+            sparsity pattern from `get_turbine_spacing_sparsity`.
+    """
+
+    N_turbines = len(x_turbines)
+
+    # Create index pairs for i < j (upper triangle without diagonal)
+    i_indices, j_indices = jnp.triu_indices(N_turbines, k=1)
+
+    return calculate_turbine_spacing_pairs_sparse_jac(
+        x_turbines, y_turbines, i_indices, j_indices
+    )
+
+
+calculate_turbine_spacing_sparse_jac = jax.jit(calculate_turbine_spacing_sparse_jac)
+
+
+def calculate_turbine_spacing_pairs_sparse_jac(
+    x_turbines: np.ndarray,
+    y_turbines: np.ndarray,
+    i_indices: np.ndarray,
+    j_indices: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Calculate the nonzero entries of the Jacobian of `calculate_turbine_spacing_pairs`.
+
+    Args:
+        x_turbines (np.ndarray): a 1D numpy array indicating the x-dimension locations of the turbines,
+            with length `N_turbines`.
+        y_turbines (np.ndarray): a 1D numpy array indicating the y-dimension locations of the turbines,
+            with length `N_turbines`.
+        i_indices (np.ndarray): index of the first turbine in each pair.
+        j_indices (np.ndarray): index of the second turbine in each pair.
+
+    Returns:
+        jacobian x values (np.ndarray): derivatives of each pair spacing w.r.t. the x locations
+            of turbines i and j, interleaved, with twice the length of `i_indices`.
+        jacobian y values (np.ndarray): derivatives of each pair spacing w.r.t. the y locations
+            of turbines i and j, interleaved, with twice the length of `i_indices`.
+    """
+
+    # Compute deltas
+    dx = x_turbines[j_indices] - x_turbines[i_indices]
+    dy = y_turbines[j_indices] - y_turbines[i_indices]
+    deltas = jnp.stack([dx, dy], axis=1)
+
+    # derivative of the smooth norm is the delta over the smooth norm
+    spacing_distance = ard.utils.mathematics.smooth_norm_vec(deltas)
+    dspacing_ddx = dx / spacing_distance
+    dspacing_ddy = dy / spacing_distance
+
+    # interleave the (turbine i, turbine j) entries for each pair
+    jacobian_x = jnp.stack([-dspacing_ddx, dspacing_ddx], axis=1).flatten()
+    jacobian_y = jnp.stack([-dspacing_ddy, dspacing_ddy], axis=1).flatten()
+
+    return jacobian_x, jacobian_y
+
+
+calculate_turbine_spacing_pairs_sparse_jac = jax.jit(
+    calculate_turbine_spacing_pairs_sparse_jac
+)
@@ -4,6 +4,7 @@ import jax.numpy as jnp
 
 import openmdao.api as om
 
+import ard.utils.compilation
 import ard.utils.geometry
 import ard.utils.mathematics
 
@@ -17,7 +18,13 @@ class MooringConstraint(om.ExplicitComponent):
     Options
     -------
     modeling_options : dict
-        a modeling options dictionary (inherited from `FarmAeroTemplate`)
+        a modeling options dictionary (inherited from `FarmAeroTemplate`); if
+        the optional `mooring_constraint` block sets `pruning_distance_m`, only
+        platform pairs whose anchor-radius bounding circles come within that
+        distance of each other get exact mooring distances, while the remaining
+        pairs get the (conservative) bounding-circle separation, blended
+        smoothly from the exact distance over a further `pruning_margin_m`
+        (by default half of `pruning_distance_m`)
     wind_query : floris.wind_data.WindRose
         a WindQuery objects that specifies the wind conditions that are to be
         computed
@@ -58,6 +65,17 @@ class MooringConstraint(om.ExplicitComponent):
         )
         self.N_anchors = int(self.modeling_options["platform"]["N_anchors"])
         self.N_distances = int((self.N_turbines - 1) * self.N_turbines / 2)
+        options_mooring = self.modeling_options.get("mooring_constraint", {})
+        pruning_distance_m = options_mooring.get("pruning_distance_m")
+        self.pruning_distance = (
+            None if pruning_distance_m is None else pruning_distance_m / 1.0e3
+        )  # convert to km to match the component units
+        self.pruning_margin = (
+            None
+            if pruning_distance_m is None
+            else options_mooring.get("pruning_margin_m", 0.5 * pruning_distance_m)
+            / 1.0e3
+        )  # convert to km to match the component units
 
         # set up inputs and outputs for mooring system
         self.add_input(
@@ -89,10 +107,47 @@ class MooringConstraint(om.ExplicitComponent):
             units="km",
         )  # consolidated violation length
 
+        # compile the JAX kernels ahead of time if requested
+        if ard.utils.compilation.configure_jax_compilation(self.modeling_options):
+            self._warm_up_kernels()
+
     def setup_partials(self):
         """Derivative setup for the OpenMDAO component."""
-        # the default (but not preferred!) derivatives are FDM
-        self.declare_partials("*", "*", method="exact")
+
+        if self.pruning_distance is None:
+            # override the OpenMDAO default FDM derivatives with exact derivatives
+            self.declare_partials("*", "*", method="exact")
+            return
+
+        # with pruning, each pair distance depends only on the two platforms
+        # in the pair and their anchors, so declare sparse partials
+        i_indices, j_indices = np.triu_indices(self.N_turbines, k=1)
+        rows_turbines = np.repeat(np.arange(self.N_distances), 2)
+        cols_turbines = np.stack([i_indices, j_indices], axis=1).flatten()
+        rows_anchors = np.repeat(np.arange(self.N_distances), 2 * self.N_anchors)
+        cols_anchors = np.concatenate(
+            [
+                i_indices[:, None] * self.N_anchors + np.arange(self.N_anchors),
+                j_indices[:, None] * self.N_anchors + np.arange(self.N_anchors),
+            ],
+            axis=1,
+        ).flatten()
+
+        self.declare_partials(
+            "mooring_spacing",
+            ["x_turbines", "y_turbines"],
+            method="exact",
+            rows=rows_turbines,
+            cols=cols_turbines,
+        )
+        self.declare_partials(
+            "mooring_spacing",
+            ["x_anchors", "y_anchors"]
+            + (["z_anchors"] if self.N_anchor_dimensions == 3 else []),
+            method="exact",
+            rows=rows_anchors,
+            cols=cols_anchors,
+        )
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
         """Computation for the OpenMDAO component."""
@@ -105,7 +160,13 @@ class MooringConstraint(om.ExplicitComponent):
         if self.N_anchor_dimensions == 3:
             z_anchors = inputs["z_anchors"]
 
-        if self.N_anchor_dimensions == 2:
+        if self.pruning_distance is not None:
+            distances = calc_mooring_distances_pruned(
+                self._get_mooring_points(inputs),
+                self.pruning_distance,
+                self.pruning_margin,
+            )
+        elif self.N_anchor_dimensions == 2:
             distances = mooring_constraint_xy(
                 x_turbines, y_turbines, x_anchors, y_anchors
             )
@@ -128,7 +189,10 @@ class MooringConstraint(om.ExplicitComponent):
         if self.N_anchor_dimensions == 3:
             z_anchors = inputs["z_anchors"]
 
-        if self.N_anchor_dimensions == 2:
+        if self.pruning_distance is not None:
+            self._compute_partials_pruned(inputs, partials)
+            return
+        elif self.N_anchor_dimensions == 2:
             jacobian = mooring_constraint_xy_jac(
                 x_turbines, y_turbines, x_anchors, y_anchors
             )
@@ -146,6 +210,96 @@ class MooringConstraint(om.ExplicitComponent):
         if self.N_anchor_dimensions == 3:
             partials["mooring_spacing", "z_anchors"] = jacobian[4]
 
+    def _warm_up_kernels(self):
+        """Compile the JAX kernels for the component's array shapes."""
+
+        x_turbines = np.zeros(self.N_turbines)
+        x_anchors = np.zeros((self.N_turbines, self.N_anchors))
+
+        if self.pruning_distance is not None:
+            # only the all-pairs bounding circle kernels have static shapes
+            mooring_points = np.zeros(
+                (self.N_distances, self.N_anchors + 1, self.N_anchor_dimensions)
+            )
+            ard.utils.compilation.warm_up_kernel(
+                f"{self.pathname}: mooring bounding circles",
+                _distance_bounding_circles_vec,
+                mooring_points,
+                mooring_points,
+            )
+            ard.utils.compilation.warm_up_kernel(
+                f"{self.pathname}: mooring bounding circles jacobian",
+                _distance_bounding_circles_vec_value_and_grad,
+                mooring_points,
+                mooring_points,
+            )
+        elif self.N_anchor_dimensions == 2:
+            args_example = (x_turbines, x_turbines, x_anchors, x_anchors)
+            ard.utils.compilation.warm_up_kernel(
+                f"{self.pathname}: mooring spacing",
+                mooring_constraint_xy,
+                *args_example,
+            )
+            ard.utils.compilation.warm_up_kernel(
+                f"{self.pathname}: mooring spacing jacobian",
+                mooring_constraint_xy_jac,
+                *args_example,
+            )
+        elif self.N_anchor_dimensions == 3:
+            args_example = (x_turbines, x_turbines, x_anchors, x_anchors, x_anchors)
+            ard.utils.compilation.warm_up_kernel(
+                f"{self.pathname}: mooring spacing",
+                mooring_constraint_xyz,
+                *args_example,
+            )
+            ard.utils.compilation.warm_up_kernel(
+                f"{self.pathname}: mooring spacing jacobian",
+                mooring_constraint_xyz_jac,
+                *args_example,
+            )
+
+    def _get_mooring_points(self, inputs):
+        """Combine the turbine and anchor inputs into an array of mooring points."""
+        if self.N_anchor_dimensions == 2:
+            return convert_inputs_x_y_to_xy(
+                inputs["x_turbines"],
+                inputs["y_turbines"],
+                inputs["x_anchors"],
+                inputs["y_anchors"],
+            )
+        elif self.N_anchor_dimensions == 3:
+            return convert_inputs_x_y_z_to_xyz(
+                inputs["x_turbines"],
+                inputs["y_turbines"],
+                np.zeros(self.N_turbines),
+                inputs["x_anchors"],
+                inputs["y_anchors"],
+                inputs["z_anchors"],
+            )
+        else:
+            raise (ValueError("modeling_options['layout'][']"))
+
+    def _compute_partials_pruned(self, inputs, partials):
+        """Fill the sparse partials using the pruned mooring distance calculation."""
+
+        _, jacobian_A, jacobian_B = calc_mooring_distances_pruned(
+            self._get_mooring_points(inputs),
+            self.pruning_distance,
+            self.pruning_margin,
+            return_jacobian=True,
+        )
+
+        # interleave the derivatives w.r.t. platform i and platform j of each pair
+        names_dimensions = ["x", "y", "z"][: self.N_anchor_dimensions]
+        for idx_dim, name_dim in enumerate(names_dimensions):
+            if name_dim != "z":  # the platforms are fixed at sea level
+                partials["mooring_spacing", f"{name_dim}_turbines"] = np.stack(
+                    [jacobian_A[:, 0, idx_dim], jacobian_B[:, 0, idx_dim]], axis=1
+                ).flatten()
+            partials["mooring_spacing", f"{name_dim}_anchors"] = np.concatenate(
+                [jacobian_A[:, 1:, idx_dim], jacobian_B[:, 1:, idx_dim]], axis=1
+            ).flatten()
+
 
 def mooring_constraint_xy(
     x_turbines: np.ndarray,
@@ -176,7 +330,9 @@ def mooring_constraint_xy(
 
 
 mooring_constraint_xy = jax.jit(mooring_constraint_xy)
-mooring_constraint_xy_jac = jax.jacrev(mooring_constraint_xy, argnums=[0, 1, 2, 3])
+mooring_constraint_xy_jac = jax.jit(
+    jax.jacrev(mooring_constraint_xy, argnums=[0, 1, 2, 3])
+)
 
 
 def mooring_constraint_xyz(
@@ -217,7 +373,9 @@ def mooring_constraint_xyz(
 
 
 mooring_constraint_xyz = jax.jit(mooring_constraint_xyz)
-mooring_constraint_xyz_jac = jax.jacrev(mooring_constraint_xyz, argnums=[0, 1, 2, 3, 4])
+mooring_constraint_xyz_jac = jax.jit(
+    jax.jacrev(mooring_constraint_xyz, argnums=[0, 1, 2, 3, 4])
+)
 
 
 def calc_mooring_distances(mooring_points: np.ndarray) -> np.ndarray:
@@ -246,6 +404,158 @@ def calc_mooring_distances(mooring_points: np.ndarray) -> np.ndarray:
     return distances
 
 
+def calc_mooring_distances_pruned(
+    mooring_points: np.ndarray,
+    pruning_distance: float,
+    pruning_margin: float = 0.0,
+    return_jacobian: bool = False,
+):
+    """Calculate the minimum distances between each set of mooring lines, only
+    computing exact distances for platform pairs whose anchor-radius bounding
+    circles come within `pruning_distance` plus `pruning_margin` of each
+    other. Pairs separated by more than that are given the separation between
+    their bounding circles, which is a conservative (lower) bound on the exact
+    distance. Across the margin, the distance is blended from the exact
+    distance to the bound with a smoothstep in the bounding circle separation,
+    so the distances and their derivatives are continuous as pairs are pruned.
+
+    Args:
+        mooring_points (np.ndarray): array of mooring points of shape
+            (n_turbines, n_anchors+1, n_dimensions) where n_dimensions may be 2 or 3
+        pruning_distance (float): bounding circle separation below which exact
+            mooring distances are used
+        pruning_margin (float, optional): width of the bounding circle separation
+            above `pruning_distance` over which the exact distances are blended
+            into the bound. Defaults to 0.0, for a discontinuous cut.
+        return_jacobian (bool, optional): if True, also return the derivatives of
+            each pair distance w.r.t. the mooring points of the two platforms in
+            the pair. Defaults to False.
+
+    Returns:
+        np.ndarray: 1D array of distances with length (n_turbines - 1)*n_turbines/2
+        np.ndarray (optional): derivatives w.r.t. the first platform's mooring
+            points of each pair, of shape ((n_turbines - 1)*n_turbines/2, n_anchors+1, n_dimensions)
+        np.ndarray (optional): derivatives w.r.t. the second platform's mooring
+            points of each pair, of shape ((n_turbines - 1)*n_turbines/2, n_anchors+1, n_dimensions)
+    """
+
+    mooring_points = jnp.asarray(mooring_points)
+    n_turbines = mooring_points.shape[0]
+
+    # bounding circle separations for all pairs
+    i_indices, j_indices = np.triu_indices(n_turbines, k=1)
+    if return_jacobian:
+        separations, (jacobian_A, jacobian_B) = (
+            _distance_bounding_circles_vec_value_and_grad(
+                mooring_points[i_indices], mooring_points[j_indices]
+            )
+        )
+        jacobian_A = np.array(jacobian_A)
+        jacobian_B = np.array(jacobian_B)
+    else:
+        separations = _distance_bounding_circles_vec(
+            mooring_points[i_indices], mooring_points[j_indices]
+        )
+    separations = np.array(separations)
+    distances = separations.copy()
+
+    # the candidate pairs get exact distances, at least in part
+    k_candidates = np.flatnonzero(separations < pruning_distance + pruning_margin)
+    N_candidates = len(k_candidates)
+    if N_candidates == 0:
+        return (distances, jacobian_A, jacobian_B) if return_jacobian else distances
+
+    # pad the candidates to a power of two to limit the number of compilations
+    N_padded = int(2 ** np.ceil(np.log2(N_candidates)))
+    i_padded = np.zeros(N_padded, dtype=int)
+    j_padded = np.ones(N_padded, dtype=int)
+    i_padded[:N_candidates] = i_indices[k_candidates]
+    j_padded[:N_candidates] = j_indices[k_candidates]
+
+    # smoothstep weight of the bound, from 0 at the pruning distance to 1 at
+    # the end of the margin
+    fraction = (
+        np.clip((separations[k_candidates] - pruning_distance) / pruning_margin, 0, 1)
+        if pruning_margin > 0.0
+        else np.zeros(N_candidates)
+    )
+    weights = fraction**2 * (3.0 - 2.0 * fraction)
+
+    if not return_jacobian:
+        distances_exact = np.array(
+            _distance_mooring_to_mooring_vec(
+                mooring_points[i_padded], mooring_points[j_padded]
+            )
+        )[:N_candidates]
+        distances[k_candidates] = (
+            1.0 - weights
+        ) * distances_exact + weights * separations[k_candidates]
+        return distances
+
+    distances_exact, (jacobian_A_exact, jacobian_B_exact) = (
+        _distance_mooring_to_mooring_vec_value_and_grad(
+            mooring_points[i_padded], mooring_points[j_padded]
+        )
+    )
+    distances_exact = np.array(distances_exact)[:N_candidates]
+    distances[k_candidates] = (1.0 - weights) * distances_exact + weights * separations[
+        k_candidates
+    ]
+
+    # chain the blend through the exact distances, the bound, and the weights
+    dweights_dseparation = (
+        6.0 * fraction * (1.0 - fraction) / pruning_margin
+        if pruning_margin > 0.0
+        else np.zeros(N_candidates)
+    )
+    factor_bound = (
+        weights + dweights_dseparation * (separations[k_candidates] - distances_exact)
+    )[:, None, None]
+    factor_exact = (1.0 - weights)[:, None, None]
+    jacobian_A[k_candidates] = (
+        factor_exact * np.array(jacobian_A_exact)[:N_candidates]
+        + factor_bound * jacobian_A[k_candidates]
+    )
+    jacobian_B[k_candidates] = (
+        factor_exact * np.array(jacobian_B_exact)[:N_candidates]
+        + factor_bound * jacobian_B[k_candidates]
+    )
+
+    return distances, jacobian_A, jacobian_B
+
+
+def distance_bounding_circles(
+    P_mooring_A: np.ndarray, P_mooring_B: np.ndarray
+) -> float:
+    """Calculate the separation between the bounding circles (or spheres) of two
+    sets of mooring lines, centered on the platforms with radii given by the
+    smooth maximum of the anchor distances. This is a smooth, conservative lower
+    bound on `distance_mooring_to_mooring`.
+
+    Args:
+        P_mooring_A (np.ndarray): ndarray of points of mooring A of shape (npoints, nd) (e.g. (4, (x, y, z))).
+            Center point must come first.
+        P_mooring_B (np.ndarray): ndarray of points of mooring B of shape (npoints, nd) (e.g. (4, (x, y, z))).
+            Center point must come first.
+
+    Returns:
+        float: separation between the bounding circles of the two sets of moorings
+    """
+
+    radius_A = ard.utils.mathematics.smooth_max(
+        ard.utils.mathematics.smooth_norm_vec(P_mooring_A[1:] - P_mooring_A[0])
+    )
+    radius_B = ard.utils.mathematics.smooth_max(
+        ard.utils.mathematics.smooth_norm_vec(P_mooring_B[1:] - P_mooring_B[0])
+    )
+
+    return (
+        ard.utils.mathematics.smooth_norm(P_mooring_B[0] - P_mooring_A[0])
+        - radius_A
+        - radius_B
+    )
+
+
 def convert_inputs_x_y_to_xy(
     x_turbines: np.ndarray,
     y_turbines: np.ndarray,
@@ -378,3 +688,13 @@ def distance_mooring_to_mooring(
 
     # Find the smooth minimum distance
     return ard.utils.mathematics.smooth_min(distances.flatten())
+
+
+_distance_mooring_to_mooring_vec = jax.jit(jax.vmap(distance_mooring_to_mooring))
+_distance_mooring_to_mooring_vec_value_and_grad = jax.jit(
+    jax.vmap(jax.value_and_grad(distance_mooring_to_mooring, argnums=(0, 1)))
+)
+_distance_bounding_circles_vec = jax.jit(jax.vmap(distance_bounding_circles))
+_distance_bounding_circles_vec_value_and_grad = jax.jit(
+    jax.vmap(jax.value_and_grad(distance_bounding_circles, argnums=(0, 1)))
+)
@@ -0,0 +1,99 @@
+import numpy as np
+import jax.numpy as jnp
+import jax
+
+jax.config.update("jax_enable_x64", True)
+import openmdao.api as om
+
+import ard.utils.mathematics
+
+
+class ConstraintAggregation(om.ExplicitComponent):
+    """
+    A class to aggregate a vector of constraint values into a single scalar.
+
+    The constraint vector (e.g. `boundary_distances`, `exclusion_distances`,
+    `turbine_spacing`, or `mooring_spacing`) is collapsed to a smooth estimate
+    of its maximum (for upper-bounded constraints) or minimum (for
+    lower-bounded constraints) using either Kreisselmeier-Steinhauser (KS) or
+    induced exponential aggregation, with exact derivatives from JAX.
+
+    Options
+    -------
+    method : str
+        the aggregation method, either "KS" (conservative) or
+        "induced_exponential" (non-conservative, but typically more accurate)
+    rho : float
+        the aggregation parameter; larger values give a more accurate but less
+        smooth aggregate
+    aggregate_min : bool
+        if True, aggregate the minimum of the constraint values (for
+        lower-bounded constraints), otherwise aggregate the maximum
+    units : str
+        the units in which to aggregate the constraint values; if None, the
+        units are copied from the connected output
+
+    Inputs
+    ------
+    constraint_values : np.ndarray
+        a 1D numpy array of constraint values, with the shape taken from the
+        connected output
+
+    Outputs
+    -------
+    constraint_aggregate : float
+        the aggregated constraint value
+    """
+
+    def initialize(self):
+        """Initialization of the OpenMDAO component."""
+        self.options.declare(
+            "method", default="KS", values=["KS", "induced_exponential"]
+        )
+        self.options.declare("rho", default=1000.0)
+        self.options.declare("aggregate_min", default=False, types=bool)
+        self.options.declare("units", default=None, allow_none=True)
+
+    def setup(self):
+        """Setup of the OpenMDAO component."""
+
+        units = self.options["units"]
+        if units is None:
+            self.add_input("constraint_values", shape_by_conn=True, units_by_conn=True)
+            self.add_output("constraint_aggregate", 0.0, copy_units="constraint_values")
+        else:
+            self.add_input("constraint_values", shape_by_conn=True, units=units)
+            self.add_output("constraint_aggregate", 0.0, units=units)
+
+        # select the aggregation function and its gradient
+        self.aggregate_func = {
+            "KS": ard.utils.mathematics.smooth_max,
+            "induced_exponential": ard.utils.mathematics.induced_exponential_max,
+        }[self.options["method"]]
+        self.aggregate_grad = jax.grad(self.aggregate_func)
+
+    def setup_partials(self):
+        """Derivative setup for the OpenMDAO component."""
+        # override the OpenMDAO default FDM derivatives by declaring exact derivatives
+        self.declare_partials("*", "*", method="exact")
+
+    def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
+        """Computation for the OpenMDAO component."""
+
+        # the min is aggregated as the negated max of the negated values
+        sign = -1.0 if self.options["aggregate_min"] else 1.0
+        constraint_values = jnp.asarray(inputs["constraint_values"]).flatten()
+
+        outputs["constraint_aggregate"] = sign * self.aggregate_func(
+            sign * constraint_values, s=self.options["rho"]
+        )
+
+    def compute_partials(self, inputs, partials, discrete_inputs=None):
+
+        sign = -1.0 if self.options["aggregate_min"] else 1.0
+        constraint_values = jnp.asarray(inputs["constraint_values"]).flatten()
+
+        # the signs cancel by the chain rule
+        partials["constraint_aggregate", "constraint_values"] = np.asarray(
+            self.aggregate_grad(sign * constraint_values, s=self.options["rho"])
+        )
@@ -0,0 +1,103 @@
+from time import perf_counter
+
+import numpy as np
+import jax
+
+import ard.utils.geometry
+
+
+def _time_kernel(kernel, args, n_repeats: int) -> tuple:
+    """Return the compile time and the best execute time of a jitted kernel."""
+
+    time_start = perf_counter()
+    jax.block_until_ready(kernel(*args))
+    time_compile = perf_counter() - time_start
+
+    time_execute = np.inf
+    for _ in range(n_repeats):
+        time_start = perf_counter()
+        jax.block_until_ready(kernel(*args))
+        time_execute = min(time_execute, perf_counter() - time_start)
+
+    return time_compile, time_execute
+
+
+def benchmark_segment_distance_kernels(
+    N_pairs: int = 10000,
+    N_dimensions: int = 3,
+    N_repeats: int = 10,
+    seed: int = 0,
+) -> dict:
+    """
+    Benchmark the branchless segment-to-segment distance kernel against the
+    reference implementation built from nested `jax.lax.cond` branches.
+
+    Both kernels are evaluated with their gradients, vectorized with `jax.vmap`
+    over random pairs of line segments, as they are used in the boundary and
+    mooring constraints.
+
+    Args:
+        N_pairs (int, optional): number of segment pairs. Defaults to 10000.
+        N_dimensions (int, optional): number of spatial dimensions, 2 or 3.
+            Defaults to 3.
+        N_repeats (int, optional): number of timed executions; the best is kept.
+            Defaults to 10.
+        seed (int, optional): random seed for the segment end points. Defaults to 0.
+
+    Returns:
+        dict: for each of "branchless" and "cond", a dictionary of the
+            `compile_time` and best `execute_time` in seconds, and the maximum
+            absolute differences between the two kernels' `distance` values and
+            `gradient` values
+    """
+
+    rng = np.random.default_rng(seed)
+    segments = rng.normal(scale=100.0, size=(4, N_pairs, N_dimensions))
+
+    results = {}
+    outputs = {}
+    for name, kernel in [
+        ("branchless", ard.utils.geometry.distance_lineseg_to_lineseg_nd),
+        ("cond", ard.utils.geometry._distance_lineseg_to_lineseg_nd_cond),
+    ]:
+        kernel_vec = jax.jit(jax.vmap(jax.value_and_grad(kernel, argnums=(0, 1, 2, 3))))
+        time_compile, time_execute = _time_kernel(kernel_vec, segments, N_repeats)
+        results[name] = {
+            "compile_time": time_compile,
+            "execute_time": time_execute,
+        }
+        outputs[name] = kernel_vec(*segments)
+
+    results["max_difference"] = {
+        "distance": float(
+            np.max(np.abs(outputs["branchless"][0] - outputs["cond"][0]))
+        ),
+        "gradient": float(
+            np.max(
+                [
+                    np.max(np.abs(gradient_branchless - gradient_cond))
+                    for gradient_branchless, gradient_cond in zip(
+                        outputs["branchless"][1], outputs["cond"][1]
+                    )
+                ]
+            )
+        ),
+    }
+
+    return results
+
+
+if __name__ == "__main__":
+
+    for N_dimensions in [2, 3]:
+        results = benchmark_segment_distance_kernels(N_dimensions=N_dimensions)
+        print(f"segment distance kernels, {N_dimensions}d:")
+        for name in ["branchless", "cond"]:
+            print(
+                f"  {name:<12s} compile: {results[name]['compile_time']:8.4f} s,"
+                f" execute: {results[name]['execute_time']:8.4f} s"
+            )
+        print(
+            f"  max difference, distance: {results['max_difference']['distance']:.3e},"
+            f" gradient: {results['max_difference']['gradient']:.3e}"
+        )
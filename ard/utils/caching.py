@@ -0,0 +1,187 @@
+from collections import OrderedDict
+import hashlib
+import json
+import os
+from pathlib import Path
+import pickle
+
+import numpy as np
+
+
+def hash_arrays(*arrays, context: str = "") -> str:
+    """
+    Hash a sequence of arrays into a hexadecimal digest.
+
+    The digest depends on the values, the dtype, and the shape of each array,
+    so that arrays with the same bytes but a different layout do not collide.
+
+    Args:
+        *arrays: the arrays (or array-likes) to hash, in order
+        context (str, optional): an extra string that is mixed into the hash,
+            e.g. a digest of the configuration the arrays are evaluated with.
+            Defaults to "".
+
+    Returns:
+        str: the SHA-256 hexadecimal digest of the arrays
+    """
+
+    hasher = hashlib.sha256(context.encode())
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        hasher.update(f"{array.dtype.str}{array.shape}".encode())
+        hasher.update(array.tobytes())
+    return hasher.hexdigest()
+
+
+def hash_configuration(configuration) -> str:
+    """
+    Hash a (possibly nested) configuration dictionary into a hexadecimal digest.
+
+    Args:
+        configuration: a JSON-like configuration; any values that are not JSON
+            serializable (e.g. numpy arrays) are hashed by their string form
+
+    Returns:
+        str: the SHA-256 hexadecimal digest of the configuration
+    """
+
+    def _default(value):
+        if isinstance(value, np.ndarray):
+            return value.tolist()
+        return str(value)
+
+    serialized = json.dumps(configuration, sort_keys=True, default=_default)
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+class LRUResultCache:
+    """
+    A bounded least-recently-used cache of evaluation results.
+
+    Results are dictionaries of arrays, keyed on a hash of the evaluation
+    inputs. When the cache is full, the least-recently-used result is evicted.
+    If a `path` is given, the cache is loaded from that file on construction
+    and written back to it by `flush`, e.g. at the cleanup of the component
+    that holds it, rather than on every stored result, so that results
+    persist between runs without writing the whole cache on the evaluation
+    path; a `flush_interval` also flushes after every so many new results,
+    so that fewer results are lost if a run is interrupted.
+
+    Args:
+        max_size (int): the maximum number of results to hold; a size of zero
+            disables the cache
+        path (str or pathlib.Path, optional): a file to persist the cache to.
+            Defaults to None, for an in-memory cache.
+        flush_interval (int, optional): the number of new results after which
+            the cache is flushed to `path`. Defaults to None, to only flush on
+            request.
+    """
+
+    def __init__(self, max_size: int, path=None, flush_interval: int = None):
+        self.max_size = int(max_size)
+        self.path = None if path is None else Path(path)
+        self.flush_interval = flush_interval
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._N_unsaved = 0
+
+        if self.path is not None and self.path.exists():
+            self.load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache can hold any results."""
+        return self.max_size > 0
+
+    def get(self, key: str):
+        """
+        Get a copy of a cached result, updating the hit/miss counters.
+
+        Args:
+            key (str): the hash of the evaluation inputs
+
+        Returns:
+            dict or None: a copy of the cached result, or None on a miss
+        """
+
+        if key not in self._entries:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return {name: np.copy(value) for name, value in self._entries[key].items()}
+
+    def put(self, key: str, result: dict):
+        """
+        Store a copy of a result, evicting the least-recently-used if full.
+
+        Args:
+            key (str): the hash of the evaluation inputs
+            result (dict): the result to store, as a dictionary of arrays
+        """
+
+        if not self.enabled:
+            return
+
+        self._entries[key] = {
+            name: np.array(value, copy=True) for name, value in result.items()
+        }
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+        self._N_unsaved += 1
+        if self.flush_interval is not None and self._N_unsaved >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Persist the results to `path`, if any have been stored since."""
+        if self.path is not None and self._N_unsaved > 0:
+            self.save()
+
+    def clear(self):
+        """Remove all of the results and reset the hit/miss counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_statistics(self) -> dict:
+        """
+        Get the hit/miss counters of the cache.
+
+        Returns:
+            dict: the `hits`, `misses`, current `size`, and `max_size` of the
+            cache
+        """
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+        }
+
+    def load(self):
+        """Load the results persisted at `path`, keeping the most recent."""
+        with open(self.path, "rb") as f_cache:
+            entries = pickle.load(f_cache)
+        self._entries = OrderedDict(list(entries.items())[-self.max_size :])
+        if not self.enabled:
+            self._entries.clear()
+
+    def save(self):
+        """Persist the results to `path`, replacing the file atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        path_tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(path_tmp, "wb") as f_cache:
+            pickle.dump(dict(self._entries), f_cache)
+        os.replace(path_tmp, self.path)
+        self._N_unsaved = 0
@@ -0,0 +1,134 @@
+import os
+import sys
+from pathlib import Path
+from time import perf_counter
+
+import jax
+
+# compile and execute timings of the warmed-up kernels, by kernel name
+_kernel_timings = {}
+
+
+def enable_persistent_compilation_cache(cache_dir=None) -> Path:
+    """
+    Enable the JAX persistent compilation cache in an Ard-managed directory.
+
+    Once enabled, every JAX kernel compiled in this process is written to the
+    cache directory, and later processes that compile the same kernel for the
+    same array shapes load it from disk instead of re-compiling it.
+
+    Args:
+        cache_dir (str or pathlib.Path, optional): the directory to hold the
+            compilation cache. Defaults to the `ARD_JAX_CACHE_DIR` environment
+            variable if it is set, or otherwise to `~/.cache/ard/jax`.
+
+    Returns:
+        pathlib.Path: the path to the compilation cache directory
+    """
+
+    if cache_dir is None:
+        cache_dir = os.environ.get(
+            "ARD_JAX_CACHE_DIR", Path.home() / ".cache" / "ard" / "jax"
+        )
+    cache_dir = Path(cache_dir).absolute()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    jax.config.update("jax_compilation_cache_dir", str(cache_dir))
+    # Ard kernels are small and quick to compile individually, so cache them all
+    jax.config.update("jax_persistent_cache_min_compile_time_secs", 0.0)
+    jax.config.update("jax_persistent_cache_min_entry_size_bytes", -1)
+
+    return cache_dir
+
+
+def configure_jax_compilation(modeling_options: dict) -> bool:
+    """
+    Configure JAX compilation from the `jax` block of the modeling options.
+
+    The `jax` block can set `compilation_cache_dir` (a directory for the
+    persistent compilation cache, or `True` to use the default directory) and
+    `warm_up` (whether components should compile their kernels at setup).
+
+    Args:
+        modeling_options (dict): an Ard modeling options dictionary
+
+    Returns:
+        bool: True if the components should warm up their kernels at setup
+    """
+
+    jax_options = modeling_options.get("jax", {})
+
+    cache_dir = jax_options.get("compilation_cache_dir")
+    if cache_dir is True:
+        enable_persistent_compilation_cache()
+    elif cache_dir:
+        enable_persistent_compilation_cache(cache_dir)
+
+    return bool(jax_options.get("warm_up", False))
+
+
+def warm_up_kernel(name: str, kernel, *args, **kwargs):
+    """
+    Compile a jitted JAX kernel ahead of time for the given arguments.
+
+    The kernel is lowered and compiled for the shapes and types of the example
+    arguments, which populates the in-memory (and, if enabled, persistent)
+    compilation caches so that the first call during an analysis does not pay
+    the compile time. The compiled kernel is then executed once on the example
+    arguments, and the compile and execute times are recorded.
+
+    Args:
+        name (str): a name for the kernel, used to report timings
+        kernel (Callable): a `jax.jit`-wrapped function
+        *args: example positional arguments, with the same shapes and types
+            that will be used during the analysis
+        **kwargs: example keyword arguments, with the same shapes and types
+            that will be used during the analysis
+
+    Returns:
+        jax.stages.Compiled: the compiled kernel
+    """
+
+    time_start = perf_counter()
+    compiled = kernel.lower(*args, **kwargs).compile()
+    time_compiled = perf_counter()
+    jax.block_until_ready(compiled(*args, **kwargs))
+    time_executed = perf_counter()
+
+    _kernel_timings[name] = {
+        "compile_time": time_compiled - time_start,
+        "execute_time": time_executed - time_compiled,
+    }
+
+    return compiled
+
+
+def get_kernel_timings() -> dict:
+    """
+    Get the compile and execute timings of the kernels warmed up so far.
+
+    Returns:
+        dict: a dictionary, keyed by kernel name, of dictionaries holding the
+            `compile_time` and `execute_time` in seconds
+    """
+    return {name: dict(timings) for name, timings in _kernel_timings.items()}
+
+
+def report_kernel_timings(file=None):
+    """
+    Print the compile and execute timings of the kernels warmed up so far.
+
+    Args:
+        file (file-like, optional): the stream to print to. Defaults to
+            `sys.stdout`.
+    """
+
+    file = sys.stdout if file is None else file
+
+    print(f"{'kernel':<48s} {'compile (s)':>12s} {'execute (s)':>12s}", file=file)
+    for name, timings in _kernel_timings.items():
+        print(
+            f"{name:<48s} {timings['compile_time']:12.4f} "
+            f"{timings['execute_time']:12.4f}",
+            file=file,
+        )
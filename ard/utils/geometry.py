@@ -18,6 +18,12 @@ def get_nearest_polygons(
     differentiable. This implementation is based on FLOWFarm.jl
     (https://github.com/byuflowlab/FLOWFarm.jl)
 
+    Each point is assigned to the first polygon that contains it or, if no polygon
+    contains it, to the nearest polygon. All points are processed at once: polygon
+    bounding boxes are used to prefilter the point-in-polygon tests, which are then
+    evaluated in a single vectorized call, and distances to every polygon are only
+    evaluated for points that are not inside any polygon.
+
     Args:
         boundary_vertices (np.ndarray or list of np.ndarray): Vertices of the boundary in
             counterclockwise order. If `discrete` is True, this should be a list of arrays.
@@ -30,44 +36,91 @@ def get_nearest_polygons(
         np.ndarray: Region assignments for each turbine.
     """
 
-    # Number of turbines
-    n_points = len(points_x)
-
-    # Number of regions
-    nregions = len(boundary_vertices)
+    points_x = np.asarray(points_x, dtype=float)
+    points_y = np.asarray(points_y, dtype=float)
+    vertices_padded, N_vertices = pack_polygons(boundary_vertices)
 
-    # Initialize region and status arrays
-    region = -np.ones(n_points, dtype=int)
+    # Number of points and regions
+    n_points = len(points_x)
+    nregions = len(N_vertices)
+
+    # prefilter: a point can only be inside a polygon if it is inside its bounding box
+    bbox_lower = np.array([np.min(v, axis=0) for v in boundary_vertices]) - tol
+    bbox_upper = np.array([np.max(v, axis=0) for v in boundary_vertices]) + tol
+    in_bbox = (
+        (points_x[:, None] >= bbox_lower[None, :, 0])
+        & (points_x[:, None] <= bbox_upper[None, :, 0])
+        & (points_y[:, None] >= bbox_lower[None, :, 1])
+        & (points_y[:, None] <= bbox_upper[None, :, 1])
+    )
 
-    # Initialize array to hold distances from each turbine to the closest boundary face
-    turbine_to_region_distance = np.zeros(nregions, dtype=float)
+    # point-in-polygon tests for the candidate pairs, negative if in boundary
+    idx_points, idx_regions = np.nonzero(in_bbox)
+    inside = np.zeros((n_points, nregions), dtype=bool)
+    inside[idx_points, idx_regions] = (
+        _distance_point_polygon_pairs(
+            points_x,
+            points_y,
+            vertices_padded,
+            N_vertices,
+            idx_points,
+            idx_regions,
+            s,
+            tol,
+        )
+        <= 0
+    )
 
-    for i in range(n_points):
-        # Iterate through each region
-        for k in range(nregions):
-            # Get distance to each region
-            ctmp = distance_point_to_polygon_ray_casting(
-                np.array([points_x[i], points_y[i]]),
-                boundary_vertices[k],
-                s=s,
-                shift=tol,
-                return_distance=True,
-            )
-            if ctmp <= 0:  # Negative if in boundary
-                region[i] = k
-                break
+    # assign each point to the first region that contains it
+    region = np.where(np.any(inside, axis=1), np.argmax(inside, axis=1), -1)
+
+    # assign the remaining points to the closest region
+    idx_outside = np.nonzero(region == -1)[0]
+    if len(idx_outside):
+        idx_points = np.repeat(idx_outside, nregions)
+        idx_regions = np.tile(np.arange(nregions), len(idx_outside))
+        turbine_to_region_distance = _distance_point_polygon_pairs(
+            points_x,
+            points_y,
+            vertices_padded,
+            N_vertices,
+            idx_points,
+            idx_regions,
+            s,
+            tol,
+        ).reshape(len(idx_outside), nregions)
+        region[idx_outside] = np.argmin(turbine_to_region_distance, axis=1)
 
-            # Check if the point is not in any of the regions
-            else:
-                # Calculate distance to each region
-                turbine_to_region_distance[k] = ctmp
+    return region
 
-        # Magnitude of the constraint value
-        if region[i] == -1:
-            # Indicate closest region
-            region[i] = np.argmin(turbine_to_region_distance)
 
-    return region
+def _distance_point_polygon_pairs(
+    points_x, points_y, vertices_padded, N_vertices, idx_points, idx_regions, s, tol
+) -> np.ndarray:
+    """Signed distances of (point, polygon) index pairs, padded to a power of two
+    number of pairs to limit the number of compilations."""
+
+    N_pairs = len(idx_points)
+    if N_pairs == 0:
+        return np.zeros(0)
+    N_padded = int(2 ** np.ceil(np.log2(N_pairs)))
+
+    idx_points_padded = np.zeros(N_padded, dtype=int)
+    idx_regions_padded = np.zeros(N_padded, dtype=int)
+    idx_points_padded[:N_pairs] = idx_points
+    idx_regions_padded[:N_pairs] = idx_regions
+
+    return np.asarray(
+        distance_multi_point_to_multi_polygon_ray_casting_padded(
+            points_x[idx_points_padded],
+            points_y[idx_points_padded],
+            vertices_padded,
+            N_vertices,
+            idx_regions_padded,
+            s=s,
+            tol=tol,
+        )
+    )[:N_pairs]
 
 
 def distance_multi_point_to_multi_polygon_ray_casting(
@@ -138,6 +191,444 @@ distance_multi_point_to_multi_polygon_ray_casting = jax.jit(
 )
 
 
+def distance_multi_point_to_multi_polygon_ray_casting_diagonal_jac(
+    points_x: np.ndarray[float],
+    points_y: np.ndarray[float],
+    boundary_vertices: list[list[np.ndarray]],
+    regions: np.ndarray[int],
+    s=700,
+    tol=1e-6,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate the derivatives of the point-to-polygon distances from
+    `distance_multi_point_to_multi_polygon_ray_casting` with respect to the
+    point coordinates. Because the distance for each point depends only on the
+    coordinates of that point, the full Jacobian is diagonal; this function
+    returns only the diagonal entries by taking the gradient of each point's
+    distance independently, so the cost scales as O(N) rather than O(N^2) in
+    the number of points.
+
+    Args:
+        points_x (np.ndarray[list]): points x coordinates.
+        points_y (np.ndarray[list]): points y coordinates.
+        boundary_vertices (list[list[np.ndarray]]): Vertices of the each boundary in
+            counterclockwise order. Boundaries should be simple polygons but do not need to have the same number of vertices.
+        regions (np.array[int]): Predefined region assignments for each point.
+        s (float, optional): Smoothing factor for smooth max. Defaults to 700.
+        tol (float, optional): Tolerance for determining proximity of point to polygon to be considered inside the polygon. Defaults to 1e-6.
+
+    Returns:
+        np.ndarray: derivative of each point's distance w.r.t. its own x coordinate.
+        np.ndarray: derivative of each point's distance w.r.t. its own y coordinate.
+    """
+
+    # Convert boundary_vertices to JAX arrays
+    boundary_vertices_jax = [
+        jnp.asarray(poly, dtype=jnp.float32) for poly in boundary_vertices
+    ]
+
+    # Create a function for each polygon that computes distance from a single point
+    def make_distance_func(vertices):
+        def compute_for_polygon(point_x, point_y):
+            return distance_point_to_polygon_ray_casting(
+                point=jnp.stack([point_x, point_y]),
+                vertices=vertices,
+                s=s,
+                shift=tol,
+                return_distance=True,
+            )
+
+        return compute_for_polygon
+
+    # Create list of functions, one per polygon
+    distance_funcs = [
+        make_distance_func(vertices) for vertices in boundary_vertices_jax
+    ]
+
+    # Define function to compute distance using jax.lax.switch
+    def compute_distance(point_x, point_y, region_idx):
+        return jax.lax.switch(region_idx, distance_funcs, point_x, point_y)
+
+    # Vectorize the per-point gradient over all points
+    ddistance_dx, ddistance_dy = jax.vmap(
+        jax.grad(compute_distance, argnums=(0, 1)),
+    )(jnp.asarray(points_x), jnp.asarray(points_y), regions)
+
+    return ddistance_dx, ddistance_dy
+
+
+distance_multi_point_to_multi_polygon_ray_casting_diagonal_jac = jax.jit(
+    distance_multi_point_to_multi_polygon_ray_casting_diagonal_jac
+)
+
+
+def pack_polygons(
+    boundary_vertices: list[np.ndarray],
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pack a set of polygons with different numbers of vertices into a single
+    padded vertex tensor, for use with
+    `distance_multi_point_to_multi_polygon_ray_casting_padded`. Padding entries
+    repeat the first vertex of each polygon and are masked out of the distance
+    calculation using the number of vertices of each polygon.
+
+    Args:
+        boundary_vertices (list[np.ndarray]): Vertices of each polygon in
+            counterclockwise order, each with shape (V, 2).
+
+    Returns:
+        np.ndarray: padded vertices with shape (P, Vmax, 2).
+        np.ndarray: number of vertices of each polygon, with shape (P,).
+    """
+
+    N_vertices = np.array([len(vertices) for vertices in boundary_vertices], dtype=int)
+    vertices_padded = np.zeros((len(boundary_vertices), np.max(N_vertices), 2))
+
+    for idx, vertices in enumerate(boundary_vertices):
+        vertices_padded[idx, :] = vertices[0]
+        vertices_padded[idx, : N_vertices[idx]] = vertices
+
+    return vertices_padded, N_vertices
+
+
+def distance_multi_point_to_multi_polygon_ray_casting_padded(
+    points_x: np.ndarray[float],
+    points_y: np.ndarray[float],
+    vertices_padded: np.ndarray,
+    N_vertices: np.ndarray[int],
+    regions: np.ndarray[int],
+    s=700,
+    tol=1e-6,
+) -> np.ndarray:
+    """
+    Calculate the distance from each point to its assigned polygon, as in
+    `distance_multi_point_to_multi_polygon_ray_casting`, using polygons packed
+    into a single padded vertex tensor by `pack_polygons`. Each point gathers
+    the edges of its own polygon and a masked ray-casting test and smooth-min
+    reduction are evaluated for all points in one vectorized kernel, so the
+    compile time does not grow with the number of polygons.
+
+    Args:
+        points_x (np.ndarray[list]): points x coordinates.
+        points_y (np.ndarray[list]): points y coordinates.
+        vertices_padded (np.ndarray): padded polygon vertices with shape (P, Vmax, 2).
+        N_vertices (np.ndarray[int]): number of vertices of each polygon, with shape (P,).
+        regions (np.array[int]): Predefined region assignments for each point.
+        s (float, optional): Smoothing factor for smooth max. Defaults to 700.
+        tol (float, optional): Tolerance for determining proximity of point to polygon to be considered inside the polygon. Defaults to 1e-6.
+
+    Returns:
+        np.ndarray: Constraint values for each turbine.
+    """
+
+    points = jnp.stack([points_x, points_y], axis=1)
+    regions = jnp.asarray(regions)
+
+    return jax.vmap(_distance_point_to_padded_polygon, in_axes=(0, 0, 0, None, None))(
+        points, vertices_padded[regions], N_vertices[regions], s, tol
+    )
+
+
+distance_multi_point_to_multi_polygon_ray_casting_padded = jax.jit(
+    distance_multi_point_to_multi_polygon_ray_casting_padded
+)
+
+
+def distance_multi_point_to_multi_polygon_ray_casting_padded_diagonal_jac(
+    points_x: np.ndarray[float],
+    points_y: np.ndarray[float],
+    vertices_padded: np.ndarray,
+    N_vertices: np.ndarray[int],
+    regions: np.ndarray[int],
+    s=700,
+    tol=1e-6,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate the derivatives of the point-to-polygon distances from
+    `distance_multi_point_to_multi_polygon_ray_casting_padded` with respect to
+    the point coordinates, returning only the diagonal of the (diagonal)
+    Jacobian.
+
+    Args:
+        points_x (np.ndarray[list]): points x coordinates.
+        points_y (np.ndarray[list]): points y coordinates.
+        vertices_padded (np.ndarray): padded polygon vertices with shape (P, Vmax, 2).
+        N_vertices (np.ndarray[int]): number of vertices of each polygon, with shape (P,).
+        regions (np.array[int]): Predefined region assignments for each point.
+        s (float, optional): Smoothing factor for smooth max. Defaults to 700.
+        tol (float, optional): Tolerance for determining proximity of point to polygon to be considered inside the polygon. Defaults to 1e-6.
+
+    Returns:
+        np.ndarray: derivative of each point's distance w.r.t. its own x coordinate.
+        np.ndarray: derivative of each point's distance w.r.t. its own y coordinate.
+    """
+
+    def compute_distance(point_x, point_y, vertices, N_vertices_point):
+        return _distance_point_to_padded_polygon(
+            jnp.stack([point_x, point_y]), vertices, N_vertices_point, s, tol
+        )
+
+    regions = jnp.asarray(regions)
+
+    return jax.vmap(jax.grad(compute_distance, argnums=(0, 1)))(
+        jnp.asarray(points_x),
+        jnp.asarray(points_y),
+        vertices_padded[regions],
+        N_vertices[regions],
+    )
+
+
+distance_multi_point_to_multi_polygon_ray_casting_padded_diagonal_jac = jax.jit(
+    distance_multi_point_to_multi_polygon_ray_casting_padded_diagonal_jac
+)
+
+
+def _distance_point_to_padded_polygon(
+    point: jnp.ndarray,
+    vertices: jnp.ndarray,
+    N_vertices: int,
+    s: float,
+    shift: float,
+) -> float:
+    """
+    Masked version of `distance_point_to_polygon_ray_casting` for a polygon
+    padded to a fixed number of vertices, where only the first `N_vertices`
+    vertices are used.
+    """
+
+    # Ensure inputs are JAX arrays with explicit data types
+    point = jnp.asarray(point, dtype=jnp.float32)
+    vertices = jnp.asarray(vertices, dtype=jnp.float32)
+
+    # get the edges of the polygon, wrapping around at its own number of vertices
+    indices = jnp.arange(vertices.shape[0])
+    mask = indices < N_vertices
+    edge_starts = vertices
+    edge_ends = vertices[(indices + 1) % N_vertices]
+    previous_edge_starts = vertices[(indices - 1) % N_vertices]
+
+    is_below, distances, vertex_crossings = process_edge_vec(
+        edge_starts, edge_ends, point, shift
+    )
+
+    # Check for tangential vertex crossings
+    curr_edge_end_diff = edge_ends[:, 0] - point[0]
+    prev_edge_start_diff = previous_edge_starts[:, 0] - point[0]
+    tangential_vertex_crossings = jnp.where(
+        (vertex_crossings > 0) & (curr_edge_end_diff * prev_edge_start_diff > 0), 1, 0
+    )
+
+    # Count the number of intersections of the real edges, ignoring tangential vertex crossings
+    intersection_counter = jnp.sum(is_below & mask) - jnp.sum(
+        tangential_vertex_crossings * mask
+    )
+
+    # the padding edges do not contribute to the smooth minimum
+    c_prime = smooth_min(jnp.where(mask, distances, jnp.inf), s=s)
+
+    return jnp.where(intersection_counter % 2 == 1, -c_prime, c_prime)
+
+
+def build_signed_distance_field(
+    boundary_vertices: list[np.ndarray],
+    N_grid_points: int = 200,
+    margin: float = None,
+    s=700,
+    tol=1e-6,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Precompute a signed distance field raster for each polygon, for use with
+    `distance_multi_point_signed_distance_field`. Each polygon gets a square
+    grid of `N_grid_points` by `N_grid_points` points spanning its bounding box
+    extended by `margin`, and the signed distance at each grid point is
+    evaluated exactly with the ray-casting approach (negative inside).
+
+    Args:
+        boundary_vertices (list[np.ndarray]): Vertices of each polygon in
+            counterclockwise order, each with shape (V, 2).
+        N_grid_points (int, optional): Number of grid points along each axis.
+            Defaults to 200.
+        margin (float, optional): Distance by which each grid extends beyond
+            the bounding box of its polygon. Defaults to 10% of the larger
+            bounding box dimension.
+        s (float, optional): Smoothing factor for smooth max. Defaults to 700.
+        tol (float, optional): Tolerance for determining proximity of point to polygon to be considered inside the polygon. Defaults to 1e-6.
+
+    Returns:
+        np.ndarray: signed distance values with shape (P, N_grid_points, N_grid_points),
+            indexed as [polygon, y, x].
+        np.ndarray: grid origin (lower left corner) of each polygon, with shape (P, 2).
+        np.ndarray: grid spacing in x and y of each polygon, with shape (P, 2).
+    """
+
+    vertices_padded, N_vertices = pack_polygons(boundary_vertices)
+
+    sdf_values = np.zeros((len(boundary_vertices), N_grid_points, N_grid_points))
+    grid_origins = np.zeros((len(boundary_vertices), 2))
+    grid_spacings = np.zeros((len(boundary_vertices), 2))
+
+    for idx, vertices in enumerate(boundary_vertices):
+        vertices = np.asarray(vertices, dtype=float)
+        lower = np.min(vertices, axis=0)
+        upper = np.max(vertices, axis=0)
+        margin_polygon = 0.1 * np.max(upper - lower) if margin is None else margin
+        lower = lower - margin_polygon
+        upper = upper + margin_polygon
+
+        grid_origins[idx] = lower
+        grid_spacings[idx] = (upper - lower) / (N_grid_points - 1)
+
+        grid_x = np.linspace(lower[0], upper[0], N_grid_points)
+        grid_y = np.linspace(lower[1], upper[1], N_grid_points)
+        regions = np.full(N_grid_points, idx, dtype=int)
+
+        # evaluate one row at a time to bound the memory for large polygons
+        for idx_y, y in enumerate(grid_y):
+            sdf_values[idx, idx_y] = (
+                distance_multi_point_to_multi_polygon_ray_casting_padded(
+                    grid_x,
+                    np.full(N_grid_points, y),
+                    vertices_padded,
+                    N_vertices,
+                    regions,
+                    s=s,
+                    tol=tol,
+                )
+            )
+
+    return sdf_values, grid_origins, grid_spacings
+
+
+def distance_multi_point_signed_distance_field(
+    points_x: np.ndarray[float],
+    points_y: np.ndarray[float],
+    sdf_values: np.ndarray,
+    grid_origins: np.ndarray,
+    grid_spacings: np.ndarray,
+    regions: np.ndarray[int],
+) -> np.ndarray:
+    """
+    Calculate the signed distance from each point to its assigned polygon by
+    bicubic (cubic convolution) interpolation of a signed distance field from
+    `build_signed_distance_field`. The cost per point is independent of the
+    number of polygon vertices, and the interpolant is continuously
+    differentiable. Points outside the interior of a polygon's grid (all but
+    the outermost grid points) are clamped to it and their distance from it is
+    added to the interpolated value, which over-estimates the signed distance.
+
+    Args:
+        points_x (np.ndarray[list]): points x coordinates.
+        points_y (np.ndarray[list]): points y coordinates.
+        sdf_values (np.ndarray): signed distance values with shape (P, Ny, Nx).
+        grid_origins (np.ndarray): grid origin of each polygon, with shape (P, 2).
+        grid_spacings (np.ndarray): grid spacing of each polygon, with shape (P, 2).
+        regions (np.array[int]): Predefined region assignments for each point.
+
+    Returns:
+        np.ndarray: signed distance for each point, negative inside its polygon.
+    """
+
+    regions = jnp.asarray(regions)
+
+    return jax.vmap(_interpolate_signed_distance_field)(
+        jnp.asarray(points_x),
+        jnp.asarray(points_y),
+        sdf_values[regions],
+        grid_origins[regions],
+        grid_spacings[regions],
+    )
+
+
+distance_multi_point_signed_distance_field = jax.jit(
+    distance_multi_point_signed_distance_field
+)
+
+
+def distance_multi_point_signed_distance_field_diagonal_jac(
+    points_x: np.ndarray[float],
+    points_y: np.ndarray[float],
+    sdf_values: np.ndarray,
+    grid_origins: np.ndarray,
+    grid_spacings: np.ndarray,
+    regions: np.ndarray[int],
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate the derivatives of the interpolated signed distances from
+    `distance_multi_point_signed_distance_field` with respect to the point
+    coordinates, returning only the diagonal of the (diagonal) Jacobian.
+
+    Args:
+        points_x (np.ndarray[list]): points x coordinates.
+        points_y (np.ndarray[list]): points y coordinates.
+        sdf_values (np.ndarray): signed distance values with shape (P, Ny, Nx).
+        grid_origins (np.ndarray): grid origin of each polygon, with shape (P, 2).
+        grid_spacings (np.ndarray): grid spacing of each polygon, with shape (P, 2).
+        regions (np.array[int]): Predefined region assignments for each point.
+
+    Returns:
+        np.ndarray: derivative of each point's distance w.r.t. its own x coordinate.
+        np.ndarray: derivative of each point's distance w.r.t. its own y coordinate.
+    """
+
+    regions = jnp.asarray(regions)
+
+    return jax.vmap(jax.grad(_interpolate_signed_distance_field, argnums=(0, 1)))(
+        jnp.asarray(points_x),
+        jnp.asarray(points_y),
+        sdf_values[regions],
+        grid_origins[regions],
+        grid_spacings[regions],
+    )
+
+
+distance_multi_point_signed_distance_field_diagonal_jac = jax.jit(
+    distance_multi_point_signed_distance_field_diagonal_jac
+)
+
+
+def _cubic_convolution_kernel(t: jnp.ndarray, a: float = -0.5) -> jnp.ndarray:
+    """Keys cubic convolution kernel, giving Catmull-Rom bicubic interpolation."""
+    t = jnp.abs(t)
+    return jnp.where(
+        t <= 1.0,
+        (a + 2.0) * t**3 - (a + 3.0) * t**2 + 1.0,
+        jnp.where(t < 2.0, a * t**3 - 5.0 * a * t**2 + 8.0 * a * t - 4.0 * a, 0.0),
+    )
+
+
+def _interpolate_signed_distance_field(
+    point_x: float,
+    point_y: float,
+    sdf_values: jnp.ndarray,
+    grid_origin: jnp.ndarray,
+    grid_spacing: jnp.ndarray,
+) -> float:
+    """Bicubic interpolation of a single polygon's signed distance field at a point."""
+
+    N_y, N_x = sdf_values.shape
+    point = jnp.stack([point_x, point_y])
+
+    # clamp the point to the interior of the grid, keeping the outermost grid
+    # points for the interpolation stencil, and measure how far outside it is
+    grid_start = grid_origin + grid_spacing
+    grid_end = grid_origin + grid_spacing * (jnp.array([N_x, N_y]) - 2)
+    point_clamped = jnp.clip(point, grid_start, grid_end)
+    distance_outside = smooth_norm(point - point_clamped)
+
+    # get the 4x4 stencil of grid values around the point
+    grid_coordinates = (point_clamped - grid_origin) / grid_spacing
+    idx_x = jnp.clip(jnp.floor(grid_coordinates[0]).astype(int), 1, N_x - 3)
+    idx_y = jnp.clip(jnp.floor(grid_coordinates[1]).astype(int), 1, N_y - 3)
+    stencil = jax.lax.dynamic_slice(sdf_values, (idx_y - 1, idx_x - 1), (4, 4))
+
+    # cubic convolution weights of the stencil points along each axis
+    offsets = jnp.arange(-1, 3)
+    weights_x = _cubic_convolution_kernel(grid_coordinates[0] - idx_x - offsets)
+    weights_y = _cubic_convolution_kernel(grid_coordinates[1] - idx_y - offsets)
+
+    return weights_y @ stencil @ weights_x + distance_outside
+
+
 # Define a function to process a single edge
 def process_edge(
     edge_start: jnp.ndarray,
@@ -429,6 +920,189 @@ def distance_lineseg_to_lineseg_nd(
     returned distance between the two line segments may have a noticeable error due to possibly having multiple points
     with the same distance, which leads to error in the smooth minimum function.
 
+    This implementation is branchless: the degenerate (point), parallel, and general
+    cases are all evaluated with guarded denominators and the result is selected with
+    `jnp.where`, and the closest points are found by clamping the line parameters to
+    the segments. Under `jax.vmap`, where `jax.lax.cond` is lowered to a select that
+    evaluates every branch anyway, this avoids the overhead of the nested branches.
+
+    [1] Numerical Recipes: The Art of Scientific Computing by Press, et al. 3rd edition, sec. 21.4.2 (p. 1121)
+
+    Args:
+        line_a_start (np.ndarray): The start point of line segment "a" as either [x,y,z] or [x,y]
+        line_a_end (np.ndarray): The end point of line segment "a" as either [x,y,z] or [x,y]
+        line_b_start (np.ndarray): The start point of line segment "b" as either [x,y,z] or [x,y]
+        line_b_end (np.ndarray): The end point of line segment "b" as either [x,y,z] or [x,y]
+        tol (float, optional): If denominator in key equation is less than or equal tol, then an alternative method is used. Defaults to 1E-12.
+
+    Returns:
+        float: Distance between the two line segments
+    """
+
+    # if 2d given, then pad with zeros to get 3d points
+    pad_width = len(line_a_start)
+    line_a_start = jnp.pad(line_a_start, (0, 3 - pad_width))
+    line_a_end = jnp.pad(line_a_end, (0, 3 - pad_width))
+    line_b_start = jnp.pad(line_b_start, (0, 3 - pad_width))
+    line_b_end = jnp.pad(line_b_end, (0, 3 - pad_width))
+
+    line_a_vector = line_a_end - line_a_start
+    line_b_vector = line_b_end - line_b_start
+
+    # distances between the end points and the other line segment
+    a_start_to_b = distance_point_to_lineseg_nd(line_a_start, line_b_start, line_b_end)
+    a_end_to_b = distance_point_to_lineseg_nd(line_a_end, line_b_start, line_b_end)
+    b_start_to_a = distance_point_to_lineseg_nd(line_b_start, line_a_start, line_a_end)
+    b_end_to_a = distance_point_to_lineseg_nd(line_b_end, line_a_start, line_a_end)
+
+    # coplanar (parallel) case
+    distance_coplanar = smooth_min(
+        jnp.array([a_start_to_b, a_end_to_b, b_start_to_a, b_end_to_a])
+    )
+
+    # find s and t (point along segment where the segments are closest to each other) using eq. 21.4.17 in [1]
+    denominator = smooth_norm(jnp.cross(line_b_vector, line_a_vector)) ** 2
+    is_parallel = denominator <= tol
+    # guard the denominator so the unused general case stays finite
+    denominator = jnp.where(is_parallel, 1.0, denominator)
+
+    a = line_a_start
+    v = line_a_vector
+    x = line_b_start
+    u = line_b_vector
+
+    s_numerator = jnp.linalg.det(jnp.array([a - x, u, jnp.cross(u, v)]).T)
+    t_numerator = jnp.linalg.det(jnp.array([a - x, v, jnp.cross(u, v)]).T)
+
+    # clamp the parameters to the line segments to get the closest points
+    s = _clamp_unit_interval(s_numerator / denominator)
+    t = _clamp_unit_interval(t_numerator / denominator)
+    closest_point_line_a = line_a_start + s * line_a_vector
+    closest_point_line_b = line_b_start + t * line_b_vector
+
+    # the distance between the line segments is the distance between the closest points (in many cases)
+    parametric_distance = smooth_norm(closest_point_line_b - closest_point_line_a)
+
+    # parametric approach can miss cases, so compare with point to line distances
+    distance_point_a_line_b = distance_point_to_lineseg_nd(
+        closest_point_line_a, line_b_start, line_b_end
+    )
+    distance_point_b_line_a = distance_point_to_lineseg_nd(
+        closest_point_line_b, line_a_start, line_a_end
+    )
+    distance_general = smooth_min(
+        jnp.array(
+            [
+                parametric_distance,
+                distance_point_a_line_b,
+                distance_point_b_line_a,
+            ]
+        )
+    )
+
+    # select the applicable case
+    distance = jnp.where(is_parallel, distance_coplanar, distance_general)
+    distance = jnp.where(jnp.all(line_b_vector == 0.0), b_start_to_a, distance)
+    distance = jnp.where(jnp.all(line_a_vector == 0.0), a_start_to_b, distance)
+
+    return distance
+
+
+distance_lineseg_to_lineseg_nd = jax.jit(distance_lineseg_to_lineseg_nd)
+
+
+def distance_point_to_lineseg_nd(
+    point: np.ndarray, segment_start: np.ndarray, segment_end: np.ndarray
+) -> float:
+    """Find the distance from a point to a line segment in N-Dimensions. This
+    implementation can handle any number of dimensions as well as the reduced case
+    of point to point distance. If the same point is passed for the start and end
+    of the line segment, then the distance is simply the distance from the point
+    of interest to the single start/end point.
+
+    Args:
+        point (np.ndarray): point of interest [x,y,...]
+        segment_start (np.ndarray): start point of line segment [x,y,...]
+        segment_end (np.ndarray): end point of line segment [x,y,...]
+
+    Returns:
+        distance (float): shortest distance between the point and finite line segment
+    """
+
+    # get the closest point on the line segment to the point of interest, which
+    # is the start point if the segment is a point
+    closest_point = get_closest_point_on_line_seg(
+        point, segment_start, segment_end, segment_end - segment_start
+    )
+
+    # the distance from the point to the line is the distance from the point to the closest point on the line
+    return jnp.float64(smooth_norm(point - closest_point))
+
+
+distance_point_to_lineseg_nd = jax.jit(distance_point_to_lineseg_nd)
+
+
+def get_closest_point_on_line_seg(
+    point: np.ndarray,
+    segment_start: np.ndarray,
+    segment_end: np.ndarray,
+    segment_vector: np.ndarray,
+) -> np.ndarray:
+    """Get the closest point on a line segment to the point of interest in N-Dimensions
+    using vector projection, clamping the projection to the segment.
+
+    Args:
+        point (np.ndarray): point of interest [x,y,...]
+        segment_start (np.ndarray): start point of line segment [x,y,...]
+        segment_end (np.ndarray): end point of line segment [x,y,...]
+        segment_vector (np.ndarray): segment_end - segment_start
+
+    Returns:
+        np.ndarray: closest point on the line segment to the point of interest
+    """
+
+    # calculate the distance to the starting point
+    start_to_point_vector = point - segment_start
+
+    # guard the squared length so that a degenerate segment gives its start point
+    segment_length_squared = jnp.dot(segment_vector, segment_vector)
+    segment_length_squared = jnp.where(
+        segment_length_squared == 0.0, 1.0, segment_length_squared
+    )
+
+    # calculate the unit vector projection of the start to point vector on the line segment
+    projection = _clamp_unit_interval(
+        jnp.dot(start_to_point_vector, segment_vector) / segment_length_squared
+    )
+
+    return jnp.array(segment_start + projection * segment_vector, dtype=jnp.float64)
+
+
+get_closest_point_on_line_seg = jax.jit(get_closest_point_on_line_seg)
+
+
+def _clamp_unit_interval(x: float) -> float:
+    """Clamp a line parameter to [0, 1], with zero derivative outside the interval."""
+    return jnp.where(x < 0.0, 0.0, jnp.where(x > 1.0, 1.0, x))
+
+
+def _distance_lineseg_to_lineseg_nd_cond(
+    line_a_start: np.ndarray,
+    line_a_end: np.ndarray,
+    line_b_start: np.ndarray,
+    line_b_end: np.ndarray,
+    tol=1e-12,
+) -> float:
+    """Reference implementation of `distance_lineseg_to_lineseg_nd` using nested
+    `jax.lax.cond` branches, kept for verification and benchmarking.
+
+    Find the distance between two line segments in 2d or 3d. This method is primarily based on reference [1],
+    using a parametric approach based on the determinant and cross product to find the closest points on the two line
+    segments. However, to handle the special case of line segments that are coplanar, we use the smooth minimum of the
+    distance between the endpoints of the two line segments and the other line segment. In the coplanar case, the
+    returned distance between the two line segments may have a noticeable error due to possibly having multiple points
+    with the same distance, which leads to error in the smooth minimum function.
+
     [1] Numerical Recipes: The Art of Scientific Computing by Press, et al. 3rd edition, sec. 21.4.2 (p. 1121)
 
     Args:
@@ -446,13 +1120,17 @@ def distance_lineseg_to_lineseg_nd(
         line_a_start = inputs0i[0]
         line_b_start = inputs0i[2]
         line_b_end = inputs0i[3]
-        return distance_point_to_lineseg_nd(line_a_start, line_b_start, line_b_end)
+        return _distance_point_to_lineseg_nd_cond(
+            line_a_start, line_b_start, line_b_end
+        )
 
     def b_is_point(inputs0i) -> float:
         line_a_start = inputs0i[0]
         line_a_end = inputs0i[1]
         line_b_start = inputs0i[2]
-        return distance_point_to_lineseg_nd(line_b_start, line_a_start, line_a_end)
+        return _distance_point_to_lineseg_nd_cond(
+            line_b_start, line_a_start, line_a_end
+        )
 
     def a_is_not_point(inputs0i) -> float:
         line_b_vector = inputs0i[5]
@@ -528,10 +1206,10 @@ def distance_lineseg_to_lineseg_nd(
             )
 
             # parametric approach can miss cases, so compare with point to line distances
-            distance_point_a_line_b = distance_point_to_lineseg_nd(
+            distance_point_a_line_b = _distance_point_to_lineseg_nd_cond(
                 closest_point_line_a, line_b_start, line_b_end
             )
-            distance_point_b_line_a = distance_point_to_lineseg_nd(
+            distance_point_b_line_a = _distance_point_to_lineseg_nd_cond(
                 closest_point_line_b, line_a_start, line_a_end
             )
             distance = smooth_min(
@@ -598,13 +1276,16 @@ def distance_lineseg_to_lineseg_nd(
     return distance
 
 
-distance_lineseg_to_lineseg_nd = jax.jit(distance_lineseg_to_lineseg_nd)
+_distance_lineseg_to_lineseg_nd_cond = jax.jit(_distance_lineseg_to_lineseg_nd_cond)
 
 
-def distance_point_to_lineseg_nd(
+def _distance_point_to_lineseg_nd_cond(
     point: np.ndarray, segment_start: np.ndarray, segment_end: np.ndarray
 ) -> float:
-    """Find the distance from a point to a line segment in N-Dimensions. This
+    """Reference implementation of `distance_point_to_lineseg_nd` using nested
+    `jax.lax.cond` branches, kept for verification and benchmarking.
+
+    Find the distance from a point to a line segment in N-Dimensions. This
     implementation can handle any number of dimensions as well as the reduced case
     of point to point distance. If the same point is passed for the start and end
     of the line segment, then the distance is simply the distance from the point
@@ -631,7 +1312,7 @@ def distance_point_to_lineseg_nd(
         segment_vector = inputs[3]
 
         # get the closest point on the line segment to the point of interest
-        closest_point = get_closest_point_on_line_seg(
+        closest_point = _get_closest_point_on_line_seg_cond(
             point, segment_start, segment_end, segment_vector
         )
 
@@ -652,16 +1333,19 @@ def distance_point_to_lineseg_nd(
     return distance
 
 
-distance_point_to_lineseg_nd = jax.jit(distance_point_to_lineseg_nd)
+_distance_point_to_lineseg_nd_cond = jax.jit(_distance_point_to_lineseg_nd_cond)
 
 
-def get_closest_point_on_line_seg(
+def _get_closest_point_on_line_seg_cond(
     point: np.ndarray,
     segment_start: np.ndarray,
     segment_end: np.ndarray,
     segment_vector: np.ndarray,
 ) -> np.ndarray:
-    """Get the closest point on a line segment to the point of interest in N-Dimensions
+    """Reference implementation of `get_closest_point_on_line_seg` using nested
+    `jax.lax.cond` branches, kept for verification and benchmarking.
+
+    Get the closest point on a line segment to the point of interest in N-Dimensions
     using vector projection.
 
     Args:
@@ -709,4 +1393,4 @@ def get_closest_point_on_line_seg(
     )
 
 
-get_closest_point_on_line_seg = jax.jit(get_closest_point_on_line_seg)
+_get_closest_point_on_line_seg_cond = jax.jit(_get_closest_point_on_line_seg_cond)
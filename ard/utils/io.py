@@ -1,15 +1,82 @@
 from pathlib import Path
 from os import PathLike
 
+from collections import OrderedDict
+import hashlib
 import os
+import numpy as np
 import yaml
 
+# use the libyaml-backed parser when it is available
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
-class Loader(yaml.SafeLoader):
+# parsed YAML documents by (path, loader), with the states of every file that
+# went into each document, least recently used first
+_yaml_cache = OrderedDict()
+_yaml_cache_max_size = 64
+
+
+def load_array(filename, key=None, mmap=True) -> np.ndarray:
+    """
+    Load a 1D array from a binary or columnar data file.
+
+    Supports `.npy` files (memory-mapped by default), `.npz` archives, and
+    `.csv` and `.parquet` tables, so that long data series (e.g. wind resource
+    time series) need not be parsed out of YAML lists.
+
+    Parameters
+    ----------
+    filename : str or PathLike
+        the data file to load
+    key : str, optional
+        the array name in an `.npz` archive, or the column name in a table;
+        required for those formats
+    mmap : bool, optional
+        whether to memory-map `.npy` files rather than read them, by default
+        True
+
+    Returns
+    -------
+    np.ndarray
+        the array that has been loaded
+
+    Raises
+    ------
+    KeyError
+        if no key is given for a format that requires one
+    ValueError
+        if the file format is not supported
+    """
+
+    extension = Path(filename).suffix.lower()
+
+    if extension == ".npy":
+        return np.load(filename, mmap_mode="r" if mmap else None)
+
+    if key is None:
+        raise KeyError(f"A key is required to load an array from {filename}.")
+
+    if extension == ".npz":
+        with np.load(filename) as archive:
+            return archive[key]
+    elif extension in [".csv", ".parquet"]:
+        import pandas as pd  # only needed for tabular data
+
+        if extension == ".csv":
+            table = pd.read_csv(filename, usecols=[key], float_precision="round_trip")
+        else:
+            table = pd.read_parquet(filename, columns=[key])
+        return table[key].to_numpy()
+    else:
+        raise ValueError(f"Unsupported array file format: {extension}.")
+
+
+class Loader(_SafeLoader):
 
     def __init__(self, stream):
 
         self._root = os.path.split(stream.name)[0]
+        self._dependencies = {}  # states of the files read
 
         super().__init__(stream)
 
@@ -17,21 +84,216 @@ class Loader(yaml.SafeLoader):
 
         filename = os.path.join(self._root, self.construct_scalar(node))
 
-        with open(filename, "r") as f:
-            return yaml.load(f, self.__class__)
+        document, dependencies = _load_yaml_tracked(filename, self.__class__)
+        self._dependencies.update(dependencies)
+        return document
+
+    def array(self, node):
+
+        # either `!array file.npy` or `!array {file: data.npz, key: name}`
+        if isinstance(node, yaml.MappingNode):
+            spec = self.construct_mapping(node)
+        else:
+            spec = {"file": self.construct_scalar(node)}
+
+        filename = os.path.join(self._root, spec["file"])
+
+        self._dependencies[str(Path(filename).absolute())] = _get_file_state(filename)
+        return load_array(filename, key=spec.get("key"))
 
 
 Loader.add_constructor("!include", Loader.include)
+Loader.add_constructor("!array", Loader.array)
+
+
+def _hash_file(filename) -> str:
+    """get the SHA-256 hash of the contents of a file"""
+    hasher = hashlib.sha256()
+    with open(filename, "rb") as f_hash:
+        for block in iter(lambda: f_hash.read(1 << 20), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def _get_file_state(filename) -> tuple:
+    """get the modification time and size, and the content hash of a file"""
+    stat = os.stat(filename)
+    return (stat.st_mtime_ns, stat.st_size), _hash_file(filename)
+
+
+def _is_file_unchanged(dependencies, path) -> bool:
+    """
+    check a file against its state in `dependencies`, only hashing the file
+    if its modification time or size changed (and then updating its state)
+    """
+    signature, content_hash = dependencies[path]
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    signature_now = (stat.st_mtime_ns, stat.st_size)
+    if signature_now == signature:
+        return True
+    if signature_now[1] != signature[1] or _hash_file(path) != content_hash:
+        return False
+    dependencies[path] = (signature_now, content_hash)  # touched, not changed
+    return True
+
+
+def _copy_tree(data):
+    """copy the dicts and lists of a parsed document, sharing read-only arrays"""
+    if isinstance(data, dict):
+        return {key: _copy_tree(value) for key, value in data.items()}
+    elif isinstance(data, list):
+        return [_copy_tree(value) for value in data]
+    elif isinstance(data, np.ndarray) and data.flags.writeable:
+        return data.copy()
+    else:
+        return data
 
 
-def load_yaml(filename, loader=Loader, return_path=False) -> dict:
+def _load_yaml_tracked(filename, loader):
+    """parse a YAML file, or get it from the cache if no file in it changed"""
+
+    path = str(Path(filename).absolute())
+    key = (path, loader)
+
+    if key in _yaml_cache:
+        dependencies, document = _yaml_cache[key]
+        if all(_is_file_unchanged(dependencies, path) for path in list(dependencies)):
+            _yaml_cache.move_to_end(key)
+            return _copy_tree(document), dependencies
+
+    with open(path) as fid:
+        loader_instance = loader(fid)
+        try:
+            document = loader_instance.get_single_data()
+        finally:
+            loader_instance.dispose()
+
+    dependencies = {path: _get_file_state(path)}
+    dependencies.update(getattr(loader_instance, "_dependencies", {}))
+    _yaml_cache[key] = (dependencies, document)
+    _yaml_cache.move_to_end(key)
+    while len(_yaml_cache) > _yaml_cache_max_size:
+        _yaml_cache.popitem(last=False)
+
+    return _copy_tree(document), dependencies
+
+
+def clear_yaml_cache():
+    """Clear the cache of parsed YAML documents."""
+    _yaml_cache.clear()
+
+
+def load_yaml(filename, loader=Loader, return_path=False, use_cache=True) -> dict:
+    """
+    Load a YAML file, with the `!include` and `!array` tags of `Loader`.
+
+    Parsed documents are cached, so that repeated loads of unchanged inputs
+    (e.g. the turbine and resource files shared by a batch of cases) skip
+    parsing. A cached document is re-used while the file and every file it
+    includes or reads arrays from are unchanged: the modification time and
+    size of each file are checked on every load, and the contents are only
+    hashed when those change. The most recently used documents are kept, up
+    to `_yaml_cache_max_size` of them. Each load returns its own copy of the
+    document.
+
+    Parameters
+    ----------
+    filename : str, PathLike, or dict
+        the YAML file to load; a dict is returned as-is
+    loader : yaml.Loader, optional
+        the YAML loader class, by default `Loader`
+    return_path : bool, optional
+        whether to also return the absolute directory of the file, by default
+        False
+    use_cache : bool, optional
+        whether to use the cache of parsed documents, by default True
+
+    Returns
+    -------
+    dict
+        the YAML document
+    pathlib.Path
+        the absolute directory of the file, if `return_path` is True
+    """
+
     if isinstance(filename, dict):
         return filename  # filename already yaml dict
-    with open(filename) as fid:
-        if return_path:
-            return yaml.load(fid, loader), Path(filename).parent.absolute()
-        else:
-            return yaml.load(fid, loader)
+    if use_cache:
+        document, _ = _load_yaml_tracked(filename, loader)
+    else:
+        with open(filename) as fid:
+            document = yaml.load(fid, loader)
+    if return_path:
+        return document, Path(filename).parent.absolute()
+    else:
+        return document
+
+
+def shorten_arrays(data, N_keep: int = 1):
+    """
+    Get a copy of a nested dictionary with any arrays shortened to lists.
+
+    Arrays loaded from data files (e.g. with the `!array` YAML tag) can be
+    long, and are not valid JSON for schema validation; this makes a light
+    copy of the data, with each array replaced by a list of its first
+    `N_keep` values, so that the structure of the data can be validated.
+
+    Parameters
+    ----------
+    data : dict, list, or other
+        the data to shorten
+    N_keep : int or None, optional
+        the number of values of each array to keep, by default 1; None keeps
+        all of the values
+
+    Returns
+    -------
+    dict, list, or other
+        the shortened copy of the data
+    """
+
+    if isinstance(data, dict):
+        return {key: shorten_arrays(value, N_keep) for key, value in data.items()}
+    elif isinstance(data, list):
+        return [shorten_arrays(value, N_keep) for value in data]
+    elif isinstance(data, np.ndarray):
+        values = data[:N_keep]
+        if values.dtype.kind == "M":  # timestamps validate as strings
+            values = np.datetime_as_string(values)
+        return values.tolist()
+    else:
+        return data
+
+
+def check_arrays_finite(data, path: str = ""):
+    """
+    Check that any numeric arrays in a nested dictionary are finite.
+
+    Parameters
+    ----------
+    data : dict, list, or other
+        the data to check
+    path : str, optional
+        the location of `data` in the enclosing data, for error messages
+
+    Raises
+    ------
+    ValueError
+        if a numeric array has values that are NaN or infinite
+    """
+
+    if isinstance(data, dict):
+        for key, value in data.items():
+            check_arrays_finite(value, f"{path}/{key}")
+    elif isinstance(data, list):
+        for idx, value in enumerate(data):
+            check_arrays_finite(value, f"{path}/{idx}")
+    elif isinstance(data, np.ndarray) and data.dtype.kind in "fc":
+        if not np.all(np.isfinite(data)):
+            raise ValueError(f"The array at {path} has values that are not finite.")
 
 
 def check_create_folder(filepath):
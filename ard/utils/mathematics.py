@@ -61,6 +61,32 @@ def smooth_min(x: np.ndarray, s: float = 1000.0) -> float:
 smooth_min = jax.jit(smooth_min)
 
 
+def induced_exponential_max(x: jnp.ndarray, s: float = 1000.0) -> float:
+    """Induced exponential aggregation of the elements in x, a smooth estimate of
+    the maximum. Unlike the `smooth_max` (Kreisselmeier-Steinhauser) function,
+    which always over-estimates the true maximum, the induced exponential
+    function always under-estimates it, but it is typically more accurate for
+    the same smoothing factor.
+
+    Args:
+        x (list): list of values to be compared
+        s (float, optional): alpha for induced exponential function. Defaults to 1000.0.
+            Larger values of `s` lead to more accurate results, but reduce the smoothness
+            of the function.
+
+    Returns:
+        float: the induced exponential estimate of the max of the provided `x` list
+    """
+
+    # shift by the maximum value to prevent overflow
+    weights = jnp.exp(s * (x - jnp.max(x)))
+
+    return jnp.sum(x * weights) / jnp.sum(weights)
+
+
+induced_exponential_max = jax.jit(induced_exponential_max)
+
+
 def smooth_norm(vec: np.ndarray, buf: float = 1e-12) -> float:
     """Smooth version of the Frobenius, or 2, norm. This version is nearly equivalent to the 2-norm with the
     maximum absolute error corresponding to the order of the buffer value. The maximum error in the gradient is near unity, but
@@ -0,0 +1,122 @@
+import atexit
+import concurrent.futures
+import multiprocessing
+import os
+import warnings
+
+import numpy as np
+
+from openmdao.utils.mpi import MPI
+
+# persistent process pools, by number of workers and name
+_process_pools = {}
+
+
+def get_process_pool(
+    N_workers: int = None,
+    name: str = None,
+    initializer=None,
+    initargs: tuple = (),
+) -> concurrent.futures.ProcessPoolExecutor:
+    """
+    Get a persistent local process pool.
+
+    The pool is created on the first request and then kept alive, so that the
+    worker processes (and anything they cache, e.g. warm FLORIS models) are
+    re-used across evaluations. Workers are started with the "spawn" method so
+    that they are safe to use from threaded and MPI-launched parents.
+
+    Args:
+        N_workers (int, optional): the number of worker processes. Defaults to
+            None, which uses the number of CPUs available.
+        name (str, optional): a name for a pool of its own, e.g. one whose
+            workers are initialized with data. Defaults to None, for the
+            shared pool.
+        initializer (callable, optional): a function run once in each worker
+            as it starts, when the named pool is created. Defaults to None.
+        initargs (tuple, optional): the arguments of `initializer`, which are
+            sent to each worker only once. Defaults to ().
+
+    Returns:
+        concurrent.futures.ProcessPoolExecutor: the process pool
+    """
+
+    if N_workers is None:
+        N_workers = os.cpu_count() or 1
+
+    if (N_workers, name) not in _process_pools:
+        _process_pools[(N_workers, name)] = concurrent.futures.ProcessPoolExecutor(
+            max_workers=N_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=initializer,
+            initargs=initargs,
+        )
+    return _process_pools[(N_workers, name)]
+
+
+def shutdown_process_pools():
+    """Shut down all of the persistent process pools."""
+    for pool in _process_pools.values():
+        pool.shutdown(wait=True, cancel_futures=True)
+    _process_pools.clear()
+
+
+atexit.register(shutdown_process_pools)
+
+
+def get_MPI_communicator(comm=None, required: bool = False):
+    """
+    Get an MPI communicator with more than one rank, if running under MPI.
+
+    Args:
+        comm (optional): the communicator to use, e.g. the `comm` of an
+            OpenMDAO component. Defaults to None, which uses `MPI.COMM_WORLD`.
+        required (bool, optional): whether the MPI backend has been requested,
+            in which case it is an error for MPI to be unavailable, and a
+            single-rank communicator is warned about rather than silently
+            ignored. Defaults to False.
+
+    Raises:
+        RuntimeError: if MPI is `required` but not available
+
+    Returns:
+        the communicator, or None if MPI is not available or there is only a
+            single rank
+    """
+
+    if MPI is None:
+        if required:
+            raise RuntimeError(
+                "The MPI parallel backend was requested, but MPI is not "
+                "available: install mpi4py and launch the run under MPI, or use "
+                "the 'processes' backend."
+            )
+        return None
+    if comm is None:
+        comm = MPI.COMM_WORLD
+    if getattr(comm, "size", 1) < 2:
+        if required:
+            warnings.warn(
+                "The MPI parallel backend was requested, but the communicator "
+                "has a single rank, so the local process pool is used instead."
+            )
+        return None
+    return comm
+
+
+def split_indices(N_items: int, N_chunks: int) -> list:
+    """
+    Split the indices of a set of items into contiguous chunks.
+
+    Args:
+        N_items (int): the number of items
+        N_chunks (int): the number of chunks, limited to `N_items`
+
+    Returns:
+        list: the index arrays of the (non-empty) chunks, in order
+    """
+
+    N_chunks = max(1, min(N_chunks, N_items))
+    return [
+        chunk for chunk in np.array_split(np.arange(N_items), N_chunks) if len(chunk)
+    ]
@@ -1,7 +1,9 @@
+import numpy as np
 import pytest
 
 from pathlib import Path
-from ard.api import set_up_ard_model
+from ard.api import set_up_ard_model, validate_windIO
+from ard.utils.io import load_yaml
 
 import jsonschema.exceptions
 
@@ -42,3 +44,49 @@ class TestSetUpArdModelInvalidWindIO:
             jsonschema.exceptions.ValidationError, match="'y' is a required property"
         ):
             self.prob = set_up_ard_model(input_dict=self.input_dict_path)
+
+
+class TestValidateWindIOCache:
+    def setup_method(self):
+
+        self.windIO_dict = load_yaml(
+            Path(__file__).parent.absolute()
+            / "inputs_onshore"
+            / "ard_system_bad_windio.yaml"
+        )["modeling_options"]["windIO_plant"]
+
+    def test_repeated_validation_error(self):
+
+        for _ in range(2):
+            with pytest.raises(
+                jsonschema.exceptions.ValidationError,
+                match="'y' is a required property",
+            ):
+                validate_windIO(self.windIO_dict)
+
+
+class TestValidateWindIOArrays:
+    def setup_method(self):
+
+        self.windIO_dict = load_yaml(
+            Path(__file__).parent.absolute() / "inputs_onshore" / "windio.yaml"
+        )
+        # the layout as arrays, as if loaded from data files
+        coordinates = self.windIO_dict["wind_farm"]["layouts"]["coordinates"]
+        coordinates["x"] = np.array(coordinates["x"])
+        coordinates["y"] = np.array(coordinates["y"])
+
+    def test_arrays_validated(self):
+
+        validate_windIO(self.windIO_dict)
+        validate_windIO(self.windIO_dict, full_arrays=True)
+
+    def test_array_values_validated_in_full(self):
+
+        coordinates = self.windIO_dict["wind_farm"]["layouts"]["coordinates"]
+        coordinates["x"][-1] = np.nan
+
+        # only the first values are validated by default
+        validate_windIO(self.windIO_dict)
+        with pytest.raises(ValueError, match="not finite"):
+            validate_windIO(self.windIO_dict, full_arrays=True)
@@ -0,0 +1,109 @@
+import copy
+
+import numpy as np
+
+import pytest
+
+from ard.api import set_up_system_recursive
+import ard.api.parallel_fd
+from ard.api.parallel_fd import ParallelFiniteDifference
+import ard.utils.parallel
+
+
+@pytest.mark.usefixtures("subtests")
+class TestParallelFiniteDifference:
+    def setup_method(self):
+
+        self.input_dict = {
+            "type": "group",
+            "systems": {
+                "layout2aep": {
+                    "type": "group",
+                    "promotes": ["*"],
+                    "approx_totals": {
+                        "method": "fd",
+                        "step": 1.0e-6,
+                        "form": "central",
+                    },
+                    "parallel_fd": {"N_workers": 2},
+                    "systems": {
+                        "aep": {
+                            "type": "component",
+                            "module": "openmdao.api",
+                            "object": "ExecComp",
+                            "promotes": ["*"],
+                            "kwargs": {
+                                "exprs": "AEP_farm = sum(x_turbines**2 * y_turbines)",
+                                "x_turbines": {"val": np.array([1.0, 2.0, 3.0])},
+                                "y_turbines": {"val": np.array([4.0, 5.0, 6.0])},
+                            },
+                        },
+                    },
+                },
+            },
+        }
+        self.analysis_options = {
+            "design_variables": {"x_turbines": {}, "y_turbines": {}},
+            "objectives": {"AEP_farm": {}},
+        }
+
+    def teardown_method(self):
+        ard.utils.parallel.shutdown_process_pools()
+
+    def set_up_problem(self, input_dict):
+        prob = set_up_system_recursive(
+            input_dict,
+            modeling_options={},
+            analysis_options=self.analysis_options,
+        )
+        prob.run_model()
+        return prob
+
+    def test_parallel_matches_serial(self, subtests):
+
+        prob_parallel = self.set_up_problem(self.input_dict)
+        input_dict_serial = copy.deepcopy(self.input_dict)
+        del input_dict_serial["systems"]["layout2aep"]["parallel_fd"]
+        prob_serial = self.set_up_problem(input_dict_serial)
+
+        with subtests.test("parallel scheme installed"):
+            assert isinstance(
+                prob_parallel.model.layout2aep._approx_schemes["fd"],
+                ParallelFiniteDifference,
+            )
+
+        totals_parallel = prob_parallel.compute_totals()
+        totals_serial = prob_serial.compute_totals()
+        for key, value in totals_serial.items():
+            with subtests.test(f"{key} matches serial"):
+                assert np.allclose(totals_parallel[key], value)
+
+        with subtests.test("analytic derivative"):
+            assert np.allclose(
+                totals_parallel[("AEP_farm", "x_turbines")],
+                2.0 * np.array([1.0, 2.0, 3.0]) * np.array([4.0, 5.0, 6.0]),
+            )
+
+        # the spec is sent once, to the workers of a pool started for it
+        scheme = prob_parallel.model.layout2aep._approx_schemes["fd"]
+        pool = ard.utils.parallel._process_pools[(2, f"parallel_fd_{scheme._spec_key}")]
+        prob_parallel.compute_totals()
+        with subtests.test("pool re-used across gradients"):
+            assert (
+                ard.utils.parallel._process_pools[
+                    (2, f"parallel_fd_{scheme._spec_key}")
+                ]
+                is pool
+            )
+
+    def test_requires_fd(self):
+
+        self.input_dict["systems"]["layout2aep"]["approx_totals"] = {"method": "cs"}
+        with pytest.raises(ValueError):
+            self.set_up_problem(self.input_dict)
+
+    def test_requires_supported_openmdao(self, monkeypatch):
+
+        monkeypatch.setattr(ard.api.parallel_fd, "openmdao_supported", False)
+        with pytest.raises(RuntimeError):
+            self.set_up_problem(self.input_dict)
@@ -1,3 +1,4 @@
+import copy
 from pathlib import Path
 
 import yaml
@@ -11,6 +12,7 @@ import ard.utils.io
 import ard.utils.test_utils
 import ard.wind_query as wq
 import ard.farm_aero.floris as farmaero_floris
+import ard.farm_aero.scenarios as farmaero_scenarios
 
 
 class TestFLORISFarmComponent:
@@ -19,6 +21,7 @@ class TestFLORISFarmComponent:
         pass
 
 
+@pytest.mark.usefixtures("subtests")
 class TestFLORISBatchPower:
 
     def setup_method(self):
@@ -149,6 +152,74 @@ class TestFLORISBatchPower:
             # rewrite=True,  # uncomment to write new pyrite file
         )
 
+    def test_compute_deduplicate_conditions(self, subtests):
+
+        # repeat the time series in a shuffled order, so conditions recur
+        wind_resource = self.modeling_options["windIO_plant"]["site"][
+            "energy_resource"
+        ]["wind_resource"]
+        rng = np.random.default_rng(0)
+        idx_repeat = rng.permutation(2 * len(wind_resource["wind_speed"])) % len(
+            wind_resource["wind_speed"]
+        )
+        for key in ["wind_direction", "wind_speed", "turbulence_intensity", "time"]:
+            wind_resource[key] = np.array(wind_resource[key])[idx_repeat].tolist()
+
+        x_turbines = 7.0 * 130.0 * np.arange(-2, 2.1, 1)
+        y_turbines = 7.0 * 130.0 * np.arange(-2, 2.1, 1)
+        X, Y = [v.flatten() for v in np.meshgrid(x_turbines, y_turbines)]
+
+        # evaluate the full and the deduplicated time series
+        results = {}
+        for deduplicate_conditions in [False, True]:
+            self.modeling_options["floris"][
+                "deduplicate_conditions"
+            ] = deduplicate_conditions
+            self.prob.setup()
+            self.prob.set_val("batchFLORIS.x_turbines", X)
+            self.prob.set_val("batchFLORIS.y_turbines", Y)
+            self.prob.run_model()
+            results[deduplicate_conditions] = {
+                key: self.prob.get_val(f"batchFLORIS.{key}").copy()
+                for key in [
+                    "AEP_farm",
+                    "power_farm",
+                    "power_turbines",
+                    "thrust_turbines",
+                ]
+            }
+
+        with subtests.test("only unique conditions evaluated"):
+            assert self.FLORIS.N_conditions_evaluated == len(idx_repeat) // 2
+        for key in results[False]:
+            with subtests.test(key):
+                assert np.allclose(results[True][key], results[False][key])
+
+    def test_compute_time_series_clustering(self, subtests):
+
+        x_turbines = 7.0 * 130.0 * np.arange(-2, 2.1, 1)
+        y_turbines = 7.0 * 130.0 * np.arange(-2, 2.1, 1)
+        X, Y = [v.flatten() for v in np.meshgrid(x_turbines, y_turbines)]
+
+        # evaluate the full and the clustered time series
+        AEP = {}
+        for N_clusters in [None, 100]:
+            if N_clusters is not None:
+                self.modeling_options["aero"]["time_series_clustering"] = {
+                    "N_clusters": N_clusters,
+                }
+            self.prob.setup()
+            self.prob.set_val("batchFLORIS.x_turbines", X)
+            self.prob.set_val("batchFLORIS.y_turbines", Y)
+            self.prob.run_model()
+            AEP[N_clusters] = self.prob.get_val("batchFLORIS.AEP_farm").copy()
+
+        with subtests.test("clustered conditions evaluated"):
+            assert self.FLORIS.N_wind_conditions == 100
+            assert self.prob.get_val("batchFLORIS.power_farm").shape == (100,)
+        with subtests.test("clustered AEP near full AEP"):
+            assert np.isclose(AEP[100], AEP[None], rtol=5.0e-2)
+
 
 class TestFLORISAEP:
 
@@ -296,3 +367,622 @@ class TestFLORISAEP:
         for key in test_data:
             with subtests.test(key):
                 assert np.allclose(test_data[key], pyrite_data[key], rtol=5e-3)
+
+    def test_compute_result_cache(self, subtests, tmp_path):
+
+        # turn on a persistent result cache and re-setup the problem
+        modeling_options = self.FLORIS.options["modeling_options"]
+        modeling_options["floris"]["cache_size"] = 2
+        modeling_options["floris"]["cache_path"] = tmp_path / "cache.pkl"
+        self.prob.setup()
+
+        x_turbines = 7.0 * 130.0 * np.arange(-2, 2.1, 1)
+        y_turbines = 7.0 * 130.0 * np.arange(-2, 2.1, 1)
+        X, Y = [v.flatten() for v in np.meshgrid(x_turbines, y_turbines)]
+        self.prob.set_val("aepFLORIS.x_turbines", X)
+        self.prob.set_val("aepFLORIS.y_turbines", Y)
+
+        self.prob.run_model()
+        AEP_first = self.prob.get_val("aepFLORIS.AEP_farm", units="GW*h").copy()
+        self.prob.run_model()
+        AEP_repeat = self.prob.get_val("aepFLORIS.AEP_farm", units="GW*h").copy()
+
+        with subtests.test("repeat evaluation hits the cache"):
+            assert self.FLORIS.result_cache.hits == 1
+            assert self.FLORIS.result_cache.misses == 1
+        with subtests.test("cached result matches"):
+            assert np.all(AEP_repeat == AEP_first)
+
+        # a moved turbine is a new evaluation
+        self.prob.set_val("aepFLORIS.x_turbines", X + 1.0)
+        self.prob.run_model()
+        with subtests.test("changed layout misses the cache"):
+            assert self.FLORIS.result_cache.misses == 2
+        with subtests.test("results not written on the evaluation path"):
+            assert not (tmp_path / "cache.pkl").exists()
+
+        # a fresh setup persists the results, and reloads them
+        self.prob.setup()
+        self.prob.set_val("aepFLORIS.x_turbines", X)
+        self.prob.set_val("aepFLORIS.y_turbines", Y)
+        self.prob.run_model()
+        with subtests.test("persisted result reloaded"):
+            assert self.FLORIS.result_cache.get_statistics()["hits"] == 1
+            assert np.all(
+                self.prob.get_val("aepFLORIS.AEP_farm", units="GW*h") == AEP_first
+            )
+
+    def test_compute_parallel(self, subtests):
+
+        x_turbines = 7.0 * 130.0 * np.arange(-2, 2.1, 1)
+        y_turbines = 7.0 * 130.0 * np.arange(-2, 2.1, 1)
+        X, Y = [v.flatten() for v in np.meshgrid(x_turbines, y_turbines)]
+        output_names = ["AEP_farm", "power_farm", "power_turbines", "thrust_turbines"]
+
+        # serial reference
+        self.prob.set_val("aepFLORIS.x_turbines", X)
+        self.prob.set_val("aepFLORIS.y_turbines", Y)
+        self.prob.run_model()
+        outputs_serial = {
+            name: self.prob.get_val(f"aepFLORIS.{name}").copy() for name in output_names
+        }
+
+        # turn on the process-parallel evaluation and re-setup the problem
+        modeling_options = self.FLORIS.options["modeling_options"]
+        modeling_options["floris"]["parallel"] = {"N_workers": 2, "N_chunks": 3}
+        self.prob.setup()
+        self.prob.set_val("aepFLORIS.x_turbines", X)
+        self.prob.set_val("aepFLORIS.y_turbines", Y)
+        self.prob.run_model()
+
+        for name in output_names:
+            with subtests.test(f"parallel {name} matches serial"):
+                assert np.allclose(
+                    self.prob.get_val(f"aepFLORIS.{name}"),
+                    outputs_serial[name],
+                    equal_nan=True,
+                )
+
+        # an unknown backend is rejected at setup
+        modeling_options["floris"]["parallel"] = {"backend": "threads"}
+        with subtests.test("unknown backend raises"):
+            with pytest.raises(ValueError):
+                self.prob.setup()
+
+        # a requested MPI backend without MPI is rejected at setup
+        if farmaero_floris.ard_parallel.MPI is None:
+            modeling_options["floris"]["parallel"] = {"backend": "mpi"}
+            with subtests.test("unavailable MPI backend raises"):
+                with pytest.raises(RuntimeError):
+                    self.prob.setup()
+
+    def test_compute_incremental(self, subtests):
+
+        # an incremental AEP component on the same problem
+        modeling_options = self.FLORIS.options["modeling_options"]
+        modeling_options["floris"]["incremental"] = True
+        model = om.Group()
+        FLORIS_incremental = model.add_subsystem(
+            "incrementalFLORIS",
+            farmaero_floris.FLORISAEP(
+                modeling_options=modeling_options,
+                case_title="letsgo",
+                data_path="",
+            ),
+        )
+        prob_incremental = om.Problem(model)
+        prob_incremental.setup()
+
+        x_turbines = 7.0 * 130.0 * np.arange(-2, 2.1, 1)
+        y_turbines = 5.0 * 130.0 * np.arange(-2, 2.1, 1)
+        X, Y = [v.flatten() for v in np.meshgrid(x_turbines, y_turbines)]
+
+        # the first evaluation is a full run, then move a single turbine
+        for idx_evaluation in range(2):
+            if idx_evaluation == 1:
+                X[12] += 80.0
+                Y[12] -= 60.0
+
+            self.prob.set_val("aepFLORIS.x_turbines", X)
+            self.prob.set_val("aepFLORIS.y_turbines", Y)
+            self.prob.run_model()
+            prob_incremental.set_val("incrementalFLORIS.x_turbines", X)
+            prob_incremental.set_val("incrementalFLORIS.y_turbines", Y)
+            prob_incremental.run_model()
+
+            with subtests.test(f"AEP matches full run at evaluation {idx_evaluation}"):
+                assert np.allclose(
+                    prob_incremental.get_val("incrementalFLORIS.AEP_farm"),
+                    self.prob.get_val("aepFLORIS.AEP_farm"),
+                    rtol=1.0e-5,
+                )
+            with subtests.test(
+                f"turbine powers match full run at evaluation {idx_evaluation}"
+            ):
+                assert np.allclose(
+                    prob_incremental.get_val("incrementalFLORIS.power_turbines"),
+                    self.prob.get_val("aepFLORIS.power_turbines"),
+                    rtol=1.0e-3,
+                    atol=1.0e-2
+                    * np.nanmax(self.prob.get_val("aepFLORIS.power_turbines")),
+                    equal_nan=True,
+                )
+
+        with subtests.test("move re-runs part of the farm"):
+            assert FLORIS_incremental.fraction_incremental < 0.5
+
+    def test_compute_decomposition(self, subtests):
+
+        # a decomposed AEP component on the same problem
+        modeling_options = self.FLORIS.options["modeling_options"]
+        modeling_options["floris"]["decomposition"] = True
+        model = om.Group()
+        FLORIS_decomposed = model.add_subsystem(
+            "decomposedFLORIS",
+            farmaero_floris.FLORISAEP(
+                modeling_options=modeling_options,
+                case_title="letsgo",
+                data_path="",
+            ),
+        )
+        prob_decomposed = om.Problem(model)
+        prob_decomposed.setup()
+
+        # two lease blocks, far enough apart to never wake each other
+        X_blocks, Y_blocks = [], []
+        for N_side, offset in [(3, 0.0), (4, 2.0e4)]:
+            X, Y = np.meshgrid(
+                7.0 * 130.0 * np.arange(N_side), 5.0 * 130.0 * np.arange(N_side)
+            )
+            X_blocks.append(X.flatten() + offset)
+            Y_blocks.append(Y.flatten())
+        X, Y = np.concatenate(X_blocks), np.concatenate(Y_blocks)
+
+        self.prob.set_val("aepFLORIS.x_turbines", X)
+        self.prob.set_val("aepFLORIS.y_turbines", Y)
+        self.prob.run_model()
+        prob_decomposed.set_val("decomposedFLORIS.x_turbines", X)
+        prob_decomposed.set_val("decomposedFLORIS.y_turbines", Y)
+        prob_decomposed.run_model()
+
+        with subtests.test("AEP matches the whole farm"):
+            assert np.allclose(
+                prob_decomposed.get_val("decomposedFLORIS.AEP_farm"),
+                self.prob.get_val("aepFLORIS.AEP_farm"),
+                rtol=1.0e-5,
+            )
+        with subtests.test("turbine powers match the whole farm"):
+            assert np.allclose(
+                prob_decomposed.get_val("decomposedFLORIS.power_turbines"),
+                self.prob.get_val("aepFLORIS.power_turbines"),
+                rtol=1.0e-3,
+                atol=1.0e-2 * np.nanmax(self.prob.get_val("aepFLORIS.power_turbines")),
+                equal_nan=True,
+            )
+        with subtests.test("blocks are run separately"):
+            assert FLORIS_decomposed.N_runs_decomposition >= 2
+
+        with subtests.test("clusters of two blocks"):
+            clusters = farmaero_floris.get_wake_clusters(X, Y, 0.0, 130.0)
+            assert len(clusters) >= 2
+            assert not any(
+                np.any(idx_cluster < 9) and np.any(idx_cluster >= 9)
+                for idx_cluster in clusters
+            )
+
+    def test_fidelity_schedule(self, subtests):
+
+        # a scheduled AEP component, with two cheaper levels
+        modeling_options = self.FLORIS.options["modeling_options"]
+        modeling_options["floris"]["fidelity_schedule"] = {
+            "levels": [
+                {
+                    "wind_rose_compression": {"AEP_tolerance": 1.0e-2},
+                    "turbine_grid_points": 1,
+                    "wake_model": {"velocity_model": "jensen"},
+                    "max_iterations": 2,
+                },
+                {
+                    "turbine_grid_points": 1,
+                    "step_size": 1.0,
+                },
+            ],
+        }
+        model = om.Group()
+        FLORIS_scheduled = model.add_subsystem(
+            "scheduledFLORIS",
+            farmaero_floris.FLORISAEP(
+                modeling_options=modeling_options,
+                case_title="letsgo",
+                data_path="",
+            ),
+        )
+        # a downstream component that reads the per-condition farm power, and
+        # raises if it sees a NaN on a weighted condition
+        model.add_subsystem(
+            "scenarios",
+            farmaero_scenarios.AEPScenarios(
+                modeling_options={
+                    "aero": {"scenarios": {"weights": [self.FLORIS.pmf_wind.tolist()]}}
+                },
+            ),
+        )
+        model.connect("scheduledFLORIS.power_farm", "scenarios.power_farm")
+        prob_scheduled = om.Problem(model)
+        prob_scheduled.setup()
+
+        x_turbines = 7.0 * 130.0 * np.arange(-2, 2.1, 1)
+        y_turbines = 5.0 * 130.0 * np.arange(-2, 2.1, 1)
+        X, Y = [v.flatten() for v in np.meshgrid(x_turbines, y_turbines)]
+        self.prob.set_val("aepFLORIS.x_turbines", X)
+        self.prob.set_val("aepFLORIS.y_turbines", Y)
+        self.prob.run_model()
+        AEP_full = self.prob.get_val("aepFLORIS.AEP_farm")
+
+        # two iterations on the first level, then one on the second, before
+        # the layout moves by a step below its tolerance
+        levels = []
+        AEPs = []
+        AEPs_downstream = []
+        for scale in [1.1, 1.05, 1.0, 1.0004, 1.0]:
+            prob_scheduled.set_val("scheduledFLORIS.x_turbines", scale * X)
+            prob_scheduled.set_val("scheduledFLORIS.y_turbines", scale * Y)
+            prob_scheduled.run_model()
+            levels.append(FLORIS_scheduled.fidelity_level)
+            AEPs.append(prob_scheduled.get_val("scheduledFLORIS.AEP_farm")[0])
+            AEPs_downstream.append(prob_scheduled.get_val("scenarios.AEP_scenarios")[0])
+
+        with subtests.test("fidelity levels"):
+            assert levels == [0, 0, 1, 2, 2]
+        with subtests.test("fidelity switches are logged"):
+            assert [
+                (switch["from"], switch["to"])
+                for switch in FLORIS_scheduled.fidelity_history
+            ] == [(0, 1), (1, 2)]
+            assert "iterations" in FLORIS_scheduled.fidelity_history[0]["reason"]
+            assert "step size" in FLORIS_scheduled.fidelity_history[1]["reason"]
+        with subtests.test("lower fidelity approximates the AEP"):
+            assert np.isclose(AEPs[2], AEP_full, rtol=5.0e-2)
+            assert AEPs[2] != AEP_full
+        with subtests.test("full fidelity matches FLORISAEP"):
+            assert np.allclose(AEPs[-1], AEP_full)
+        with subtests.test("compressed level is expanded onto the wind rose"):
+            assert np.allclose(AEPs_downstream[:2], AEPs[:2], rtol=2.0e-2)
+        with subtests.test("uncompressed level gives the per-condition outputs"):
+            assert np.allclose(AEPs_downstream[2:], AEPs[2:], rtol=1.0e-6)
+
+    def test_fidelity_schedule_approx(self, subtests):
+
+        # a small scheduled AEP farm, with a cheaper level for two iterations
+        modeling_options = copy.deepcopy(self.FLORIS.options["modeling_options"])
+        modeling_options["layout"]["N_turbines"] = 4
+        modeling_options["floris"]["fidelity_schedule"] = {
+            "levels": [
+                {
+                    "wind_rose_compression": {"AEP_tolerance": 1.0e-2},
+                    "turbine_grid_points": 1,
+                    "max_iterations": 2,
+                }
+            ],
+        }
+        model = om.Group()
+        FLORIS_scheduled = model.add_subsystem(
+            "scheduledFLORIS",
+            farmaero_floris.FLORISAEP(
+                modeling_options=modeling_options,
+                case_title="letsgo",
+                data_path="",
+            ),
+        )
+        prob_scheduled = om.Problem(model)
+        prob_scheduled.setup()
+
+        x_turbines = 7.0 * 130.0 * np.arange(2)
+        y_turbines = 5.0 * 130.0 * np.arange(2)
+        X, Y = [v.flatten() for v in np.meshgrid(x_turbines, y_turbines)]
+        prob_scheduled.set_val("scheduledFLORIS.x_turbines", X)
+        prob_scheduled.set_val("scheduledFLORIS.y_turbines", Y)
+        prob_scheduled.run_model()
+
+        # finite differences evaluate the component many times over
+        prob_scheduled.compute_totals(
+            "scheduledFLORIS.AEP_farm", "scheduledFLORIS.x_turbines"
+        )
+        prob_scheduled.check_partials(out_stream=None, method="fd", form="central")
+        with subtests.test("finite differences don't advance the fidelity"):
+            assert FLORIS_scheduled.fidelity_level == 0
+            assert len(FLORIS_scheduled._fidelity_iterations) == 1
+            assert FLORIS_scheduled.fidelity_history == []
+
+        # the driver iterations do
+        levels = []
+        for scale in [1.1, 1.2]:
+            prob_scheduled.set_val("scheduledFLORIS.x_turbines", scale * X)
+            prob_scheduled.run_model()
+            levels.append(FLORIS_scheduled.fidelity_level)
+        with subtests.test("driver iterations advance the fidelity"):
+            assert levels == [0, 1]
+
+    def test_snapshot_policy(self, subtests):
+
+        x_turbines = 7.0 * 130.0 * np.arange(-2, 2.1, 1)
+        y_turbines = 7.0 * 130.0 * np.arange(-2, 2.1, 1)
+        X, Y = [v.flatten() for v in np.meshgrid(x_turbines, y_turbines)]
+        modeling_options = self.FLORIS.options["modeling_options"]
+
+        for policy, exists_before_cleanup in [
+            ("never", False),
+            ("always", True),
+            ("final", False),
+        ]:
+            modeling_options["floris"]["snapshot_policy"] = policy
+            self.prob.setup()
+            self.prob.set_val("aepFLORIS.x_turbines", X)
+            self.prob.set_val("aepFLORIS.y_turbines", Y)
+            self.prob.run_model()
+            path_snapshot = self.FLORIS.dir_floris / "batch.yaml"
+
+            if exists_before_cleanup:
+                farmaero_floris.FLORISFarmComponent.flush_snapshots(self.FLORIS)
+            with subtests.test(f"{policy} snapshot before cleanup"):
+                assert path_snapshot.exists() == exists_before_cleanup
+            self.prob.cleanup()
+            with subtests.test(f"{policy} snapshot after cleanup"):
+                assert path_snapshot.exists() == (policy != "never")
+
+        # the final snapshot is of the last evaluation, at its layout
+        with open(path_snapshot) as f_yaml:
+            snapshot = yaml.unsafe_load(f_yaml)  # FLORIS writes the library path
+        with subtests.test("final snapshot layout"):
+            assert np.allclose(snapshot["farm"]["layout_x"], X)
+            assert np.allclose(snapshot["farm"]["layout_y"], Y)
+
+        # finite differences are neither snapshotted nor counted
+        modeling_options["floris"]["snapshot_policy"] = "every"
+        modeling_options["floris"]["snapshot_interval"] = 2
+        self.prob.setup()
+        self.prob.set_val("aepFLORIS.x_turbines", X)
+        self.prob.set_val("aepFLORIS.y_turbines", Y)
+        self.prob.run_model()
+        self.prob.compute_totals("aepFLORIS.AEP_farm", "aepFLORIS.x_turbines")
+        with subtests.test("finite differences not counted"):
+            assert self.FLORIS._N_snapshot_evaluations == 1
+            assert len(self.FLORIS._snapshot_futures) <= 1
+        self.prob.cleanup()
+        del modeling_options["floris"]["snapshot_interval"]
+
+        # an unknown policy is rejected at setup
+        modeling_options["floris"]["snapshot_policy"] = "sometimes"
+        with subtests.test("unknown policy raises"):
+            with pytest.raises(ValueError):
+                self.prob.setup()
+
+    def test_grid_rotation_table(self, subtests):
+
+        # an orientation-table AEP component on the resource direction bins
+        modeling_options = self.FLORIS.options["modeling_options"]
+        modeling_options["floris"]["direction_resolution"] = "resource"
+        model = om.Group()
+        FLORIS_grid = model.add_subsystem(
+            "gridFLORIS",
+            farmaero_floris.FLORISGridAEP(
+                modeling_options=modeling_options,
+                case_title="letsgo",
+                data_path="",
+            ),
+        )
+        prob_grid = om.Problem(model)
+        prob_grid.setup()
+
+        x_turbines = 7.0 * 130.0 * np.arange(-2, 2.1, 1)
+        y_turbines = 5.0 * 130.0 * np.arange(-2, 2.1, 1)
+        X, Y = [v.flatten() for v in np.meshgrid(x_turbines, y_turbines)]
+
+        for angle_orientation in [0.0, 36.0]:
+            angle = np.radians(angle_orientation)
+            X_rotated = np.cos(angle) * X + np.sin(angle) * Y
+            Y_rotated = -np.sin(angle) * X + np.cos(angle) * Y
+
+            self.prob.set_val("aepFLORIS.x_turbines", X_rotated)
+            self.prob.set_val("aepFLORIS.y_turbines", Y_rotated)
+            self.prob.run_model()
+            prob_grid.set_val("gridFLORIS.x_turbines", X_rotated)
+            prob_grid.set_val("gridFLORIS.y_turbines", Y_rotated)
+            prob_grid.set_val("gridFLORIS.angle_orientation", angle_orientation)
+            prob_grid.run_model()
+
+            with subtests.test(f"AEP matches FLORIS at {angle_orientation} deg"):
+                assert np.allclose(
+                    prob_grid.get_val("gridFLORIS.AEP_farm"),
+                    self.prob.get_val("aepFLORIS.AEP_farm"),
+                    rtol=1.0e-6,
+                )
+            with subtests.test(f"power_farm matches FLORIS at {angle_orientation} deg"):
+                assert np.allclose(
+                    prob_grid.get_val("gridFLORIS.power_farm"),
+                    self.prob.get_val("aepFLORIS.power_farm"),
+                    rtol=1.0e-3,
+                    equal_nan=True,
+                )
+
+        with subtests.test("table on the resource direction bins"):
+            assert np.isclose(FLORIS_grid.resolution_table, 18.0)
+        with subtests.test("rotated layout re-uses the table"):
+            assert FLORIS_grid.tables.get_statistics()["misses"] == 1
+            assert FLORIS_grid.tables.get_statistics()["hits"] == 1
+
+    def test_grid_rotation_table_approx(self, subtests):
+
+        # a small farm, as a plain and an orientation-table AEP component
+        modeling_options = copy.deepcopy(self.FLORIS.options["modeling_options"])
+        modeling_options["layout"]["N_turbines"] = 4
+        modeling_options["floris"]["direction_resolution"] = "resource"
+        model = om.Group()
+        model.add_subsystem(
+            "aepFLORIS",
+            farmaero_floris.FLORISAEP(
+                modeling_options=modeling_options,
+                case_title="letsgo",
+                data_path="",
+            ),
+            promotes_inputs=["x_turbines", "y_turbines"],
+        )
+        FLORIS_grid = model.add_subsystem(
+            "gridFLORIS",
+            farmaero_floris.FLORISGridAEP(
+                modeling_options=modeling_options,
+                case_title="letsgo",
+                data_path="",
+            ),
+            promotes_inputs=["x_turbines", "y_turbines", "angle_orientation"],
+        )
+        model.approx_totals(method="fd", step=1.0e-2)
+        prob = om.Problem(model)
+        prob.setup()
+
+        # an orientation between the table directions
+        angle_orientation = 27.0
+        angle = np.radians(angle_orientation)
+        X, Y = [130.0 * v.flatten() for v in np.meshgrid([0.0, 7.0], [0.0, 5.0])]
+        prob.set_val("x_turbines", np.cos(angle) * X + np.sin(angle) * Y)
+        prob.set_val("y_turbines", -np.sin(angle) * X + np.cos(angle) * Y)
+        prob.set_val("angle_orientation", angle_orientation)
+        prob.run_model()
+
+        with subtests.test("table interpolates between the direction bins"):
+            assert not np.isclose(
+                prob.get_val("gridFLORIS.AEP_farm"),
+                prob.get_val("aepFLORIS.AEP_farm"),
+                rtol=1.0e-6,
+            )
+
+        J = prob.compute_totals(
+            ["aepFLORIS.AEP_farm", "gridFLORIS.AEP_farm"],
+            ["x_turbines", "y_turbines", "angle_orientation"],
+        )
+        for name_input in ["x_turbines", "y_turbines"]:
+            with subtests.test(f"gradient w.r.t. {name_input} is the direct one"):
+                assert np.allclose(
+                    J["gridFLORIS.AEP_farm", name_input],
+                    J["aepFLORIS.AEP_farm", name_input],
+                    rtol=1.0e-6,
+                )
+        with subtests.test("gradient w.r.t. the orientation"):
+            assert np.all(np.isfinite(J["gridFLORIS.AEP_farm", "angle_orientation"]))
+        with subtests.test("only the orientation steps use the table"):
+            assert len(FLORIS_grid.tables) == 1
+
+    def test_grid_rotation_table_resolution(self, subtests):
+
+        # the table is on a fine grid unless the resource bins are requested
+        modeling_options = copy.deepcopy(self.FLORIS.options["modeling_options"])
+        modeling_options["layout"]["N_turbines"] = 4
+        for resolution, resolution_expected in [(None, 1.0), ("resource", 18.0)]:
+            if resolution is not None:
+                modeling_options["floris"]["direction_resolution"] = resolution
+            prob = om.Problem()
+            FLORIS_grid = prob.model.add_subsystem(
+                "gridFLORIS",
+                farmaero_floris.FLORISGridAEP(
+                    modeling_options=modeling_options,
+                    case_title="letsgo",
+                    data_path="",
+                ),
+            )
+            prob.setup()
+
+            with subtests.test(f"resolution with {resolution}"):
+                assert np.isclose(FLORIS_grid.resolution_table, resolution_expected)
+
+    def test_verify_wind_rose_compression(self, subtests):
+
+        # turn on wind rose compression and re-setup the problem
+        modeling_options = self.FLORIS.options["modeling_options"]
+        modeling_options["aero"]["wind_rose_compression"] = {
+            "AEP_tolerance": 1.0e-2,
+        }
+        # peak shaving is not in the power curve used for the compression
+        del modeling_options["floris"]["peak_shaving_fraction"]
+        self.prob.setup()
+
+        x_turbines = 7.0 * 130.0 * np.arange(-2, 2.1, 1)
+        y_turbines = 7.0 * 130.0 * np.arange(-2, 2.1, 1)
+        X, Y = [v.flatten() for v in np.meshgrid(x_turbines, y_turbines)]
+        self.prob.set_val("aepFLORIS.x_turbines", X)
+        self.prob.set_val("aepFLORIS.y_turbines", Y)
+        self.prob.run_model()
+
+        with subtests.test("compressed"):
+            assert (
+                self.FLORIS.N_wind_conditions
+                < self.FLORIS.wind_rose_compression["N_conditions_full"]
+            )
+        with subtests.test("output sizes"):
+            assert self.prob.get_val("aepFLORIS.power_farm").shape == (
+                self.FLORIS.N_wind_conditions,
+            )
+
+        AEP_verification = self.FLORIS.verify_wind_rose_compression(X, Y)
+        with subtests.test("compressed AEP matches outputs"):
+            assert np.isclose(
+                AEP_verification["AEP_compressed"],
+                self.prob.get_val("aepFLORIS.AEP_farm", units="W*h"),
+            )
+        with subtests.test("compressed AEP near full AEP"):
+            assert AEP_verification["AEP_error"] < 1.0e-2
+
+    def test_verify_clustered_time_series(self, subtests):
+
+        # a small farm on a clustered time series, with compression also set
+        rng = np.random.default_rng(0)
+        N_times = 2000
+        modeling_options = copy.deepcopy(self.FLORIS.options["modeling_options"])
+        modeling_options["layout"]["N_turbines"] = 4
+        modeling_options["windIO_plant"]["site"]["energy_resource"] = {
+            "wind_resource": {
+                "time": np.arange(N_times).tolist(),
+                "wind_direction": rng.uniform(0.0, 360.0, N_times).tolist(),
+                "wind_speed": (9.0 * rng.weibull(2.0, N_times)).tolist(),
+                "turbulence_intensity": np.full(N_times, 0.06).tolist(),
+            },
+        }
+        modeling_options["aero"]["time_series_clustering"] = {"N_clusters": 50}
+        modeling_options["aero"]["wind_rose_compression"] = {"AEP_tolerance": 1.0e-2}
+        del modeling_options["floris"]["peak_shaving_fraction"]
+
+        prob = om.Problem()
+        FLORIS = prob.model.add_subsystem(
+            "aepFLORIS",
+            farmaero_floris.FLORISAEP(
+                modeling_options=modeling_options,
+                case_title="letsgo",
+                data_path="",
+            ),
+            promotes=["*"],
+        )
+        prob.setup()
+        X = 7.0 * 130.0 * np.array([0.0, 1.0, 0.0, 1.0])
+        Y = 7.0 * 130.0 * np.array([0.0, 0.0, 1.0, 1.0])
+        prob.set_val("x_turbines", X)
+        prob.set_val("y_turbines", Y)
+        prob.run_model()
+
+        with subtests.test("full resource is the unclustered time series"):
+            assert FLORIS.wind_rose_full is FLORIS.wind_time_series_full
+            assert len(FLORIS.wind_rose_full.wind_speeds) == N_times
+        with subtests.test("clustered conditions evaluated"):
+            assert FLORIS.N_wind_conditions == 50
+
+        AEP_verification = FLORIS.verify_wind_rose_compression(X, Y)
+        with subtests.test("reduced AEP matches outputs"):
+            assert np.isclose(
+                AEP_verification["AEP_compressed"],
+                prob.get_val("AEP_farm", units="W*h"),
+            )
+        with subtests.test("full AEP from the full time series"):
+            assert not np.isclose(
+                AEP_verification["AEP_full"],
+                AEP_verification["AEP_compressed"],
+                rtol=1.0e-6,
+            )
+            assert AEP_verification["AEP_error"] < 5.0e-2
@@ -0,0 +1,337 @@
+from pathlib import Path
+
+import yaml
+
+import numpy as np
+import openmdao.api as om
+
+import floris
+import pytest
+import ard
+import ard.farm_aero.floris as farmaero_floris
+import ard.farm_aero.gaussian as farmaero_gaussian
+
+
+def make_modeling_options(N_turbines, gaussian_wake=None):
+    """a unit test modeling options dictionary on a coarse wind rose"""
+
+    wind_rose = floris.WindRose(
+        wind_directions=np.linspace(0.0, 330.0, 12),
+        wind_speeds=np.linspace(2.0, 26.0, 13),
+        ti_table=0.06,
+    )
+    path_turbine = (
+        Path(ard.__file__).parents[1]
+        / "examples"
+        / "data"
+        / "windIO-plant_turbine_IEA-3.4MW-130m-RWT.yaml"
+    )
+    with open(path_turbine) as f_yaml:
+        data_turbine_yaml = yaml.safe_load(f_yaml)
+
+    return {
+        "windIO_plant": {
+            "wind_farm": {
+                "name": "unit test farm",
+                "turbine": data_turbine_yaml,
+            },
+            "site": {
+                "energy_resource": {
+                    "wind_resource": {
+                        "wind_direction": wind_rose.wind_directions.tolist(),
+                        "wind_speed": wind_rose.wind_speeds.tolist(),
+                        "probability": {
+                            "data": wind_rose.freq_table.tolist(),
+                            "dim": ["wind_direction", "wind_speed"],
+                        },
+                        "turbulence_intensity": {
+                            "data": wind_rose.ti_table.tolist(),
+                            "dim": ["wind_direction", "wind_speed"],
+                        },
+                    },
+                },
+            },
+        },
+        "layout": {
+            "N_turbines": N_turbines,
+        },
+        "aero": {
+            "return_turbine_output": True,
+        },
+        "gaussian_wake": {} if gaussian_wake is None else gaussian_wake,
+    }
+
+
+@pytest.mark.usefixtures("subtests")
+class TestGaussianWakeAEP:
+
+    def setup_method(self):
+
+        # a 3x3 grid farm
+        self.x_turbines, self.y_turbines = [
+            130.0 * v.flatten()
+            for v in np.meshgrid(7.0 * np.arange(3.0), 5.0 * np.arange(3.0))
+        ]
+
+        model = om.Group()
+        self.gaussian = model.add_subsystem(
+            "aepGaussian",
+            farmaero_gaussian.GaussianWakeAEP(
+                modeling_options=make_modeling_options(len(self.x_turbines)),
+                data_path="",
+            ),
+        )
+        self.prob = om.Problem(model)
+        self.prob.setup()
+
+    def test_compute_unwaked(self, subtests):
+
+        # spread the turbines far enough apart that the wakes have recovered
+        self.prob.set_val("aepGaussian.x_turbines", 1.0e4 * self.x_turbines)
+        self.prob.set_val("aepGaussian.y_turbines", 1.0e4 * self.y_turbines)
+        self.prob.run_model()
+
+        # every turbine sees the free stream, so the AEP follows the power curve
+        speeds_curve, power_curve, _ = self.gaussian.turbine_arrays
+        _, speeds, _ = self.gaussian.wind_arrays
+        power_free = np.interp(speeds, speeds_curve, power_curve)
+        AEP_free = (
+            len(self.x_turbines) * 8760.0 * np.sum(self.gaussian.pmf_array * power_free)
+        )
+
+        with subtests.test("unwaked turbine powers"):
+            assert np.allclose(
+                self.prob.get_val("aepGaussian.power_turbines"),
+                np.tile(power_free, (len(self.x_turbines), 1)),
+                rtol=1.0e-6,
+            )
+        with subtests.test("unwaked AEP"):
+            assert np.isclose(
+                self.prob.get_val("aepGaussian.AEP_farm"), AEP_free, rtol=1.0e-6
+            )
+
+        # the wakes reduce the AEP of the packed farm
+        self.prob.set_val("aepGaussian.x_turbines", self.x_turbines)
+        self.prob.set_val("aepGaussian.y_turbines", self.y_turbines)
+        self.prob.run_model()
+
+        with subtests.test("waked AEP"):
+            assert 0.8 * AEP_free < self.prob.get_val("aepGaussian.AEP_farm") < AEP_free
+        with subtests.test("farm power sums turbine powers"):
+            assert np.allclose(
+                self.prob.get_val("aepGaussian.power_farm"),
+                np.sum(self.prob.get_val("aepGaussian.power_turbines"), axis=0),
+            )
+
+    def test_compute_partials(self, subtests):
+
+        # offset the grid so no turbine sits on the edge of a wake, and yaw it
+        rng = np.random.default_rng(0)
+        self.prob.set_val(
+            "aepGaussian.x_turbines", self.x_turbines + rng.uniform(-50, 50, 9)
+        )
+        self.prob.set_val(
+            "aepGaussian.y_turbines", self.y_turbines + rng.uniform(-50, 50, 9)
+        )
+        self.prob.set_val("aepGaussian.yaw_turbines", rng.uniform(-15, 15, 9))
+        self.prob.run_model()
+
+        data_check = self.prob.check_partials(
+            out_stream=None,
+            method="fd",
+            form="central",
+            step=1.0e-3,
+        )
+        for name_input in ["x_turbines", "y_turbines", "yaw_turbines"]:
+            data = data_check["aepGaussian"][("AEP_farm", name_input)]
+            with subtests.test(f"AEP_farm partials w.r.t. {name_input}"):
+                assert np.allclose(
+                    data["J_fwd"],
+                    data["J_fd"],
+                    rtol=1.0e-3,
+                    atol=1.0e-6 * np.max(np.abs(data["J_fd"])),
+                )
+
+    def test_deficit_combination(self, subtests):
+
+        AEP = {}
+        for deficit_combination in ["linear", "sos"]:
+            prob = om.Problem()
+            prob.model.add_subsystem(
+                "aepGaussian",
+                farmaero_gaussian.GaussianWakeAEP(
+                    modeling_options=make_modeling_options(
+                        len(self.x_turbines),
+                        {"deficit_combination": deficit_combination},
+                    ),
+                ),
+            )
+            prob.setup()
+            prob.set_val("aepGaussian.x_turbines", self.x_turbines)
+            prob.set_val("aepGaussian.y_turbines", self.y_turbines)
+            prob.run_model()
+            AEP[deficit_combination] = prob.get_val("aepGaussian.AEP_farm")
+
+        with subtests.test("linear superposition gives the larger deficit"):
+            assert AEP["linear"] < AEP["sos"]
+
+        with subtests.test("unknown deficit combination"):
+            prob = om.Problem()
+            prob.model.add_subsystem(
+                "aepGaussian",
+                farmaero_gaussian.GaussianWakeAEP(
+                    modeling_options=make_modeling_options(
+                        len(self.x_turbines),
+                        {"deficit_combination": "max"},
+                    ),
+                ),
+            )
+            with pytest.raises(ValueError):
+                prob.setup()
+
+    def test_compare_FLORIS(self, subtests):
+
+        # the default FLORIS Gaussian wake, without peak shaving
+        prob = om.Problem()
+        prob.model.add_subsystem(
+            "aepFLORIS",
+            farmaero_floris.FLORISAEP(
+                modeling_options=make_modeling_options(len(self.x_turbines)),
+                case_title="letsgo",
+                data_path="",
+            ),
+        )
+        prob.setup()
+
+        for name_case, scale in [("unwaked", 1.0e4), ("waked", 1.0)]:
+            for prob_case, name in [(self.prob, "aepGaussian"), (prob, "aepFLORIS")]:
+                prob_case.set_val(f"{name}.x_turbines", scale * self.x_turbines)
+                prob_case.set_val(f"{name}.y_turbines", scale * self.y_turbines)
+                prob_case.run_model()
+
+            # the models differ in their rotor averaging and added turbulence,
+            # by about 0.6% unwaked and 1.7% waked on the 3x3 grid
+            with subtests.test(f"{name_case} AEP matches FLORIS"):
+                assert np.isclose(
+                    self.prob.get_val("aepGaussian.AEP_farm"),
+                    prob.get_val("aepFLORIS.AEP_farm"),
+                    rtol=3.0e-2,
+                )
+
+
+@pytest.mark.usefixtures("subtests")
+class TestGaussianWakeAEPTimeSeries:
+
+    def setup_method(self):
+
+        # a year of hourly conditions, with a partial last chunk
+        rng = np.random.default_rng(0)
+        N_times = 8760
+        self.directions = rng.uniform(0.0, 360.0, N_times)
+        self.speeds = 9.0 * rng.weibull(2.0, N_times)
+        self.TIs = np.full(N_times, 0.06)
+
+        self.modeling_options = make_modeling_options(4, {"N_chunk": 64})
+        self.modeling_options["windIO_plant"]["site"]["energy_resource"] = {
+            "wind_resource": {
+                "time": np.arange(N_times).tolist(),
+                "wind_direction": self.directions.tolist(),
+                "wind_speed": self.speeds.tolist(),
+                "turbulence_intensity": self.TIs.tolist(),
+            },
+        }
+
+        self.x_turbines = 130.0 * np.array([0.0, 6.0, 12.0, 3.0])
+        self.y_turbines = 130.0 * np.array([0.0, 1.0, -1.0, 5.0])
+        self.yaw_turbines = np.array([10.0, -5.0, 0.0, 5.0])
+
+    def test_kernel_chunks(self, subtests):
+
+        gaussian = farmaero_gaussian.GaussianWakeAEP(
+            modeling_options=make_modeling_options(4)
+        )
+        prob = om.Problem()
+        prob.model.add_subsystem("aepGaussian", gaussian)
+        prob.setup()
+        args = (
+            self.x_turbines,
+            self.y_turbines,
+            self.yaw_turbines,
+            np.full(len(self.speeds), 1.0 / len(self.speeds)),
+            self.directions,
+            self.speeds,
+            self.TIs,
+            *gaussian.turbine_arrays,
+        )
+
+        results = {}
+        for N_chunk in [256, len(self.speeds)]:
+            power_turbines, _ = farmaero_gaussian.calculate_gaussian_wake_performance(
+                *args[:3],
+                *args[4:],
+                **gaussian.turbine_parameters,
+                N_chunk=N_chunk,
+            )
+            AEP, grads = farmaero_gaussian.calculate_gaussian_wake_AEP_grad(
+                *args, **gaussian.turbine_parameters, N_chunk=N_chunk
+            )
+            results[N_chunk] = (np.array(power_turbines), AEP, grads)
+
+        power_chunked, AEP_chunked, grads_chunked = results[256]
+        power_full, AEP_full, grads_full = results[len(self.speeds)]
+        with subtests.test("chunked powers match unchunked"):
+            assert power_chunked.shape == (len(self.speeds), 4)
+            assert np.allclose(power_chunked, power_full, rtol=1.0e-10)
+        with subtests.test("chunked AEP matches unchunked"):
+            assert np.isclose(AEP_chunked, AEP_full, rtol=1.0e-10)
+        with subtests.test("chunked AEP matches chunked powers"):
+            assert np.isclose(
+                AEP_chunked, 8760.0 * np.mean(np.sum(power_chunked, axis=1))
+            )
+        for grad_chunked, grad_full in zip(grads_chunked, grads_full):
+            with subtests.test("chunked gradient matches unchunked"):
+                assert np.allclose(
+                    grad_chunked,
+                    grad_full,
+                    rtol=1.0e-8,
+                    atol=1.0e-12 * np.max(np.abs(grad_full)),
+                )
+
+    def test_compute_clustered(self, subtests):
+
+        self.modeling_options["aero"]["time_series_clustering"] = {
+            "N_clusters": 200,
+        }
+        prob = om.Problem()
+        prob.model.add_subsystem(
+            "aepGaussian",
+            farmaero_gaussian.GaussianWakeAEP(modeling_options=self.modeling_options),
+            promotes=["*"],
+        )
+        prob.setup()
+        prob.set_val("x_turbines", self.x_turbines)
+        prob.set_val("y_turbines", self.y_turbines)
+        prob.set_val("yaw_turbines", self.yaw_turbines)
+        prob.run_model()
+
+        with subtests.test("clustered conditions evaluated"):
+            assert prob.get_val("power_turbines").shape == (4, 200)
+        with subtests.test("clustered AEP"):
+            assert np.isclose(
+                prob.get_val("AEP_farm"),
+                8760.0
+                * np.sum(prob.model.aepGaussian.pmf_array * prob.get_val("power_farm")),
+            )
+
+        data_check = prob.check_partials(
+            out_stream=None, method="fd", form="central", step=1.0e-3
+        )
+        for name_input in ["x_turbines", "y_turbines", "yaw_turbines"]:
+            data = data_check["aepGaussian"][("AEP_farm", name_input)]
+            with subtests.test(f"AEP_farm partials w.r.t. {name_input}"):
+                assert np.allclose(
+                    data["J_fwd"],
+                    data["J_fd"],
+                    rtol=1.0e-3,
+                    atol=1.0e-6 * np.max(np.abs(data["J_fd"])),
+                )
@@ -0,0 +1,145 @@
+import numpy as np
+import openmdao.api as om
+
+import pytest
+import ard.farm_aero.scenarios as farmaero_scenarios
+
+
+@pytest.mark.usefixtures("subtests")
+class TestAEPScenarioFunctions:
+
+    def setup_method(self):
+
+        # three "years" of a synthetic hourly farm power time series
+        rng = np.random.default_rng(0)
+        self.N_years = 3
+        self.years = np.repeat(np.arange(2020, 2020 + self.N_years), 8760)
+        self.power_farm = (
+            1.0e7 * rng.random(self.years.size) * (1.0 + 0.1 * (self.years - 2020))
+        )
+
+    def test_compute_AEP_scenarios(self, subtests):
+
+        weights_years = farmaero_scenarios.get_group_weights(self.years)
+        AEP_years = farmaero_scenarios.compute_AEP_scenarios(
+            self.power_farm, weights_years
+        )
+
+        with subtests.test("one scenario per year"):
+            assert AEP_years.shape == (self.N_years,)
+        with subtests.test("AEP of each year"):
+            for idx_year in range(self.N_years):
+                power_year = self.power_farm[self.years == 2020 + idx_year]
+                assert np.isclose(AEP_years[idx_year], np.sum(power_year))
+        with subtests.test("AEP of all years"):
+            assert np.isclose(
+                farmaero_scenarios.compute_AEP_scenarios(
+                    self.power_farm, np.ones(self.power_farm.size)
+                )[0],
+                np.mean(AEP_years),
+            )
+
+        # unevaluated conditions can't be weighted
+        power_farm = self.power_farm.copy()
+        power_farm[0] = np.nan
+        with subtests.test("unweighted NaN conditions are skipped"):
+            assert np.isfinite(
+                farmaero_scenarios.compute_AEP_scenarios(power_farm, weights_years[1:])
+            ).all()
+        with subtests.test("weighted NaN conditions raise"):
+            with pytest.raises(ValueError):
+                farmaero_scenarios.compute_AEP_scenarios(power_farm, weights_years)
+        with subtests.test("mismatched conditions raise"):
+            with pytest.raises(ValueError):
+                farmaero_scenarios.compute_AEP_scenarios(
+                    self.power_farm[1:], weights_years
+                )
+
+    def test_bootstrap_AEP(self, subtests):
+
+        AEP_all = farmaero_scenarios.compute_AEP_scenarios(
+            self.power_farm, np.ones(self.power_farm.size)
+        )[0]
+        AEP_years = farmaero_scenarios.compute_AEP_scenarios(
+            self.power_farm, farmaero_scenarios.get_group_weights(self.years)
+        )
+
+        AEP_samples = farmaero_scenarios.bootstrap_AEP(
+            self.power_farm, groups=self.years, N_samples=500, seed=1
+        )
+        with subtests.test("bootstrap samples"):
+            assert AEP_samples.shape == (500,)
+        with subtests.test("bootstrap samples are mixtures of the years"):
+            assert np.all(AEP_samples >= np.min(AEP_years) * (1.0 - 1.0e-12))
+            assert np.all(AEP_samples <= np.max(AEP_years) * (1.0 + 1.0e-12))
+        with subtests.test("bootstrap mean"):
+            assert np.isclose(np.mean(AEP_samples), AEP_all, rtol=1.0e-2)
+        with subtests.test("bootstrap is reproducible"):
+            assert np.array_equal(
+                AEP_samples,
+                farmaero_scenarios.bootstrap_AEP(
+                    self.power_farm, groups=self.years, N_samples=500, seed=1
+                ),
+            )
+
+        exceedance = farmaero_scenarios.get_exceedance_AEP(AEP_samples)
+        with subtests.test("P90 is exceeded more often than P50"):
+            assert exceedance["P90"] <= exceedance["P50"]
+            assert np.mean(AEP_samples >= exceedance["P90"]) >= 0.9
+
+
+@pytest.mark.usefixtures("subtests")
+class TestAEPScenarios:
+
+    def setup_method(self):
+
+        # a coarse wind rose power table and alternative probability tables
+        rng = np.random.default_rng(0)
+        self.N_wind_conditions = 24
+        self.power_farm = 1.0e7 * rng.random(self.N_wind_conditions)
+        self.power_farm[-1] = np.nan  # a zero-frequency bin of the base rose
+        self.weights = rng.random((5, self.N_wind_conditions))
+        self.weights[:, -1] = 0.0
+
+        modeling_options = {
+            "aero": {
+                "scenarios": {
+                    "weights": self.weights.tolist(),
+                    "bootstrap": {"N_samples": 200, "levels": [50, 75, 90]},
+                },
+            },
+        }
+
+        model = om.Group()
+        model.add_subsystem(
+            "scenarios",
+            farmaero_scenarios.AEPScenarios(modeling_options=modeling_options),
+        )
+        self.prob = om.Problem(model)
+        self.prob.setup()
+        self.prob.set_val("scenarios.power_farm", self.power_farm)
+        self.prob.run_model()
+
+    def test_compute(self, subtests):
+
+        pmf = self.weights / np.sum(self.weights, axis=1, keepdims=True)
+        with subtests.test("scenario AEPs"):
+            assert np.allclose(
+                self.prob.get_val("scenarios.AEP_scenarios"),
+                8760.0 * pmf[:, :-1] @ self.power_farm[:-1],
+            )
+        with subtests.test("exceedance levels"):
+            assert (
+                self.prob.get_val("scenarios.AEP_P90")
+                <= self.prob.get_val("scenarios.AEP_P75")
+                <= self.prob.get_val("scenarios.AEP_P50")
+            )
+
+    def test_compute_partials(self, subtests):
+
+        J = self.prob.compute_totals("scenarios.AEP_scenarios", "scenarios.power_farm")[
+            ("scenarios.AEP_scenarios", "scenarios.power_farm")
+        ]
+        pmf = self.weights / np.sum(self.weights, axis=1, keepdims=True)
+        with subtests.test("scenario AEP partials"):
+            assert np.allclose(J[:, :-1], 8760.0 * pmf[:, :-1])
@@ -265,3 +265,172 @@ class TestFarmAEPTemplate:
             self.prob.set_val("y_turbines", y_turbines)
             self.prob.set_val("yaw_turbines", yaw_turbines)
             self.prob.run_model()
+
+
+@pytest.mark.usefixtures("subtests")
+class TestCompressWindRose:
+
+    def setup_method(self):
+
+        # a fine wind rose with a Weibull speed distribution
+        directions = np.arange(0.0, 360.0, 10.0)
+        speeds = np.arange(0.25, 30.0, 0.5)
+        k_weibull, A_weibull = 2.0, 9.0
+        pdf_speed = (
+            (k_weibull / A_weibull)
+            * (speeds / A_weibull) ** (k_weibull - 1)
+            * np.exp(-((speeds / A_weibull) ** k_weibull))
+        )
+        pdf_direction = 1.0 + 0.8 * np.cos(np.radians(directions - 270.0))
+        self.wind_rose = floris.WindRose(
+            wind_directions=directions,
+            wind_speeds=speeds,
+            freq_table=np.outer(pdf_direction, pdf_speed),
+            ti_table=0.06,
+        )
+
+        # a synthetic power curve with cut-in at 3 m/s and rated at 11 m/s
+        self.wind_speeds_power_curve = np.linspace(0.0, 25.0, 101)
+        self.power_curve = np.clip(
+            (self.wind_speeds_power_curve**3 - 3.0**3) / (11.0**3 - 3.0**3),
+            0.0,
+            1.0,
+        )
+
+    def test_compress_wind_rose(self, subtests):
+
+        for AEP_tolerance in [1.0e-2, 1.0e-3]:
+            wind_resource, summary = templates.compress_wind_rose(
+                self.wind_rose,
+                self.wind_speeds_power_curve,
+                self.power_curve,
+                AEP_tolerance=AEP_tolerance,
+            )
+
+            with subtests.test(f"tolerance met, {AEP_tolerance}"):
+                assert summary["AEP_error"] <= AEP_tolerance
+            with subtests.test(f"compressed, {AEP_tolerance}"):
+                assert summary["N_conditions"] < summary["N_conditions_full"]
+                assert summary["N_conditions"] == len(wind_resource.freq)
+            with subtests.test(f"probability conserved, {AEP_tolerance}"):
+                assert np.isclose(np.sum(wind_resource.freq), 1.0)
+            with subtests.test(f"below cut-in merged, {AEP_tolerance}"):
+                assert np.sum(wind_resource.wind_speeds < 3.0) == 1
+
+    def test_compress_wind_rose_probability_threshold(self, subtests):
+
+        probability_threshold = 1.0e-3
+        wind_resource, summary = templates.compress_wind_rose(
+            self.wind_rose,
+            self.wind_speeds_power_curve,
+            self.power_curve,
+            AEP_tolerance=1.0e-4,
+            probability_threshold=probability_threshold,
+        )
+
+        # the live conditions are all above the threshold after merging
+        mask_live = wind_resource.wind_speeds >= 3.0
+        with subtests.test("low-probability cells merged"):
+            assert np.all(wind_resource.freq[mask_live] >= probability_threshold)
+        with subtests.test("probability conserved"):
+            assert np.isclose(np.sum(wind_resource.freq), 1.0)
+
+    def test_get_power_curve_from_windIO(self, subtests):
+
+        windIOturbine = {
+            "rotor_diameter": 100.0,
+            "performance": {
+                "rated_power": 1.0e6,
+                "Cp_curve": {
+                    "Cp_wind_speeds": [3.0, 10.0, 25.0],
+                    "Cp_values": [0.4, 0.4, 0.4],
+                },
+            },
+        }
+        wind_speeds, power = templates.get_power_curve_from_windIO(windIOturbine)
+
+        with subtests.test("speeds"):
+            assert np.allclose(wind_speeds, [3.0, 10.0, 25.0])
+        with subtests.test("power from Cp"):
+            assert np.isclose(power[0], 0.5 * 1.225 * np.pi * 50.0**2 * 3.0**3 * 0.4)
+        with subtests.test("power capped at rated"):
+            assert np.allclose(power[1:], 1.0e6)
+
+
+@pytest.mark.usefixtures("subtests")
+class TestClusterTimeSeries:
+
+    def setup_method(self):
+
+        rng = np.random.default_rng(0)
+        N_conditions = 2000
+        self.time_series = floris.TimeSeries(
+            wind_directions=np.round(rng.random(N_conditions) * 360.0, 1),
+            wind_speeds=np.round(rng.weibull(2.0, N_conditions) * 9.0, 2),
+            turbulence_intensities=np.round(0.06 + 0.02 * rng.random(N_conditions), 3),
+        )
+        self.thrust_coefficient_curve = (
+            np.array([3.0, 11.0, 25.0]),
+            np.array([0.8, 0.8, 0.1]),
+        )
+
+    def test_cluster_time_series(self, subtests):
+
+        for method in ["kmeans", "kmedoids"]:
+            wind_resource, summary = templates.cluster_time_series(
+                self.time_series,
+                50,
+                method=method,
+            )
+
+            with subtests.test(f"number of conditions, {method}"):
+                assert summary["N_conditions"] == 50
+                assert len(wind_resource.wind_speeds) == 50
+            with subtests.test(f"probability conserved, {method}"):
+                assert np.isclose(np.sum(wind_resource.freq), 1.0)
+            with subtests.test(f"mean speed preserved, {method}"):
+                assert np.isclose(
+                    np.sum(wind_resource.freq * wind_resource.wind_speeds),
+                    np.mean(self.time_series.wind_speeds),
+                    rtol=2.0e-2,
+                )
+
+        # medoids are members of the time series
+        with subtests.test("medoids are conditions of the time series"):
+            assert np.all(
+                np.isin(wind_resource.wind_speeds, self.time_series.wind_speeds)
+            )
+
+    def test_cluster_time_series_extremes(self, subtests):
+
+        wind_resource, summary = templates.cluster_time_series(
+            self.time_series,
+            50,
+            N_extreme=3,
+            thrust_coefficient_curve=self.thrust_coefficient_curve,
+        )
+
+        # the highest-thrust conditions are kept as they are
+        thrust = (
+            np.interp(self.time_series.wind_speeds, *self.thrust_coefficient_curve)
+            * self.time_series.wind_speeds**2
+        )
+        speeds_extreme = self.time_series.wind_speeds[np.argsort(thrust)[-3:]]
+
+        with subtests.test("number of conditions"):
+            assert summary["N_conditions"] == 53
+        with subtests.test("extreme conditions kept"):
+            assert np.all(np.isin(speeds_extreme, wind_resource.wind_speeds[-3:]))
+        with subtests.test("extreme conditions weighted as single records"):
+            assert np.allclose(
+                wind_resource.freq[-3:], 1.0 / len(self.time_series.wind_speeds)
+            )
+
+    def test_cluster_time_series_errors(self, subtests):
+
+        with subtests.test("unknown method"):
+            with pytest.raises(ValueError):
+                templates.cluster_time_series(self.time_series, 10, method="dbscan")
+        with subtests.test("extremes without a thrust curve"):
+            with pytest.raises(ValueError):
+                templates.cluster_time_series(self.time_series, 10, N_extreme=3)
@@ -630,3 +630,131 @@ class TestFarmBoundaryDistancePolygon:
                 derivatives_expected[("boundary_distances", "y_turbines")],
                 atol=1e-3,
             )
+
+    def test_multi_polygon_engines(self, subtests):
+
+        boundary_vertices_0 = np.array(
+            [
+                [0.0, 0.0],
+                [1000.0, 0.0],
+                [1000.0, 200.0],
+                [0.0, 200.0],
+            ]
+        )
+
+        boundary_vertices_1 = np.array(
+            [
+                [0.0, 300.0],
+                [1000.0, 300.0],
+                [1000.0, 1000.0],
+                [1100.0, 1100.0],
+                [0.0, 1100.0],
+            ]
+        )
+
+        region_assignments = np.ones(self.N_turbines, dtype=int)
+        region_assignments[0:3] = 0
+
+        # solve with each polygon engine
+        results = {}
+        for polygon_engine in ["switch", "padded", "sdf"]:
+            modeling_options_multi = {
+                "windIO_plant": {
+                    "name": "unit test dummy",
+                    "site": {
+                        "name": "unit test site",
+                        "boundaries": {
+                            "polygons": [
+                                {
+                                    "x": boundary_vertices_0[:, 0].tolist(),
+                                    "y": boundary_vertices_0[:, 1].tolist(),
+                                },
+                                {
+                                    "x": boundary_vertices_1[:, 0].tolist(),
+                                    "y": boundary_vertices_1[:, 1].tolist(),
+                                },
+                            ]
+                        },
+                    },
+                },
+                "layout": {
+                    "N_turbines": self.N_turbines,
+                },
+                "boundary": {
+                    "turbine_region_assignments": region_assignments,
+                    "polygon_engine": polygon_engine,
+                },
+            }
+
+            prob = om.Problem()
+            prob.model.add_subsystem(
+                "boundary",
+                boundary.FarmBoundaryDistancePolygon(
+                    modeling_options=modeling_options_multi,
+                ),
+                promotes=["*"],
+            )
+            prob.setup()
+            prob.set_val("x_turbines", self.x_turbines)
+            prob.set_val("y_turbines", self.y_turbines)
+            prob.run_model()
+
+            results[polygon_engine] = (
+                prob.get_val("boundary_distances").copy(),
+                prob.compute_totals(
+                    of=["boundary_distances"],
+                    wrt=["x_turbines", "y_turbines"],
+                ),
+            )
+
+            if polygon_engine == "sdf":
+                with subtests.test("exact distances available"):
+                    assert np.allclose(
+                        prob.model.boundary.compute_exact_distances(
+                            self.x_turbines, self.y_turbines
+                        ),
+                        results["switch"][0],
+                    )
+
+        # the signed distance field is interpolated, so compare to grid-scale
+        # accuracy; its derivatives at the polygon corners, where several
+        # turbines sit, are not comparable to the exact (kinked) distances
+        tolerances = {"padded": (1e-3, 1e-6), "sdf": (2.0, None)}
+        for polygon_engine, (atol_values, atol_derivatives) in tolerances.items():
+            with subtests.test(f"{polygon_engine} distances match"):
+                assert np.allclose(
+                    results[polygon_engine][0],
+                    results["switch"][0],
+                    atol=atol_values,
+                )
+            if atol_derivatives is None:
+                continue
+            for wrt in ["x_turbines", "y_turbines"]:
+                with subtests.test(f"{polygon_engine} derivatives match wrt {wrt}"):
+                    assert np.allclose(
+                        results[polygon_engine][1][("boundary_distances", wrt)],
+                        results["switch"][1][("boundary_distances", wrt)],
+                        atol=atol_derivatives,
+                    )
+
+    def test_unknown_polygon_engine(self):
+
+        modeling_options = {
+            "windIO_plant": {
+                "site": {
+                    "boundaries": {
+                        "polygons": [{"x": [0.0, 1.0, 1.0], "y": [0.0, 0.0, 1.0]}]
+                    },
+                },
+            },
+            "layout": {"N_turbines": 2},
+            "boundary": {"polygon_engine": "unknown"},
+        }
+
+        prob = om.Problem()
+        prob.model.add_subsystem(
+            "boundary",
+            boundary.FarmBoundaryDistancePolygon(modeling_options=modeling_options),
+        )
+        with pytest.raises(ValueError):
+            prob.setup()
@@ -37,6 +37,27 @@ class TestTurbineSpacingFunctions:
                 ),
             )
 
+    def test_calculate_turbine_spacing_sparse_jac(self, subtests):
+
+        x_turbines = np.array([0.0, 0.0, 10.0, 3.0])
+        y_turbines = np.array([0.0, 10.0, 0.0, 7.0])
+        N_turbines = len(x_turbines)
+        N_distances = N_turbines * (N_turbines - 1) // 2
+
+        rows, cols = ard.layout.spacing.get_turbine_spacing_sparsity(N_turbines)
+        test_result = ard.layout.spacing.calculate_turbine_spacing_sparse_jac(
+            x_turbines, y_turbines
+        )
+        dense_result = ard.layout.spacing.calculate_turbine_spacing_jac(
+            x_turbines, y_turbines
+        )
+
+        for idx_dim, dim in enumerate(["x", "y"]):
+            jacobian_assembled = np.zeros((N_distances, N_turbines))
+            jacobian_assembled[rows, cols] = test_result[idx_dim]
+            with subtests.test(f"sparse derivatives match dense wrt {dim}"):
+                assert np.allclose(jacobian_assembled, dense_result[idx_dim])
+
 
 @pytest.mark.usefixtures("subtests")
 class TestTurbineSpacingComponent:
@@ -101,3 +122,119 @@ class TestTurbineSpacingComponent:
                 totals[("turbine_spacing", "y_turbines")],
                 totals_expected[("turbine_spacing", "y_turbines")],
             )
+
+
+@pytest.mark.usefixtures("subtests")
+class TestTurbineSpacingNeighborsComponent:
+    def setup_method(self):
+        # 4x4 grid with 1 km spacing and a random perturbation
+        rng = np.random.default_rng(42)
+        X, Y = np.meshgrid(np.arange(4.0), np.arange(4.0))
+        self.xt_in = X.flatten() + 0.1 * rng.random(X.size)
+        self.yt_in = Y.flatten() + 0.1 * rng.random(Y.size)
+
+        self.N_turbines = len(self.xt_in)
+        self.N_neighbors = 4
+
+        modeling_options = {
+            "layout": {
+                "N_turbines": self.N_turbines,
+            },
+            "spacing": {
+                "N_neighbors": self.N_neighbors,
+            },
+        }
+
+        prob = om.Problem(model=om.Group())
+        prob.model.add_subsystem(
+            "sc",
+            ard.layout.spacing.TurbineSpacingNeighbors(
+                modeling_options=modeling_options,
+            ),
+            promotes=["*"],
+        )
+
+        prob.model.set_input_defaults("x_turbines", self.xt_in, units="km")
+        prob.model.set_input_defaults("y_turbines", self.yt_in, units="km")
+        prob.setup()
+        prob.run_model()
+
+        self.prob = prob
+
+    def test_neighbor_spacing_output(self, subtests):
+
+        spacing_all = ard.layout.spacing.calculate_turbine_spacing(
+            self.xt_in, self.yt_in
+        )
+
+        with subtests.test("fixed output size"):
+            assert len(self.prob["turbine_spacing"]) == (
+                self.N_turbines * self.N_neighbors
+            )
+
+        with subtests.test("closest pair is retained"):
+            assert np.isclose(np.min(self.prob["turbine_spacing"]), np.min(spacing_all))
+
+        with subtests.test("retained pairs include the closest pairs"):
+            assert np.all(
+                np.isin(
+                    np.round(np.sort(spacing_all)[:4], 10),
+                    np.round(self.prob["turbine_spacing"], 10),
+                )
+            )
+
+        with subtests.test("padding repeats the farthest retained pair"):
+            N_retained = len(np.unique(np.round(self.prob["turbine_spacing"], 10)))
+            assert np.allclose(
+                self.prob["turbine_spacing"][N_retained - 1 :],
+                np.max(self.prob["turbine_spacing"]),
+            )
+
+    def test_neighbor_spacing_partials(self, subtests):
+
+        check_partials_data = self.prob.check_partials(out_stream=None)
+
+        for key, data in check_partials_data["sc"].items():
+            with subtests.test(f"partials of {key}"):
+                assert np.allclose(data["J_fwd"], data["J_fd"], atol=1.0e-5)
+            with subtests.test(f"reverse partials of {key}"):
+                assert np.allclose(data["J_rev"], data["J_fd"], atol=1.0e-5)
+
+    def test_neighbor_spacing_totals(self, subtests):
+
+        totals = {}
+        for mode in ["fwd", "rev"]:
+            self.prob.setup(mode=mode)
+            self.prob.run_model()
+            totals[mode] = self.prob.compute_totals(
+                "turbine_spacing", ["x_turbines", "y_turbines"], return_format="array"
+            )
+
+        with subtests.test("forward and reverse totals match"):
+            assert np.allclose(totals["fwd"], totals["rev"])
+
+        # each row holds the derivatives of one pair, with two nonzeros each
+        for idx_input, name_input in enumerate(["x_turbines", "y_turbines"]):
+            columns = slice(
+                idx_input * self.N_turbines, (idx_input + 1) * self.N_turbines
+            )
+            with subtests.test(f"two nonzeros per row w.r.t. {name_input}"):
+                assert np.all(np.count_nonzero(totals["fwd"][:, columns], axis=1) <= 2)
+
+    def test_neighbor_pairs_radius_cutoff(self):
+
+        i_indices, j_indices, mask_pairs = (
+            ard.layout.spacing.get_turbine_spacing_neighbor_pairs(
+                np.array([0.0, 1.0, 5.0, 5.5]),
+                np.array([0.0, 0.0, 0.0, 0.0]),
+                N_neighbors=3,
+                N_pairs_max=6,
+                radius_cutoff=1.5,
+            )
+        )
+
+        assert np.all(mask_pairs == np.array([True, True, False, False, False, False]))
+        assert set(zip(i_indices[mask_pairs], j_indices[mask_pairs])) == {
+            (0, 1),
+            (2, 3),
+        }
@@ -230,6 +230,150 @@ class TestMooringConstraint2Turbines1Anchors3D:
         )
 
 
+@pytest.mark.usefixtures("subtests")
+class TestMooringConstraintPruned:
+    def setup_method(self):
+        # 3x3 grid of platforms with 4 km spacing and 3 anchors each
+        rng = np.random.default_rng(1)
+        X, Y = np.meshgrid(4.0 * np.arange(3), 4.0 * np.arange(3))
+        self.xt_in = X.flatten() + 0.2 * rng.random(X.size)
+        self.yt_in = Y.flatten() + 0.2 * rng.random(Y.size)
+        self.N_turbines = len(self.xt_in)
+        angles = np.radians([0.0, 120.0, 240.0]) + 0.3 * rng.random(
+            (self.N_turbines, 3)
+        )
+        radii = 1.4 + 0.2 * rng.random((self.N_turbines, 3))
+        self.xa_in = self.xt_in[:, None] + radii * np.cos(angles)
+        self.ya_in = self.yt_in[:, None] + radii * np.sin(angles)
+        self.za_in = -0.2 * np.ones_like(self.xa_in)
+
+    def make_problem(self, N_anchor_dimensions, pruning_distance_m=None):
+        modeling_options = {
+            "layout": {"N_turbines": self.N_turbines},
+            "platform": {"N_anchors": 3, "N_anchor_dimensions": N_anchor_dimensions},
+        }
+        if pruning_distance_m is not None:
+            modeling_options["mooring_constraint"] = {
+                "pruning_distance_m": pruning_distance_m,
+            }
+
+        prob = om.Problem(model=om.Group())
+        prob.model.add_subsystem(
+            "mc",
+            mc.MooringConstraint(modeling_options=modeling_options),
+            promotes=["*"],
+        )
+        prob.model.set_input_defaults("x_turbines", self.xt_in, units="km")
+        prob.model.set_input_defaults("y_turbines", self.yt_in, units="km")
+        prob.model.set_input_defaults("x_anchors", self.xa_in, units="km")
+        prob.model.set_input_defaults("y_anchors", self.ya_in, units="km")
+        if N_anchor_dimensions == 3:
+            prob.model.set_input_defaults("z_anchors", self.za_in, units="km")
+        prob.setup()
+        prob.run_model()
+        return prob
+
+    def test_pruned_mooring_spacing(self, subtests):
+
+        for N_anchor_dimensions in [2, 3]:
+            prob_exact = self.make_problem(N_anchor_dimensions)
+            prob_pruned_all = self.make_problem(N_anchor_dimensions, 1.0e9)
+            prob_pruned = self.make_problem(N_anchor_dimensions, 1500.0)
+
+            spacing_exact = prob_exact["mooring_spacing"]
+            spacing_pruned = prob_pruned["mooring_spacing"]
+            mask_exact = spacing_exact < 1.5
+
+            with subtests.test(f"no pruning matches exact ({N_anchor_dimensions}D)"):
+                assert np.allclose(prob_pruned_all["mooring_spacing"], spacing_exact)
+
+            with subtests.test(f"some pairs pruned ({N_anchor_dimensions}D)"):
+                assert not np.allclose(spacing_pruned, spacing_exact)
+
+            with subtests.test(f"close pairs are exact ({N_anchor_dimensions}D)"):
+                assert np.any(mask_exact)
+                assert np.allclose(
+                    spacing_pruned[mask_exact], spacing_exact[mask_exact]
+                )
+
+            with subtests.test(
+                f"pruned pairs are lower bounds ({N_anchor_dimensions}D)"
+            ):
+                assert np.all(spacing_pruned <= spacing_exact + 1e-9)
+                assert np.all(spacing_pruned[~mask_exact] >= 1.5 - 1e-9)
+
+    def test_pruned_mooring_spacing_partials(self, subtests):
+
+        for N_anchor_dimensions in [2, 3]:
+            prob_pruned = self.make_problem(N_anchor_dimensions, 1500.0)
+            check_partials_data = prob_pruned.check_partials(
+                out_stream=None, form="central"
+            )
+
+            for key, data in check_partials_data["mc"].items():
+                with subtests.test(f"partials of {key} ({N_anchor_dimensions}D)"):
+                    assert np.allclose(data["J_fwd"], data["J_fd"], atol=1e-5)
+
+    def test_pruned_mooring_spacing_continuity(self, subtests):
+
+        # two platforms, moved apart across the pruning distance and the margin
+        mooring_points = np.stack(
+            [
+                np.column_stack(
+                    [
+                        [self.xt_in[idx], *self.xa_in[idx]],
+                        [self.yt_in[idx], *self.ya_in[idx]],
+                    ]
+                )
+                for idx in range(2)
+            ]
+        )
+        pruning_distance, pruning_margin = 1.5, 0.5
+        separation = mc.distance_bounding_circles(*mooring_points)
+        direction = mooring_points[1, 0] - mooring_points[0, 0]
+        direction /= np.linalg.norm(direction)
+
+        def points_at(separation_target):
+            points = mooring_points.copy()
+            points[1] += (separation_target - separation) * direction
+            return points
+
+        def distance_at(separation_target, return_jacobian=False):
+            return mc.calc_mooring_distances_pruned(
+                points_at(separation_target),
+                pruning_distance,
+                pruning_margin,
+                return_jacobian=return_jacobian,
+            )
+
+        step = 1.0e-7
+        for name, separation_edge in [
+            ("pruning distance", pruning_distance),
+            ("end of margin", pruning_distance + pruning_margin),
+        ]:
+            distances = [distance_at(separation_edge + v)[0] for v in [-step, step]]
+            slopes = [
+                distance_at(separation_edge + v, return_jacobian=True)[2][0, 0]
+                @ direction
+                for v in [-step, step]
+            ]
+            with subtests.test(f"distance continuous at the {name}"):
+                assert np.isclose(distances[0], distances[1], rtol=0.0, atol=1.0e-6)
+            with subtests.test(f"derivative continuous at the {name}"):
+                assert np.isclose(slopes[0], slopes[1], rtol=0.0, atol=1.0e-4)
+
+        with subtests.test("exact below the pruning distance"):
+            assert np.isclose(
+                distance_at(pruning_distance - 0.1)[0],
+                mc.calc_mooring_distances(points_at(pruning_distance - 0.1))[0],
+            )
+        with subtests.test("bound beyond the margin"):
+            assert np.isclose(
+                distance_at(pruning_distance + pruning_margin + 0.1)[0],
+                pruning_distance + pruning_margin + 0.1,
+            )
+
+
 class TestMooringConstraintXY:
     def setup_method(self):
         pass
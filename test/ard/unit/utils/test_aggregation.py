@@ -0,0 +1,166 @@
+import numpy as np
+import openmdao.api as om
+
+import pytest
+
+import ard.utils.aggregation
+import ard.utils.mathematics
+from ard.api import set_up_system_recursive
+
+
+@pytest.mark.usefixtures("subtests")
+class TestConstraintAggregation:
+    """
+    Test the ConstraintAggregation component.
+    """
+
+    def setup_method(self):
+        self.constraint_values = np.array([-3.0, 1.0, 0.5, -2.0, 0.999])
+
+    def make_problem(self, **kwargs):
+        prob = om.Problem()
+        prob.model.add_subsystem(
+            "source",
+            om.IndepVarComp("values", self.constraint_values, units="m"),
+            promotes=["*"],
+        )
+        prob.model.add_subsystem(
+            "aggregate",
+            ard.utils.aggregation.ConstraintAggregation(**kwargs),
+        )
+        prob.model.connect("values", "aggregate.constraint_values")
+        prob.setup()
+        prob.run_model()
+        return prob
+
+    def test_KS_max(self, subtests):
+
+        prob = self.make_problem(method="KS", rho=10.0)
+
+        with subtests.test("matches smooth max"):
+            assert np.isclose(
+                prob.get_val("aggregate.constraint_aggregate"),
+                ard.utils.mathematics.smooth_max(self.constraint_values, s=10.0),
+            )
+        with subtests.test("conservative w.r.t. true max"):
+            assert prob.get_val("aggregate.constraint_aggregate") >= np.max(
+                self.constraint_values
+            )
+
+    def test_KS_min(self):
+
+        prob = self.make_problem(method="KS", rho=10.0, aggregate_min=True)
+
+        assert prob.get_val("aggregate.constraint_aggregate") <= np.min(
+            self.constraint_values
+        )
+
+    def test_induced_exponential_max(self, subtests):
+
+        prob = self.make_problem(method="induced_exponential", rho=10.0)
+
+        with subtests.test("non-conservative w.r.t. true max"):
+            assert prob.get_val("aggregate.constraint_aggregate") <= np.max(
+                self.constraint_values
+            )
+        with subtests.test("close to true max"):
+            assert np.isclose(
+                prob.get_val("aggregate.constraint_aggregate"),
+                np.max(self.constraint_values),
+                atol=1e-2,
+            )
+
+    def test_units(self):
+
+        prob = self.make_problem(method="KS", rho=1.0e6, units="km")
+
+        assert np.isclose(
+            prob.get_val("aggregate.constraint_aggregate", units="m"),
+            np.max(self.constraint_values),
+            atol=1e-2,
+        )
+
+    def test_partials(self, subtests):
+
+        for method in ["KS", "induced_exponential"]:
+            for aggregate_min in [False, True]:
+                prob = self.make_problem(
+                    method=method, rho=5.0, aggregate_min=aggregate_min
+                )
+                check_partials_data = prob.check_partials(out_stream=None)
+                data = check_partials_data["aggregate"][
+                    ("constraint_aggregate", "constraint_values")
+                ]
+                with subtests.test(f"{method} partials, min: {aggregate_min}"):
+                    assert np.allclose(data["J_fwd"], data["J_fd"], atol=1e-5)
+
+
+class TestConstraintAggregationInterface:
+    """
+    Test the selection of constraint aggregation from the analysis options.
+    """
+
+    def setup_method(self):
+
+        self.modeling_options = {
+            "layout": {
+                "N_turbines": 4,
+            },
+        }
+        self.system = {
+            "systems": {
+                "spacing_constraint": {
+                    "module": "ard.layout.spacing",
+                    "object": "TurbineSpacing",
+                    "promotes": ["*"],
+                    "kwargs": {
+                        "modeling_options": self.modeling_options,
+                    },
+                },
+            },
+        }
+
+    def test_aggregated_constraint(self):
+
+        prob = set_up_system_recursive(
+            self.system,
+            modeling_options=self.modeling_options,
+            analysis_options={
+                "constraints": {
+                    "turbine_spacing": {
+                        "units": "km",
+                        "lower": 0.5,
+                        "aggregate": {"method": "KS", "rho": 100.0},
+                    },
+                },
+            },
+        )
+        prob.set_val("x_turbines", [0.0, 1000.0, 0.0, 1000.0], units="m")
+        prob.set_val("y_turbines", [0.0, 0.0, 1000.0, 1000.0], units="m")
+        prob.run_model()
+
+        constraints = prob.model.get_constraints()
+
+        assert list(constraints) == ["aggregate_turbine_spacing.constraint_aggregate"]
+        assert np.isclose(
+            prob.get_val("aggregate_turbine_spacing.constraint_aggregate", units="km"),
+            1.0,
+            atol=0.1,
+        )
+
+    def test_aggregated_constraint_bounds(self):
+
+        with pytest.raises(ValueError, match="exactly one"):
+            set_up_system_recursive(
+                self.system,
+                modeling_options=self.modeling_options,
+                analysis_options={
+                    "constraints": {
+                        "turbine_spacing": {
+                            "lower": 0.5,
+                            "upper": 10.0,
+                            "aggregate": {"method": "KS"},
+                        },
+                    },
+                },
+            )
@@ -0,0 +1,18 @@
+import ard.utils.benchmarks
+
+
+class TestBenchmarkSegmentDistanceKernels:
+    """
+    Test the segment distance kernel benchmark.
+    """
+
+    def test_benchmark_segment_distance_kernels(self):
+
+        results = ard.utils.benchmarks.benchmark_segment_distance_kernels(
+            N_pairs=100, N_dimensions=2, N_repeats=2
+        )
+
+        assert results["branchless"]["execute_time"] > 0.0
+        assert results["cond"]["execute_time"] > 0.0
+        assert results["max_difference"]["distance"] < 1e-10
+        assert results["max_difference"]["gradient"] < 1e-10
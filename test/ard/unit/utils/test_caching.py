@@ -0,0 +1,139 @@
+import numpy as np
+
+import pytest
+
+import ard.utils.caching
+
+
+@pytest.mark.usefixtures("subtests")
+class TestHashing:
+
+    def test_hash_arrays(self, subtests):
+
+        x = np.arange(6.0)
+
+        with subtests.test("deterministic"):
+            assert ard.utils.caching.hash_arrays(x) == ard.utils.caching.hash_arrays(
+                x.copy()
+            )
+        with subtests.test("value sensitive"):
+            assert ard.utils.caching.hash_arrays(x) != ard.utils.caching.hash_arrays(
+                x + 1.0e-12
+            )
+        with subtests.test("shape sensitive"):
+            assert ard.utils.caching.hash_arrays(x) != ard.utils.caching.hash_arrays(
+                x.reshape(2, 3)
+            )
+        with subtests.test("context sensitive"):
+            assert ard.utils.caching.hash_arrays(
+                x, context="a"
+            ) != ard.utils.caching.hash_arrays(x, context="b")
+
+    def test_hash_configuration(self, subtests):
+
+        configuration = {"b": [1, 2], "a": {"c": np.array([3.0, 4.0])}}
+
+        with subtests.test("key order independent"):
+            assert ard.utils.caching.hash_configuration(
+                configuration
+            ) == ard.utils.caching.hash_configuration(
+                {"a": {"c": np.array([3.0, 4.0])}, "b": [1, 2]}
+            )
+        with subtests.test("value sensitive"):
+            assert ard.utils.caching.hash_configuration(
+                configuration
+            ) != ard.utils.caching.hash_configuration({"b": [1, 2], "a": {"c": 3.0}})
+
+
+@pytest.mark.usefixtures("subtests")
+class TestLRUResultCache:
+
+    def setup_method(self):
+        self.cache = ard.utils.caching.LRUResultCache(2)
+
+    def test_hits_and_misses(self, subtests):
+
+        with subtests.test("miss on empty cache"):
+            assert self.cache.get("a") is None
+
+        self.cache.put("a", {"value": np.array([1.0, 2.0])})
+        result = self.cache.get("a")
+
+        with subtests.test("hit returns stored value"):
+            assert np.all(result["value"] == [1.0, 2.0])
+
+        # mutating the returned result must not touch the cached copy
+        result["value"][0] = -1.0
+        with subtests.test("hit returns a copy"):
+            assert np.all(self.cache.get("a")["value"] == [1.0, 2.0])
+
+        with subtests.test("statistics"):
+            assert self.cache.get_statistics() == {
+                "hits": 2,
+                "misses": 1,
+                "size": 1,
+                "max_size": 2,
+            }
+
+    def test_eviction(self, subtests):
+
+        self.cache.put("a", {"value": 1.0})
+        self.cache.put("b", {"value": 2.0})
+        self.cache.get("a")  # make "b" the least-recently-used entry
+        self.cache.put("c", {"value": 3.0})
+
+        with subtests.test("bounded size"):
+            assert len(self.cache) == 2
+        with subtests.test("least-recently-used evicted"):
+            assert "b" not in self.cache
+        with subtests.test("recently-used kept"):
+            assert "a" in self.cache and "c" in self.cache
+
+    def test_disabled(self):
+
+        cache = ard.utils.caching.LRUResultCache(0)
+        cache.put("a", {"value": 1.0})
+
+        assert not cache.enabled
+        assert len(cache) == 0
+
+    def test_persistence(self, subtests, tmp_path):
+
+        path_cache = tmp_path / "cache.pkl"
+        cache = ard.utils.caching.LRUResultCache(2, path=path_cache)
+        cache.put("a", {"value": np.array([1.0])})
+        cache.put("b", {"value": np.array([2.0])})
+
+        with subtests.test("file not written on put"):
+            assert not path_cache.exists()
+
+        cache.flush()
+        with subtests.test("file written on flush"):
+            assert path_cache.exists()
+
+        cache_reloaded = ard.utils.caching.LRUResultCache(2, path=path_cache)
+        with subtests.test("reloaded entries"):
+            assert np.all(cache_reloaded.get("a")["value"] == [1.0])
+            assert np.all(cache_reloaded.get("b")["value"] == [2.0])
+
+        cache_smaller = ard.utils.caching.LRUResultCache(1, path=path_cache)
+        with subtests.test("reload keeps the most recent entries"):
+            assert "b" in cache_smaller and "a" not in cache_smaller
+
+    def test_flush_interval(self, subtests, tmp_path):
+
+        path_cache = tmp_path / "cache.pkl"
+        cache = ard.utils.caching.LRUResultCache(4, path=path_cache, flush_interval=2)
+        cache.put("a", {"value": np.array([1.0])})
+        with subtests.test("not flushed before the interval"):
+            assert not path_cache.exists()
+
+        cache.put("b", {"value": np.array([2.0])})
+        with subtests.test("flushed at the interval"):
+            assert len(ard.utils.caching.LRUResultCache(4, path=path_cache)) == 2
+
+        # nothing new to write
+        path_cache.unlink()
+        cache.flush()
+        with subtests.test("flush without new results"):
+            assert not path_cache.exists()
@@ -0,0 +1,135 @@
+import io
+
+import jax
+import jax.numpy as jnp
+from jax.experimental.compilation_cache import compilation_cache
+import numpy as np
+import openmdao.api as om
+
+import pytest
+
+import ard.layout.spacing
+import ard.utils.compilation
+
+
+@jax.jit
+def _example_kernel(x, scale=1.0):
+    return scale * jnp.sum(x**2)
+
+
+@pytest.mark.usefixtures("subtests")
+class TestPersistentCompilationCache:
+    """
+    Test the configuration of the JAX persistent compilation cache.
+    """
+
+    def setup_method(self):
+        self.config_keys = [
+            "jax_compilation_cache_dir",
+            "jax_persistent_cache_min_compile_time_secs",
+            "jax_persistent_cache_min_entry_size_bytes",
+        ]
+        self.config_original = {
+            key: getattr(jax.config, key) for key in self.config_keys
+        }
+
+    def teardown_method(self):
+        for key, value in self.config_original.items():
+            jax.config.update(key, value)
+        compilation_cache.reset_cache()
+
+    def test_enable_persistent_compilation_cache(self, subtests, tmp_path):
+
+        cache_dir = ard.utils.compilation.enable_persistent_compilation_cache(
+            tmp_path / "jax_cache"
+        )
+
+        with subtests.test("cache directory created"):
+            assert cache_dir.is_dir()
+        with subtests.test("cache directory configured"):
+            assert jax.config.jax_compilation_cache_dir == str(cache_dir)
+        with subtests.test("all kernels cached"):
+            assert jax.config.jax_persistent_cache_min_compile_time_secs == 0.0
+
+    def test_configure_jax_compilation(self, subtests, tmp_path):
+
+        with subtests.test("defaults to no warm up"):
+            assert not ard.utils.compilation.configure_jax_compilation({})
+        with subtests.test("cache unchanged by default"):
+            assert (
+                jax.config.jax_compilation_cache_dir
+                == self.config_original["jax_compilation_cache_dir"]
+            )
+
+        warm_up = ard.utils.compilation.configure_jax_compilation(
+            {
+                "jax": {
+                    "compilation_cache_dir": str(tmp_path / "jax_cache"),
+                    "warm_up": True,
+                },
+            }
+        )
+        with subtests.test("warm up requested"):
+            assert warm_up
+        with subtests.test("cache directory configured"):
+            assert jax.config.jax_compilation_cache_dir == str(tmp_path / "jax_cache")
+
+
+@pytest.mark.usefixtures("subtests")
+class TestWarmUpKernel:
+    """
+    Test the ahead-of-time compilation and timing of JAX kernels.
+    """
+
+    def setup_method(self):
+        self.x = np.arange(5.0)
+
+    def test_warm_up_kernel(self, subtests):
+
+        compiled = ard.utils.compilation.warm_up_kernel(
+            "test: example kernel", _example_kernel, self.x, scale=2.0
+        )
+        timings = ard.utils.compilation.get_kernel_timings()
+
+        with subtests.test("compiled kernel matches jitted kernel"):
+            assert np.isclose(
+                compiled(self.x, scale=2.0), _example_kernel(self.x, scale=2.0)
+            )
+        with subtests.test("timings recorded"):
+            assert timings["test: example kernel"]["compile_time"] > 0.0
+            assert timings["test: example kernel"]["execute_time"] > 0.0
+
+        stream = io.StringIO()
+        ard.utils.compilation.report_kernel_timings(file=stream)
+        with subtests.test("timings reported"):
+            assert "test: example kernel" in stream.getvalue()
+
+    def test_component_warm_up(self, subtests):
+
+        x_turbines = np.array([0.0, 500.0, 0.0, 500.0])
+        y_turbines = np.array([0.0, 0.0, 500.0, 500.0])
+
+        results = []
+        for warm_up in [False, True]:
+            modeling_options = {
+                "layout": {"N_turbines": len(x_turbines)},
+                "jax": {"warm_up": warm_up},
+            }
+            prob = om.Problem()
+            prob.model.add_subsystem(
+                "spacing",
+                ard.layout.spacing.TurbineSpacing(modeling_options=modeling_options),
+                promotes=["*"],
+            )
+            prob.setup()
+            prob.set_val("x_turbines", x_turbines, units="m")
+            prob.set_val("y_turbines", y_turbines, units="m")
+            prob.run_model()
+            results.append(prob.get_val("turbine_spacing", units="m").copy())
+
+        timings = ard.utils.compilation.get_kernel_timings()
+        with subtests.test("component kernels warmed up"):
+            assert "spacing: turbine spacing" in timings
+            assert "spacing: turbine spacing jacobian" in timings
+        with subtests.test("warm up does not change results"):
+            assert np.allclose(results[0], results[1])
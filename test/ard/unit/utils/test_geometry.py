@@ -42,6 +42,50 @@ class TestGetNearestPolygons:
 
         assert np.allclose(test_result, expected_regions)
 
+    def test_get_nearest_polygons_matches_per_region_distances(self):
+
+        rng = np.random.default_rng(11)
+
+        # overlapping squares and triangles, so the first containing region wins
+        polygons = [
+            np.array([[0, 0], [10, 0], [10, 10], [0, 10]], dtype=float),
+            np.array([[5, 5], [15, 5], [15, 15], [5, 15]], dtype=float),
+            np.array([[20, 0], [30, 0], [25, 8]], dtype=float),
+            np.array([[-20, -20], [-10, -20], [-10, -10], [-20, -10]], dtype=float),
+        ]
+        points_x = rng.uniform(-25.0, 35.0, 50)
+        points_y = rng.uniform(-25.0, 20.0, 50)
+        points_x[:2] = [7.0, 12.0]  # inside both squares, then only the second
+        points_y[:2] = [7.0, 12.0]
+
+        # signed distance from every point to every region
+        distances = np.array(
+            [
+                geo_utils.distance_multi_point_to_multi_polygon_ray_casting(
+                    points_x,
+                    points_y,
+                    boundary_vertices=polygons,
+                    regions=np.full(len(points_x), idx, dtype=int),
+                )
+                for idx in range(len(polygons))
+            ]
+        ).T
+        inside = distances <= 0
+        expected_regions = np.where(
+            np.any(inside, axis=1),
+            np.argmax(inside, axis=1),
+            np.argmin(distances, axis=1),
+        )
+
+        test_result = geo_utils.get_nearest_polygons(
+            boundary_vertices=polygons,
+            points_x=points_x,
+            points_y=points_y,
+        )
+
+        assert np.all(test_result[:2] == [0, 1])
+        assert np.all(test_result == expected_regions)
+
 
 @pytest.mark.usefixtures("subtests")
 class TestDistancePointToMultiPolygonRayCasting:
@@ -175,6 +219,30 @@ class TestDistancePointToMultiPolygonRayCasting:
                     "Unexpected AssertionError when checking gradients, gradients may be incorrect"
                 )
 
+    def test_distance_multi_point_to_multi_polygon_diagonal_jac(self, subtests):
+
+        points = np.array([[0.25, 0.5], [1.95, 0.5], [0.5, 1.25], [1.5, 0.2]])
+        polygons = [
+            np.array([[0, 0], [1, 0], [1, 1], [0, 1]], dtype=float),
+            np.array([[1, 0], [2, 0], [2, 1]], dtype=float),
+        ]
+        regions = np.array([0, 1, 0, 1], dtype=int)
+
+        test_result = (
+            geo_utils.distance_multi_point_to_multi_polygon_ray_casting_diagonal_jac(
+                points[:, 0], points[:, 1], boundary_vertices=polygons, regions=regions
+            )
+        )
+        full_jacobian = self.distance_multi_point_to_multi_polygon_ray_casting_jac(
+            points[:, 0], points[:, 1], boundary_vertices=polygons, regions=regions
+        )
+
+        with subtests.test("x derivatives match full jacobian diagonal"):
+            assert np.allclose(test_result[0], np.diagonal(full_jacobian[0]))
+
+        with subtests.test("y derivatives match full jacobian diagonal"):
+            assert np.allclose(test_result[1], np.diagonal(full_jacobian[1]))
+
 
 @pytest.mark.usefixtures("subtests")
 class TestDistancePointToPolygonRayCasting:
@@ -1304,3 +1372,244 @@ class TestLineSegToLineSeg:
             pytest.fail(
                 "Unexpected AssertionError when checking gradients, gradients may be incorrect"
             )
+
+
+@pytest.mark.usefixtures("subtests")
+class TestBranchlessSegmentKernels:
+    """
+    Test the branchless segment distance kernels against the reference
+    implementations built from nested `jax.lax.cond` branches.
+    """
+
+    def setup_method(self):
+        rng = np.random.default_rng(42)
+        self.segments = {}
+        for N_dimensions in [2, 3]:
+            segments = rng.normal(scale=10.0, size=(4, 60, N_dimensions))
+            segments[1, :10] = segments[0, :10]  # segment a is a point
+            segments[3, 10:20] = segments[2, 10:20]  # segment b is a point
+            offset = np.zeros(N_dimensions)
+            offset[0] = 5.0
+            segments[2, 20:30] = segments[0, 20:30] + offset  # parallel segments
+            segments[3, 20:30] = segments[1, 20:30] + offset
+            self.segments[N_dimensions] = segments
+
+    def test_distance_lineseg_to_lineseg_nd(self, subtests):
+
+        for N_dimensions, segments in self.segments.items():
+            results = [
+                jax.vmap(jax.value_and_grad(kernel, argnums=(0, 1, 2, 3)))(*segments)
+                for kernel in [
+                    geo_utils.distance_lineseg_to_lineseg_nd,
+                    geo_utils._distance_lineseg_to_lineseg_nd_cond,
+                ]
+            ]
+            with subtests.test(f"distances match in {N_dimensions}d"):
+                assert np.allclose(results[0][0], results[1][0], atol=1e-12)
+            for idx, (grad_branchless, grad_cond) in enumerate(
+                zip(results[0][1], results[1][1])
+            ):
+                with subtests.test(f"gradients match in {N_dimensions}d, arg {idx}"):
+                    assert np.allclose(grad_branchless, grad_cond, atol=1e-12)
+
+    def test_distance_point_to_lineseg_nd(self, subtests):
+
+        for N_dimensions, segments in self.segments.items():
+            # use the start of segment a as the point and segment b as the segment
+            args = (segments[0], segments[2], segments[3])
+            results = [
+                jax.vmap(jax.value_and_grad(kernel, argnums=(0, 1, 2)))(*args)
+                for kernel in [
+                    geo_utils.distance_point_to_lineseg_nd,
+                    geo_utils._distance_point_to_lineseg_nd_cond,
+                ]
+            ]
+            with subtests.test(f"distances match in {N_dimensions}d"):
+                assert np.allclose(results[0][0], results[1][0], atol=1e-12)
+            for idx, (grad_branchless, grad_cond) in enumerate(
+                zip(results[0][1], results[1][1])
+            ):
+                with subtests.test(f"gradients match in {N_dimensions}d, arg {idx}"):
+                    assert np.allclose(grad_branchless, grad_cond, atol=1e-12)
+
+
+@pytest.mark.usefixtures("subtests")
+class TestPaddedPolygonDistances:
+    """
+    Test the padded multi-polygon ray-casting engine against the
+    per-polygon (switch) implementation.
+    """
+
+    def setup_method(self):
+        rng = np.random.default_rng(7)
+
+        # star-shaped polygons with different numbers of vertices
+        self.boundary_vertices = []
+        for N_vertices in [3, 5, 8, 12]:
+            angles = np.sort(rng.uniform(0.0, 2.0 * np.pi, N_vertices))
+            radii = rng.uniform(50.0, 100.0, N_vertices)
+            center = rng.uniform(-300.0, 300.0, 2)
+            self.boundary_vertices.append(
+                np.array(
+                    [
+                        center[0] + radii * np.cos(angles),
+                        center[1] + radii * np.sin(angles),
+                    ]
+                ).T
+            )
+
+        self.points_x = rng.uniform(-400.0, 400.0, 40)
+        self.points_y = rng.uniform(-400.0, 400.0, 40)
+        self.regions = rng.integers(0, len(self.boundary_vertices), 40)
+
+    def test_pack_polygons(self, subtests):
+
+        vertices_padded, N_vertices = geo_utils.pack_polygons(self.boundary_vertices)
+
+        with subtests.test("padded shape"):
+            assert vertices_padded.shape == (4, 12, 2)
+        with subtests.test("number of vertices"):
+            assert np.all(N_vertices == [3, 5, 8, 12])
+        with subtests.test("vertices preserved"):
+            assert np.allclose(vertices_padded[1, :5], self.boundary_vertices[1])
+        with subtests.test("padding repeats first vertex"):
+            assert np.allclose(vertices_padded[0, 3:], self.boundary_vertices[0][0])
+
+    def test_distances_match_switch(self, subtests):
+
+        vertices_padded, N_vertices = geo_utils.pack_polygons(self.boundary_vertices)
+
+        distances_switch = geo_utils.distance_multi_point_to_multi_polygon_ray_casting(
+            self.points_x,
+            self.points_y,
+            boundary_vertices=self.boundary_vertices,
+            regions=self.regions,
+        )
+        distances_padded = (
+            geo_utils.distance_multi_point_to_multi_polygon_ray_casting_padded(
+                self.points_x,
+                self.points_y,
+                vertices_padded,
+                N_vertices,
+                self.regions,
+            )
+        )
+        with subtests.test("distances match"):
+            assert np.allclose(distances_padded, distances_switch, atol=1e-3)
+
+        jacobian_switch = (
+            geo_utils.distance_multi_point_to_multi_polygon_ray_casting_diagonal_jac(
+                self.points_x, self.points_y, self.boundary_vertices, self.regions
+            )
+        )
+        jacobian_padded = geo_utils.distance_multi_point_to_multi_polygon_ray_casting_padded_diagonal_jac(
+            self.points_x, self.points_y, vertices_padded, N_vertices, self.regions
+        )
+        for idx, dim in enumerate(["x", "y"]):
+            with subtests.test(f"derivatives match wrt {dim}"):
+                assert np.allclose(
+                    jacobian_padded[idx], jacobian_switch[idx], atol=1e-6
+                )
+
+
+@pytest.mark.usefixtures("subtests")
+class TestSignedDistanceField:
+    """
+    Test the signed distance field raster and its bicubic interpolation.
+    """
+
+    def setup_method(self):
+        # a square and a triangle
+        self.boundary_vertices = [
+            np.array([[0.0, 0.0], [1000.0, 0.0], [1000.0, 1000.0], [0.0, 1000.0]]),
+            np.array([[2000.0, 0.0], [3000.0, 0.0], [2500.0, 800.0]]),
+        ]
+        self.sdf_values, self.grid_origins, self.grid_spacings = (
+            geo_utils.build_signed_distance_field(
+                self.boundary_vertices, N_grid_points=101, margin=200.0
+            )
+        )
+
+    def test_build_signed_distance_field(self, subtests):
+
+        with subtests.test("shape"):
+            assert self.sdf_values.shape == (2, 101, 101)
+        with subtests.test("origins"):
+            assert np.allclose(self.grid_origins, [[-200.0, -200.0], [1800.0, -200.0]])
+        with subtests.test("spacings"):
+            assert np.allclose(self.grid_spacings, [[14.0, 14.0], [14.0, 12.0]])
+        with subtests.test("inside is negative"):
+            assert self.sdf_values[0, 50, 50] == pytest.approx(-500.0, abs=1e-2)
+
+    def test_interpolated_distances(self, subtests):
+
+        # points in the interior of the square and near the triangle edges
+        points_x = np.array([500.0, 250.0, 107.0, 1100.0, 2500.0, 2200.0])
+        points_y = np.array([500.0, 600.0, 333.0, 500.0, 300.0, -50.0])
+        regions = np.array([0, 0, 0, 0, 1, 1])
+
+        distances_exact = geo_utils.distance_multi_point_to_multi_polygon_ray_casting(
+            points_x,
+            points_y,
+            boundary_vertices=self.boundary_vertices,
+            regions=regions,
+        )
+        distances_sdf = geo_utils.distance_multi_point_signed_distance_field(
+            points_x,
+            points_y,
+            self.sdf_values,
+            self.grid_origins,
+            self.grid_spacings,
+            regions,
+        )
+        with subtests.test("distances match exact"):
+            assert np.allclose(distances_sdf, distances_exact, atol=0.5)
+
+        jacobian_sdf = (
+            geo_utils.distance_multi_point_signed_distance_field_diagonal_jac(
+                points_x,
+                points_y,
+                self.sdf_values,
+                self.grid_origins,
+                self.grid_spacings,
+                regions,
+            )
+        )
+        step = 1e-4
+        for idx, dim in enumerate(["x", "y"]):
+            offset = np.zeros((2, len(points_x)))
+            offset[idx] = step
+            jacobian_fd = (
+                geo_utils.distance_multi_point_signed_distance_field(
+                    points_x + offset[0],
+                    points_y + offset[1],
+                    self.sdf_values,
+                    self.grid_origins,
+                    self.grid_spacings,
+                    regions,
+                )
+                - geo_utils.distance_multi_point_signed_distance_field(
+                    points_x - offset[0],
+                    points_y - offset[1],
+                    self.sdf_values,
+                    self.grid_origins,
+                    self.grid_spacings,
+                    regions,
+                )
+            ) / (2.0 * step)
+            with subtests.test(f"derivatives match finite differences wrt {dim}"):
+                assert np.allclose(jacobian_sdf[idx], jacobian_fd, atol=1e-6)
+
+    def test_outside_grid(self):
+
+        # a point beyond the grid is clamped, and the extra distance added
+        distance = geo_utils.distance_multi_point_signed_distance_field(
+            np.array([500.0]),
+            np.array([2000.0]),
+            self.sdf_values,
+            self.grid_origins,
+            self.grid_spacings,
+            np.array([0]),
+        )
+
+        assert distance[0] == pytest.approx(1000.0, abs=1e-2)
@@ -1,4 +1,21 @@
-from ard.utils.io import replace_key_value
+import os
+
+import numpy as np
+
+import pytest
+
+import yaml
+
+import ard.utils.io
+from ard.utils.io import (
+    Loader,
+    check_arrays_finite,
+    clear_yaml_cache,
+    load_array,
+    load_yaml,
+    replace_key_value,
+    shorten_arrays,
+)
 
 
 class TestReplaceKeyValueNotNoneOnly:
@@ -41,3 +58,181 @@ class TestReplaceKeyValueNoneOnly:
 
     def test_replace_key_value_nested_dictionary(self):
         assert self.output_dictionary["c"]["a"] == 0
+
+
+class TestLoadArray:
+    def setup_method(self):
+        self.wind_speed = np.linspace(3.0, 25.0, 50)
+        self.time = np.array(
+            [
+                f"2023-01-{1 + hour // 24:02d}T{hour % 24:02d}:00:00Z"
+                for hour in range(50)
+            ]
+        )
+
+    def test_load_npy(self, tmp_path):
+        np.save(tmp_path / "wind_speed.npy", self.wind_speed)
+        wind_speed = load_array(tmp_path / "wind_speed.npy")
+
+        assert isinstance(wind_speed, np.memmap)
+        assert np.all(wind_speed == self.wind_speed)
+
+    def test_load_npz(self, tmp_path):
+        np.savez(tmp_path / "resource.npz", wind_speed=self.wind_speed)
+
+        assert np.all(
+            load_array(tmp_path / "resource.npz", key="wind_speed") == self.wind_speed
+        )
+
+    def test_load_csv(self, tmp_path):
+        with open(tmp_path / "resource.csv", "w") as f_csv:
+            f_csv.write("time,wind_speed\n")
+            for time, wind_speed in zip(self.time, self.wind_speed):
+                f_csv.write(f"{time},{wind_speed}\n")
+
+        assert np.all(
+            load_array(tmp_path / "resource.csv", key="wind_speed") == self.wind_speed
+        )
+        assert np.all(load_array(tmp_path / "resource.csv", key="time") == self.time)
+
+    def test_load_errors(self, tmp_path):
+        np.savez(tmp_path / "resource.npz", wind_speed=self.wind_speed)
+
+        with pytest.raises(KeyError):
+            load_array(tmp_path / "resource.npz")
+        with pytest.raises(ValueError):
+            load_array(tmp_path / "resource.txt", key="wind_speed")
+
+    def test_yaml_array_tag(self, tmp_path):
+        np.save(tmp_path / "wind_speed.npy", self.wind_speed)
+        np.savez(tmp_path / "resource.npz", time=self.time)
+        with open(tmp_path / "resource.yaml", "w") as f_yaml:
+            f_yaml.write(
+                "wind_resource:\n"
+                "  wind_speed: !array wind_speed.npy\n"
+                "  time: !array {file: resource.npz, key: time}\n"
+            )
+        data = load_yaml(str(tmp_path / "resource.yaml"))
+
+        assert np.all(data["wind_resource"]["wind_speed"] == self.wind_speed)
+        assert np.all(data["wind_resource"]["time"] == self.time)
+
+
+class TestShortenArrays:
+    def setup_method(self):
+        self.data = {
+            "a": np.arange(10.0),
+            "b": [{"c": np.arange(5)}, 1.0],
+            "d": np.array(["2023-01-01T00:00"], dtype="datetime64[m]"),
+            "e": [1, 2, 3],
+        }
+        self.shortened = shorten_arrays(self.data)
+
+    def test_arrays_shortened(self):
+        assert self.shortened["a"] == [0.0]
+        assert self.shortened["b"][0]["c"] == [0]
+
+    def test_timestamps_as_strings(self):
+        assert self.shortened["d"] == ["2023-01-01T00:00"]
+
+    def test_lists_kept(self):
+        assert self.shortened["e"] == [1, 2, 3]
+        assert self.shortened["b"][1] == 1.0
+
+    def test_original_untouched(self):
+        assert len(self.data["a"]) == 10
+
+    def test_keep_all(self):
+        assert shorten_arrays(self.data, N_keep=None)["a"] == list(np.arange(10.0))
+
+
+class TestCheckArraysFinite:
+    def test_finite(self):
+        check_arrays_finite({"a": np.arange(3.0), "b": [np.arange(2)], "c": "x"})
+
+    def test_not_finite(self):
+        with pytest.raises(ValueError, match="/b/0"):
+            check_arrays_finite({"a": np.arange(3.0), "b": [np.array([1.0, np.nan])]})
+
+
+class TestLoadYAMLCache:
+    def setup_method(self):
+        clear_yaml_cache()
+
+    def write_inputs(self, tmp_path, hub_height):
+        with open(tmp_path / "turbine.yaml", "w") as f_yaml:
+            f_yaml.write(f"hub_height: {hub_height}\n")
+        with open(tmp_path / "plant.yaml", "w") as f_yaml:
+            f_yaml.write("name: test\nturbine: !include turbine.yaml\n")
+
+    def test_cache_hit_copied(self, tmp_path):
+        self.write_inputs(tmp_path, 90.0)
+        data_first = load_yaml(tmp_path / "plant.yaml")
+        data_first["turbine"]["hub_height"] = 0.0
+        data_second = load_yaml(tmp_path / "plant.yaml")
+
+        assert data_second == {"name": "test", "turbine": {"hub_height": 90.0}}
+
+    def test_included_file_changed(self, tmp_path):
+        self.write_inputs(tmp_path, 90.0)
+        load_yaml(tmp_path / "plant.yaml")
+        self.write_inputs(tmp_path, 110.0)
+
+        assert load_yaml(tmp_path / "plant.yaml")["turbine"]["hub_height"] == 110.0
+
+    def test_array_file_changed(self, tmp_path):
+        np.save(tmp_path / "wind_speed.npy", np.arange(5.0))
+        with open(tmp_path / "resource.yaml", "w") as f_yaml:
+            f_yaml.write("wind_speed: !array wind_speed.npy\n")
+        load_yaml(tmp_path / "resource.yaml")
+        np.save(tmp_path / "wind_speed.npy", np.arange(7.0))
+
+        assert len(load_yaml(tmp_path / "resource.yaml")["wind_speed"]) == 7
+
+    def test_cache_hit_not_hashed(self, tmp_path, monkeypatch):
+        np.save(tmp_path / "wind_speed.npy", np.arange(5.0))
+        with open(tmp_path / "resource.yaml", "w") as f_yaml:
+            f_yaml.write("wind_speed: !array wind_speed.npy\n")
+        load_yaml(tmp_path / "resource.yaml")
+
+        hashed = []
+        hash_file = ard.utils.io._hash_file
+        monkeypatch.setattr(
+            ard.utils.io,
+            "_hash_file",
+            lambda filename: hashed.append(filename) or hash_file(filename),
+        )
+        load_yaml(tmp_path / "resource.yaml")
+        assert hashed == []
+
+        # a touched file is hashed once, and is still a hit
+        stat = (tmp_path / "wind_speed.npy").stat()
+        os.utime(
+            tmp_path / "wind_speed.npy",
+            ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000),
+        )
+        for _ in range(2):
+            assert len(load_yaml(tmp_path / "resource.yaml")["wind_speed"]) == 5
+        assert len(hashed) == 1
+
+    def test_cache_bounded(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(ard.utils.io, "_yaml_cache_max_size", 2)
+        for idx in range(3):
+            with open(tmp_path / f"case_{idx}.yaml", "w") as f_yaml:
+                f_yaml.write(f"index: {idx}\n")
+            load_yaml(tmp_path / f"case_{idx}.yaml")
+
+        assert len(ard.utils.io._yaml_cache) == 2
+
+    def test_uncached_matches(self, tmp_path):
+        self.write_inputs(tmp_path, 90.0)
+
+        assert load_yaml(tmp_path / "plant.yaml", use_cache=False) == load_yaml(
+            tmp_path / "plant.yaml"
+        )
+
+    def test_c_loader(self):
+        if hasattr(yaml, "CSafeLoader"):
+            assert issubclass(Loader, yaml.CSafeLoader)
+        else:
+            assert issubclass(Loader, yaml.SafeLoader)
@@ -5,6 +5,30 @@ import jax.numpy as jnp
 import ard.utils.mathematics as math_utils
 
 
+class TestInducedExponentialMax:
+    def test_induced_exponential_max_close(self):
+        """
+        Check that the induced exponential max function returns something
+        less than the true max when called with similar values.
+        """
+
+        test_list = np.array([0, 9.999, 10.00, 3.0])
+        test_result = math_utils.induced_exponential_max(x=test_list)
+
+        assert test_result <= 10
+
+    def test_induced_exponential_max_not_close(self):
+        """
+        Check that the induced exponential max function returns the true max
+        when called with very different values.
+        """
+
+        test_list = np.array([0, 5, 10.0, 3.0])
+        test_result = math_utils.induced_exponential_max(x=test_list)
+
+        assert test_result == pytest.approx(10.0, rel=1e-15)
+
+
 class TestSmoothMaxMin:
     def setup_method(self):
         self.smooth_max_grad = grad(math_utils.smooth_max)
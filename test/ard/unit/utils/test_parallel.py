@@ -0,0 +1,59 @@
+import numpy as np
+
+import pytest
+
+import ard.utils.parallel
+
+
+@pytest.mark.usefixtures("subtests")
+class TestSplitIndices:
+    def test_split_indices(self, subtests):
+        idx_chunks = ard.utils.parallel.split_indices(10, 3)
+
+        with subtests.test("number of chunks"):
+            assert len(idx_chunks) == 3
+        with subtests.test("chunks cover the items in order"):
+            assert np.all(np.concatenate(idx_chunks) == np.arange(10))
+
+    def test_more_chunks_than_items(self):
+        assert len(ard.utils.parallel.split_indices(2, 8)) == 2
+
+
+class TestGetProcessPool:
+    def test_pool_persistent(self):
+        pool = ard.utils.parallel.get_process_pool(1)
+
+        assert ard.utils.parallel.get_process_pool(1) is pool
+        assert pool.submit(np.add, 1, 2).result() == 3
+
+        ard.utils.parallel.shutdown_process_pools()
+        assert ard.utils.parallel.get_process_pool(1) is not pool
+        ard.utils.parallel.shutdown_process_pools()
+
+
+class TestGetMPICommunicator:
+    def test_single_rank(self):
+        class SingleRankComm:
+            size = 1
+
+        assert ard.utils.parallel.get_MPI_communicator(SingleRankComm()) is None
+
+    def test_required(self, monkeypatch):
+        class SingleRankComm:
+            size = 1
+
+        # a requested MPI backend on a single rank is not silently ignored
+        if ard.utils.parallel.MPI is not None:
+            with pytest.warns(UserWarning):
+                assert (
+                    ard.utils.parallel.get_MPI_communicator(
+                        SingleRankComm(), required=True
+                    )
+                    is None
+                )
+
+        # a requested MPI backend without MPI is an error
+        monkeypatch.setattr(ard.utils.parallel, "MPI", None)
+        assert ard.utils.parallel.get_MPI_communicator() is None
+        with pytest.raises(RuntimeError):
+            ard.utils.parallel.get_MPI_communicator(required=True)